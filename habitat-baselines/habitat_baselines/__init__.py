@@ -4,15 +4,39 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from habitat_baselines.common.base_il_trainer import BaseILTrainer
-from habitat_baselines.common.base_trainer import BaseRLTrainer, BaseTrainer
-from habitat_baselines.il.trainers.eqa_cnn_pretrain_trainer import (
-    EQACNNPretrainTrainer,
-)
-from habitat_baselines.il.trainers.pacman_trainer import PACMANTrainer
-from habitat_baselines.il.trainers.vqa_trainer import VQATrainer
-from habitat_baselines.rl.ppo.ppo_trainer import PPOTrainer, RolloutStorage
-from habitat_baselines.rl.ver.ver_trainer import VERTrainer
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from habitat_baselines.common.base_il_trainer import BaseILTrainer
+    from habitat_baselines.common.base_trainer import (
+        BaseRLTrainer,
+        BaseTrainer,
+    )
+    from habitat_baselines.il.trainers.eqa_cnn_pretrain_trainer import (
+        EQACNNPretrainTrainer,
+    )
+    from habitat_baselines.il.trainers.pacman_trainer import PACMANTrainer
+    from habitat_baselines.il.trainers.vqa_trainer import VQATrainer
+    from habitat_baselines.rl.ppo.ppo_trainer import PPOTrainer, RolloutStorage
+    from habitat_baselines.rl.ver.ver_trainer import VERTrainer
+
+# The trainers are imported on first access, so that importing
+# habitat_baselines, or its configs, does not import torch and every
+# trainer. Looking up a trainer in the baseline registry imports them.
+_LAZY_ATTRIBUTES = {
+    "BaseTrainer": "habitat_baselines.common.base_trainer",
+    "BaseRLTrainer": "habitat_baselines.common.base_trainer",
+    "BaseILTrainer": "habitat_baselines.common.base_il_trainer",
+    "PPOTrainer": "habitat_baselines.rl.ppo.ppo_trainer",
+    "RolloutStorage": "habitat_baselines.rl.ppo.ppo_trainer",
+    "EQACNNPretrainTrainer": (
+        "habitat_baselines.il.trainers.eqa_cnn_pretrain_trainer"
+    ),
+    "PACMANTrainer": "habitat_baselines.il.trainers.pacman_trainer",
+    "VQATrainer": "habitat_baselines.il.trainers.vqa_trainer",
+    "VERTrainer": "habitat_baselines.rl.ver.ver_trainer",
+}
 
 __all__ = [
     "BaseTrainer",
@@ -25,3 +49,25 @@ __all__ = [
     "VQATrainer",
     "VERTrainer",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        # The subpackages used to be imported with the package.
+        module_name = f"{__name__}.{name}"
+        try:
+            value = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals().keys(), *__all__])
@@ -26,6 +26,17 @@ from habitat.core.registry import Registry
 
 
 class BaselineRegistry(Registry):
+    @classmethod
+    def _import_default_modules(cls) -> None:
+        r"""Also imports the trainers of habitat_baselines, and with them
+        the policies, storages and updaters they register.
+        """
+        super()._import_default_modules()
+        import habitat_baselines
+
+        for name in habitat_baselines.__all__:
+            getattr(habitat_baselines, name)
+
     @classmethod
     def register_trainer(cls, to_register=None, *, name: Optional[str] = None):
         r"""Register a RL training algorithm to registry with key 'name'.
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Any, List, Type
 
 from habitat import ThreadedVectorEnv, VectorEnv, logger, make_dataset
 from habitat.config import read_write
+from habitat.datasets.shared_dataset import publish_shared_dataset
 from habitat.gym import make_gym_from_config
 
 if TYPE_CHECKING:
@@ -34,10 +35,26 @@ def construct_envs(
 
     num_environments = config.habitat_baselines.num_environments
     configs = []
-    dataset = make_dataset(config.habitat.dataset.type)
+    share_dataset = config.habitat_baselines.vector_env.share_dataset
+    if share_dataset:
+        # Load the dataset once here, the workers only unpickle the
+        # episodes of their scenes from the published file.
+        dataset = make_dataset(
+            config.habitat.dataset.type, config=config.habitat.dataset
+        )
+    else:
+        dataset = make_dataset(config.habitat.dataset.type)
     scenes = config.habitat.dataset.content_scenes
     if "*" in config.habitat.dataset.content_scenes:
-        scenes = dataset.get_scenes_to_load(config.habitat.dataset)
+        if share_dataset:
+            scenes = sorted(
+                {
+                    dataset.scene_from_scene_path(scene_id)
+                    for scene_id in dataset.scene_ids
+                }
+            )
+        else:
+            scenes = dataset.get_scenes_to_load(config.habitat.dataset)
 
     if num_environments < 1:
         raise RuntimeError("num_environments must be strictly positive")
@@ -72,6 +89,10 @@ def construct_envs(
             scene_splits[idx % len(scene_splits)].append(scene)
         assert sum(map(len, scene_splits)) == len(scenes)
 
+    shared_dataset_path = None
+    if share_dataset:
+        shared_dataset_path = publish_shared_dataset(dataset)
+
     for i in range(num_environments):
         proc_config = config.copy()
         with read_write(proc_config):
@@ -79,6 +100,8 @@ def construct_envs(
             task_config.seed = task_config.seed + i
             if len(scenes) > 0:
                 task_config.dataset.content_scenes = scene_splits[i]
+            if shared_dataset_path is not None:
+                task_config.dataset.shared_dataset_path = shared_dataset_path
 
         configs.append(proc_config)
 
@@ -91,9 +114,18 @@ def construct_envs(
     else:
         vector_env_cls = VectorEnv
 
-    envs = vector_env_cls(
-        make_env_fn=make_gym_from_config,
-        env_fn_args=tuple((c,) for c in configs),
-        workers_ignore_signals=workers_ignore_signals,
-    )
+    try:
+        envs = vector_env_cls(
+            make_env_fn=make_gym_from_config,
+            env_fn_args=tuple((c,) for c in configs),
+            workers_ignore_signals=workers_ignore_signals,
+            use_shared_memory_obs=config.habitat_baselines.vector_env.use_shared_memory_obs,
+            envs_per_worker=config.habitat_baselines.vector_env.envs_per_worker,
+            async_auto_reset=config.habitat_baselines.vector_env.async_auto_reset,
+        )
+    finally:
+        # The environments are created by the constructor, nothing reads
+        # the published dataset afterwards.
+        if shared_dataset_path is not None:
+            os.remove(shared_dataset_path)
     return envs
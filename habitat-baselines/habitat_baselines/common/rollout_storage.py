@@ -18,10 +18,43 @@ from habitat_baselines.rl.models.rnn_state_encoder import (
 )
 from habitat_baselines.utils.common import get_action_space_info
 
+_HIDDEN_STATES_DTYPES = {
+    "float32": torch.float32,
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+}
+_FLOAT_IMAGE_DTYPES = {"float16": np.float16, "int16": np.int16}
+
+
+@torch.jit.script
+def reverse_discounted_cumsum(
+    x: torch.Tensor, discounts: torch.Tensor, last: torch.Tensor
+) -> torch.Tensor:
+    r"""Computes :py:`y[t] = x[t] + discounts[t] * y[t + 1]` backward along
+    the first dimension, with :py:`y[len(x)] = last`. This is the scan
+    behind the returns and the GAE of the rollout storages, compiled so
+    that it runs as a single call instead of a Python loop of tensor ops.
+    """
+    out = torch.empty_like(x)
+    acc = last
+    for t in range(x.size(0) - 1, -1, -1):
+        acc = x[t] + discounts[t] * acc
+        out[t] = acc
+    return out
+
 
 @baseline_registry.register_storage
 class RolloutStorage:
-    r"""Class for storing rollout information for RL trainers."""
+    r"""Class for storing rollout information for RL trainers.
+
+    With :p:`compact_observations`, the float image observations (e.g.
+    depth) are stored as :p:`float_image_dtype`: either float16 or int16
+    scaled to the upper bound of their observation space. The uint8 images
+    (e.g. RGB) are always stored as uint8. The recurrent hidden states are
+    stored as :p:`hidden_states_dtype`. The observations and hidden states
+    are converted back to float32 when read through
+    :ref:`get_current_step` and :ref:`recurrent_generator`.
+    """
 
     def __init__(
         self,
@@ -32,21 +65,44 @@ class RolloutStorage:
         recurrent_hidden_state_size,
         num_recurrent_layers=1,
         is_double_buffered: bool = False,
+        compact_observations: bool = False,
+        float_image_dtype: str = "float16",
+        hidden_states_dtype: str = "float32",
     ):
         action_shape, discrete_actions = get_action_space_info(action_space)
 
         self.buffers = TensorDict()
         self.buffers["observations"] = TensorDict()
 
+        # Observations stored in a compact dtype, mapped to the scale of
+        # their int16 values or to None for float16
+        self._compact_observations: Dict[str, Optional[float]] = {}
         for sensor in observation_space.spaces:
+            space = observation_space.spaces[sensor]
+            dtype = space.dtype
+            if (
+                compact_observations
+                and len(space.shape) == 3
+                and np.issubdtype(dtype, np.floating)
+            ):
+                dtype = _FLOAT_IMAGE_DTYPES[float_image_dtype]
+                high = float(np.max(space.high))
+                if dtype == np.int16 and np.isfinite(high) and high > 0:
+                    self._compact_observations[sensor] = (
+                        np.iinfo(np.int16).max / high
+                    )
+                else:
+                    dtype = np.float16
+                    self._compact_observations[sensor] = None
+
             self.buffers["observations"][sensor] = torch.from_numpy(
                 np.zeros(
                     (
                         numsteps + 1,
                         num_envs,
-                        *observation_space.spaces[sensor].shape,
+                        *space.shape,
                     ),
-                    dtype=observation_space.spaces[sensor].dtype,
+                    dtype=dtype,
                 )
             )
 
@@ -55,6 +111,7 @@ class RolloutStorage:
             num_envs,
             num_recurrent_layers,
             recurrent_hidden_state_size,
+            dtype=_HIDDEN_STATES_DTYPES[hidden_states_dtype],
         )
 
         self.buffers["rewards"] = torch.zeros(numsteps + 1, num_envs, 1)
@@ -83,6 +140,11 @@ class RolloutStorage:
         self.buffers["masks"] = torch.zeros(
             numsteps + 1, num_envs, 1, dtype=torch.bool
         )
+        # Steps to exclude from the losses, e.g. the action taken on the
+        # terminal observation of an environment resetting asynchronously
+        self.buffers["loss_mask"] = torch.ones(
+            numsteps + 1, num_envs, 1, dtype=torch.bool
+        )
 
         self.is_double_buffered = is_double_buffered
         self._nbuffers = 2 if is_double_buffered else 1
@@ -108,6 +170,65 @@ class RolloutStorage:
         self.buffers.map_in_place(lambda v: v.to(device))
         self.device = device
 
+    def _get_env_slice(self, buffer_index: int) -> slice:
+        return slice(
+            int(buffer_index * self._num_envs / self._nbuffers),
+            int((buffer_index + 1) * self._num_envs / self._nbuffers),
+        )
+
+    def _encode_observations(self, observations):
+        if len(self._compact_observations) == 0:
+            return observations
+
+        observations = TensorDict.from_tree(observations)
+        for sensor, scale in self._compact_observations.items():
+            if scale is not None and sensor in observations:
+                observations[sensor] = (
+                    (observations[sensor] * scale)
+                    .round_()
+                    .clamp_(
+                        np.iinfo(np.int16).min,
+                        np.iinfo(np.int16).max,
+                    )
+                )
+        return observations
+
+    def _decode(self, batch: TensorDict) -> TensorDict:
+        r"""Converts the observations and hidden states of a batch read from
+        the buffers back to float32.
+        """
+        if "observations" in batch:
+            observations = batch["observations"]
+            for sensor, scale in self._compact_observations.items():
+                observations[sensor] = observations[sensor].float()
+                if scale is not None:
+                    observations[sensor].mul_(1.0 / scale)
+        if "recurrent_hidden_states" in batch:
+            batch["recurrent_hidden_states"] = batch[
+                "recurrent_hidden_states"
+            ].float()
+        return batch
+
+    def insert_first_observations(self, batch) -> None:
+        r"""Writes the observations of the first step of the rollout."""
+        self.buffers["observations"][0] = self._encode_observations(batch)
+
+    def get_current_step(
+        self, buffer_index: Optional[int] = None
+    ) -> TensorDict:
+        r"""Returns the current step of the environments of
+        :p:`buffer_index`, or of all the environments if :py:`None`, with
+        the observations and hidden states converted back to float32.
+        """
+        if buffer_index is None:
+            index = self.current_rollout_step_idx
+        else:
+            index = (
+                self.current_rollout_step_idxs[buffer_index],
+                self._get_env_slice(buffer_index),
+            )
+        return self._decode(self.buffers[index])
+
     def insert(
         self,
         next_observations=None,
@@ -118,11 +239,15 @@ class RolloutStorage:
         rewards=None,
         next_masks=None,
         buffer_index: int = 0,
+        loss_mask=None,
         **kwargs,
     ):
         if not self.is_double_buffered:
             assert buffer_index == 0
 
+        if next_observations is not None:
+            next_observations = self._encode_observations(next_observations)
+
         next_step = dict(
             observations=next_observations,
             recurrent_hidden_states=next_recurrent_hidden_states,
@@ -135,15 +260,13 @@ class RolloutStorage:
             action_log_probs=action_log_probs,
             value_preds=value_preds,
             rewards=rewards,
+            loss_mask=loss_mask,
         )
 
         next_step = {k: v for k, v in next_step.items() if v is not None}
         current_step = {k: v for k, v in current_step.items() if v is not None}
 
-        env_slice = slice(
-            int(buffer_index * self._num_envs / self._nbuffers),
-            int((buffer_index + 1) * self._num_envs / self._nbuffers),
-        )
+        env_slice = self._get_env_slice(buffer_index)
 
         if len(next_step) > 0:
             self.buffers.set(
@@ -159,6 +282,22 @@ class RolloutStorage:
                 strict=False,
             )
 
+    def get_next_observations(
+        self, buffer_index: int = 0
+    ) -> Optional[TensorDict]:
+        r"""Returns the slot of the observations buffer that the next
+        :ref:`insert` writes :py:`next_observations` to, so that they can be
+        batched in place instead of being inserted. Returns :py:`None` if the
+        storage does not support this, e.g. when it stores compact
+        observations.
+        """
+        if len(self._compact_observations) > 0:
+            return None
+        return self.buffers["observations"][
+            self.current_rollout_step_idxs[buffer_index] + 1,
+            self._get_env_slice(buffer_index),
+        ]
+
     def advance_rollout(self, buffer_index: int = 0):
         self.current_rollout_step_idxs[buffer_index] += 1
 
@@ -169,37 +308,39 @@ class RolloutStorage:
             0 for _ in self.current_rollout_step_idxs
         ]
 
+    def _compute_gae_returns(self, num_steps: int, gamma, tau) -> None:
+        r"""Computes the GAE returns of the first :p:`num_steps` steps,
+        bootstrapped from the value of step :p:`num_steps`.
+        """
+        assert isinstance(self.buffers["value_preds"], torch.Tensor)
+        value_preds = self.buffers["value_preds"]
+        next_masks = self.buffers["masks"][1 : num_steps + 1]
+        deltas = (
+            self.buffers["rewards"][:num_steps]
+            + gamma * value_preds[1 : num_steps + 1] * next_masks
+            - value_preds[:num_steps]
+        )
+        gae = reverse_discounted_cumsum(
+            deltas,
+            gamma * tau * next_masks,
+            torch.zeros_like(value_preds[0]),
+        )
+        self.buffers["returns"][:num_steps] = gae + value_preds[:num_steps]
+
     def compute_returns(self, next_value, use_gae, gamma, tau):
+        num_steps = self.current_rollout_step_idx
         if use_gae:
             assert isinstance(self.buffers["value_preds"], torch.Tensor)
-            self.buffers["value_preds"][
-                self.current_rollout_step_idx
-            ] = next_value
-            gae = 0.0
-            for step in reversed(range(self.current_rollout_step_idx)):
-                delta = (
-                    self.buffers["rewards"][step]
-                    + gamma
-                    * self.buffers["value_preds"][step + 1]
-                    * self.buffers["masks"][step + 1]
-                    - self.buffers["value_preds"][step]
-                )
-                gae = (
-                    delta + gamma * tau * gae * self.buffers["masks"][step + 1]
-                )
-                self.buffers["returns"][step] = (  # type: ignore
-                    gae + self.buffers["value_preds"][step]  # type: ignore
-                )
-
+            self.buffers["value_preds"][num_steps] = next_value
+            self._compute_gae_returns(num_steps, gamma, tau)
         else:
-            self.buffers["returns"][self.current_rollout_step_idx] = next_value
-            for step in reversed(range(self.current_rollout_step_idx)):
-                self.buffers["returns"][step] = (
-                    gamma
-                    * self.buffers["returns"][step + 1]
-                    * self.buffers["masks"][step + 1]
-                    + self.buffers["rewards"][step]
-                )
+            assert isinstance(self.buffers["returns"], torch.Tensor)
+            self.buffers["returns"][num_steps] = next_value
+            self.buffers["returns"][:num_steps] = reverse_discounted_cumsum(
+                self.buffers["rewards"][:num_steps],
+                gamma * self.buffers["masks"][1 : num_steps + 1],
+                self.buffers["returns"][num_steps],
+            )
 
     def recurrent_generator(
         self,
@@ -239,6 +380,7 @@ class RolloutStorage:
             batch["recurrent_hidden_states"] = batch[
                 "recurrent_hidden_states"
             ][0:1]
+            batch = self._decode(batch)
 
             batch.map_in_place(lambda v: v.flatten(0, 1))
 
@@ -306,6 +306,15 @@ class PPOConfig(HabitatBaselinesBaseConfig):
     # policy inference time during rollout generation
     # Not that this does not change the memory requirements
     use_double_buffered_sampler: bool = False
+    # Store the rollout observations and hidden states in compact dtypes,
+    # converted back to float32 when read. The float image observations,
+    # like depth, are stored as rollout_float_image_dtype: "float16" or
+    # "int16" scaled to the upper bound of their observation space. The
+    # hidden states are stored as rollout_hidden_states_dtype: "float32",
+    # "float16" or "bfloat16". Not supported by VER
+    compact_rollout_storage: bool = False
+    rollout_float_image_dtype: str = "float16"
+    rollout_hidden_states_dtype: str = "float32"
 
 
 @dataclass
@@ -371,6 +380,32 @@ class RLConfig(HabitatBaselinesBaseConfig):
 class ProfilingConfig(HabitatBaselinesBaseConfig):
     capture_start_step: int = -1
     num_steps_to_capture: int = -1
+    # Log the wall time of the environment steps and of each action, sensor
+    # and measure every log_interval updates, see habitat.utils.step_timing.
+    log_step_timings: bool = False
+
+
+@dataclass
+class VectorEnvConfig(HabitatBaselinesBaseConfig):
+    """Options of the VectorEnv created by construct_envs"""
+
+    # Have the workers write the observations in preallocated shared memory
+    # instead of pickling them through the pipes. Cuts the per-step copy
+    # cost when the observations are large images.
+    use_shared_memory_obs: bool = False
+    # Number of environments hosted by each worker process. The worker steps
+    # them in a loop and sends their results back in a single message, which
+    # allows running more environments than there are cores.
+    envs_per_worker: int = 1
+    # Return the terminal observation of a done environment right away and
+    # reset it while the policy and the other environments run, instead of
+    # blocking the whole batch on its reset. The trainer masks out the step
+    # taken on the terminal observation. Not used for evaluation.
+    async_auto_reset: bool = False
+    # Load the dataset once in the main process and publish it in shared
+    # memory, the workers then only load the episodes of their scenes from
+    # it instead of each parsing the whole dataset.
+    share_dataset: bool = False
 
 
 @dataclass
@@ -420,6 +455,7 @@ class HabitatBaselinesConfig(HabitatBaselinesBaseConfig):
     load_resume_state_config: bool = True
     eval: EvalConfig = EvalConfig()
     profiling: ProfilingConfig = ProfilingConfig()
+    vector_env: VectorEnvConfig = VectorEnvConfig()
 
 
 @dataclass
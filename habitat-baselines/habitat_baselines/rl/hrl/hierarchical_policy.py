@@ -66,6 +66,9 @@ class HierarchicalPolicy(nn.Module, Policy):
         self._skills: Dict[int, SkillPolicy] = {}
         self._name_to_idx: Dict[str, int] = {}
         self._idx_to_name: Dict[int, str] = {}
+        # Maps (skill idx -> idx of the first skill with the same policy).
+        # The environments of skills sharing a policy are batched together.
+        self._skill_to_group: Dict[int, int] = {-1: -1}
 
         task_spec_file = osp.join(
             full_config.habitat.task.task_spec_base_path,
@@ -97,10 +100,12 @@ class HierarchicalPolicy(nn.Module, Policy):
                 action_names = [skill_name]
             else:
                 action_names = skill_config.pddl_action_names
+            group_idx = skill_i
             for skill_id in action_names:
                 self._name_to_idx[skill_id] = skill_i
                 self._idx_to_name[skill_i] = skill_id
                 self._skills[skill_i] = skill_policy
+                self._skill_to_group[skill_i] = group_idx
                 skill_i += 1
 
         self._cur_skills: torch.Tensor = torch.full(
@@ -141,10 +146,11 @@ class HierarchicalPolicy(nn.Module, Policy):
         self, action_data, infos, dones
     ) -> List[Dict[str, float]]:
         ret_policy_infos = []
+        cur_skills = self._cur_skills.tolist()
         for i, (info, policy_info) in enumerate(
             zip(infos, action_data.policy_info)
         ):
-            cur_skill_idx = self._cur_skills[i].item()
+            cur_skill_idx = cur_skills[i]
             ret_policy_info: Dict[str, Any] = {
                 "cur_skill": self._idx_to_name[cur_skill_idx],
                 **policy_info,
@@ -185,21 +191,27 @@ class HierarchicalPolicy(nn.Module, Policy):
         should_adds: Optional[torch.Tensor] = None,
     ) -> Dict[int, Tuple[List[int], Dict[str, Any]]]:
         """
-        Groups the information per skill. Specifically, this will return a map
-        from the skill ID to the indices of the batch and the observations at
-        these indices the skill is currently running for. This is used to batch
-        observations per skill.
+        Groups the information per skill policy. Specifically, this will
+        return a map from the skill ID to the indices of the batch and the
+        observations at these indices the skill is currently running for. This
+        is used to batch observations per skill. Skills sharing the same
+        policy, like several PDDL actions executed by one skill, form a single
+        group keyed by the first of their IDs.
+
+        :param skill_ids: CPU tensor of the skill ID of each environment.
+        :param should_adds: Optional CPU tensor of the environments to group.
         """
 
         skill_to_batch: Dict[int, List[int]] = defaultdict(list)
         if should_adds is None:
-            should_adds = [True for _ in range(len(skill_ids))]
-        for i, (cur_skill, should_add) in enumerate(
-            zip(skill_ids, should_adds)
-        ):
-            if should_add:
-                cur_skill = cur_skill.item()
-                skill_to_batch[cur_skill].append(i)
+            for i, cur_skill in enumerate(skill_ids.tolist()):
+                skill_to_batch[self._skill_to_group[cur_skill]].append(i)
+        else:
+            for i, (cur_skill, should_add) in enumerate(
+                zip(skill_ids.tolist(), should_adds.view(-1).tolist())
+            ):
+                if should_add:
+                    skill_to_batch[self._skill_to_group[cur_skill]].append(i)
         grouped_skills = {}
         for k, v in skill_to_batch.items():
             grouped_skills[k] = (
@@ -216,6 +228,7 @@ class HierarchicalPolicy(nn.Module, Policy):
         masks,
         deterministic=False,
     ):
+        # Single transfer of the masks, the skill bookkeeping is on the CPU.
         masks_cpu = masks.cpu()
         log_info: List[Dict[str, Any]] = [{} for _ in range(self._num_envs)]
         self._high_level_policy.apply_mask(masks_cpu)  # type: ignore[attr-defined]
@@ -252,10 +265,14 @@ class HierarchicalPolicy(nn.Module, Policy):
                 "hl_wants_skill_term": hl_wants_skill_term,
             },
             # Only decide on skill termination if the episode is active.
-            should_adds=masks,
+            should_adds=masks_cpu,
         )
 
         # Check if skills should terminate.
+        cur_skill_names = [
+            self._idx_to_name.get(skill_id)
+            for skill_id in self._cur_skills.tolist()
+        ]
         for skill_id, (batch_ids, dat) in grouped_skills.items():
             if skill_id == -1:
                 # Policy has not prediced a skill yet.
@@ -272,10 +289,7 @@ class HierarchicalPolicy(nn.Module, Policy):
                 **dat,
                 batch_idx=batch_ids,
                 log_info=log_info,
-                skill_name=[
-                    self._idx_to_name[self._cur_skills[i].item()]
-                    for i in batch_ids
-                ],
+                skill_name=[cur_skill_names[i] for i in batch_ids],
             )
 
         # Always call high-level if the episode is over.
@@ -322,8 +336,8 @@ class HierarchicalPolicy(nn.Module, Policy):
                     raise ValueError(
                         f"The code does not currently support neural LL and neural HL skills. Skill={self._skills[skill_id]}, HL={self._high_level_policy}"
                     )
-            self._cur_skills = ((~call_high_level) * self._cur_skills) + (
-                call_high_level * new_skills
+            self._cur_skills = torch.where(
+                call_high_level, new_skills.long(), self._cur_skills
             )
 
         grouped_skills = self._broadcast_skill_ids(
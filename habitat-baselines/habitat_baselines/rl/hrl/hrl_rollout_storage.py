@@ -49,6 +49,7 @@ class HrlRolloutStorage(RolloutStorage):
         next_masks=None,
         buffer_index: int = 0,
         should_inserts: Optional[torch.BoolTensor] = None,
+        loss_mask: Optional[torch.BoolTensor] = None,
     ):
         """
         The only key different from the base `RolloutStorage` is
@@ -59,12 +60,20 @@ class HrlRolloutStorage(RolloutStorage):
         state.
 
         Rewards acquired of steps where `should_insert[i] == False` will be summed up and added to the next step where `should_insert[i] == True`
+
+        `loss_mask` is stored with the sample inserted at this step, like in
+        the base `RolloutStorage`, and is combined with the padding mask in
+        `recurrent_generator`.
         """
 
         if next_masks is not None:
             next_masks = next_masks.to(self.device)
         if rewards is not None:
             rewards = rewards.to(self.device)
+        if loss_mask is not None:
+            loss_mask = loss_mask.to(self.device)
+        if next_observations is not None:
+            next_observations = self._encode_observations(next_observations)
         next_step = dict(
             observations=next_observations,
             recurrent_hidden_states=next_recurrent_hidden_states,
@@ -76,6 +85,7 @@ class HrlRolloutStorage(RolloutStorage):
             actions=actions,
             action_log_probs=action_log_probs,
             value_preds=value_preds,
+            loss_mask=loss_mask,
         )
 
         next_step = TensorDict(
@@ -119,6 +129,13 @@ class HrlRolloutStorage(RolloutStorage):
             )
         self._last_should_inserts = should_inserts
 
+    def get_next_observations(
+        self, buffer_index: int = 0
+    ) -> Optional[TensorDict]:
+        # The write position depends on `should_inserts`, which is only known
+        # at insert time.
+        return None
+
     def advance_rollout(self, buffer_index: int = 0):
         """
         This will advance to writing at the next step in the data buffer ONLY
@@ -151,20 +168,9 @@ class HrlRolloutStorage(RolloutStorage):
         if not use_gae:
             raise ValueError("Only GAE is supported with HRL trainer")
 
-        assert isinstance(self.buffers["value_preds"], torch.Tensor)
-        gae = 0.0
-        for step in reversed(range(self._cur_step_idxs.max() - 1)):
-            delta = (
-                self.buffers["rewards"][step]
-                + gamma
-                * self.buffers["value_preds"][step + 1]
-                * self.buffers["masks"][step + 1]
-                - self.buffers["value_preds"][step]
-            )
-            gae = delta + gamma * tau * gae * self.buffers["masks"][step + 1]
-            self.buffers["returns"][step] = (  # type: ignore
-                gae + self.buffers["value_preds"][step]  # type: ignore
-            )
+        self._compute_gae_returns(
+            max(int(self._cur_step_idxs.max()) - 1, 0), gamma, tau
+        )
 
     def recurrent_generator(
         self, advantages, num_batches
@@ -187,16 +193,14 @@ class HrlRolloutStorage(RolloutStorage):
             batch["recurrent_hidden_states"] = batch[
                 "recurrent_hidden_states"
             ][0:1]
-            batch["loss_mask"] = (
-                torch.arange(self.num_steps, device=advantages.device)
-                .view(-1, 1, 1)
-                .repeat(1, len(inds), 1)
+            batch = self._decode(batch)
+            # The -1 is to throw out the last transition.
+            num_written = (self._cur_step_idxs[inds] - 1).to(self.device)
+            step_idxs = torch.arange(self.num_steps, device=self.device)
+            batch["loss_mask"] = torch.logical_and(
+                batch["loss_mask"],
+                step_idxs.view(-1, 1, 1) < num_written.view(1, -1, 1),
             )
-            for i, env_i in enumerate(inds):
-                # The -1 is to throw out the last transition.
-                batch["loss_mask"][:, i] = (
-                    batch["loss_mask"][:, i] < self._cur_step_idxs[env_i] - 1
-                )
 
             batch.map_in_place(lambda v: v.flatten(0, 1))
             batch["rnn_build_seq_info"] = build_rnn_build_seq_info(
@@ -97,6 +97,9 @@ class PPO(nn.Module):
             ).to(device=self.device)
 
         self.use_normalized_advantage = use_normalized_advantage
+        # Set by the trainer when steps can be excluded from the loss
+        # (e.g. the reset steps of asynchronously auto-resetting envs).
+        self.use_loss_mask = False
 
         params = list(filter(lambda p: p.requires_grad, self.parameters()))
 
@@ -224,6 +227,15 @@ class PPO(nn.Module):
         else:
             mean_fn = torch.mean
 
+        if self.use_loss_mask:
+            assert isinstance(batch["loss_mask"], torch.Tensor)
+            loss_mask = batch["loss_mask"].float()
+            num_valid = loss_mask.sum().clamp(min=1.0)
+            weighted_mean_fn = mean_fn
+            mean_fn = lambda t: (
+                weighted_mean_fn(loss_mask * t) * loss_mask.numel() / num_valid
+            )
+
         action_loss, value_loss, dist_entropy = map(
             mean_fn,
             (action_loss, value_loss, dist_entropy),
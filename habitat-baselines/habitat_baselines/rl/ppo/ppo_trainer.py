@@ -9,7 +9,7 @@ import os
 import random
 import time
 from collections import defaultdict, deque
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import torch
@@ -25,6 +25,7 @@ from habitat.config.default import get_agent_config
 from habitat.tasks.rearrange.rearrange_sensors import GfxReplayMeasure
 from habitat.tasks.rearrange.utils import write_gfx_replay
 from habitat.utils import profiling_wrapper
+from habitat.utils.step_timing import merge_step_timings
 from habitat.utils.visualizations.utils import (
     observations_to_image,
     overlay_frame,
@@ -40,6 +41,7 @@ from habitat_baselines.common.obs_transformers import (
 from habitat_baselines.common.rollout_storage import (  # noqa: F401.
     RolloutStorage,
 )
+from habitat_baselines.common.tensor_dict import NDArrayDict
 from habitat_baselines.common.tensorboard_utils import (
     TensorboardWriter,
     get_writer,
@@ -70,6 +72,7 @@ from habitat_baselines.utils.common import (
     get_action_space_info,
     inference_mode,
     is_continuous_action_space,
+    stacked_obs_to_device,
 )
 from habitat_baselines.utils.info_dict import (
     NON_SCALAR_METRICS,
@@ -212,6 +215,10 @@ class PPOTrainer(BaseRLTrainer):
             )
 
         self.agent = agent_cls.from_config(self.actor_critic, ppo_cfg)
+        # The reset steps of auto-resetting envs are masked out of the loss
+        self.agent.use_loss_mask = (
+            self.config.habitat_baselines.vector_env.async_auto_reset
+        )
         self.policy_action_space = self.actor_critic.get_policy_action_space(
             self.env_action_space
         )
@@ -347,6 +354,13 @@ class PPOTrainer(BaseRLTrainer):
 
         self._nbuffers = 2 if ppo_cfg.use_double_buffered_sampler else 1
 
+        storage_kwargs = {}
+        if ppo_cfg.compact_rollout_storage:
+            storage_kwargs = dict(
+                compact_observations=True,
+                float_image_dtype=ppo_cfg.rollout_float_image_dtype,
+                hidden_states_dtype=ppo_cfg.rollout_hidden_states_dtype,
+            )
         rollouts_cls = baseline_registry.get_storage(
             self.config.habitat_baselines.rollout_storage_name
         )
@@ -358,6 +372,7 @@ class PPOTrainer(BaseRLTrainer):
             ppo_cfg.hidden_size,
             num_recurrent_layers=self.actor_critic.num_recurrent_layers,
             is_double_buffered=ppo_cfg.use_double_buffered_sampler,
+            **storage_kwargs,
         )
         self.rollouts.to(self.device)
 
@@ -371,9 +386,17 @@ class PPOTrainer(BaseRLTrainer):
                     PointNavResNetNet.PRETRAINED_VISUAL_FEATURES_KEY
                 ] = self._encoder(batch)
 
-        self.rollouts.buffers["observations"][0] = batch  # type: ignore
+        self.rollouts.insert_first_observations(batch)
 
         self.current_episode_reward = torch.zeros(self.envs.num_envs, 1)
+        # Environments that returned their terminal observation and ignore
+        # their next action while they reset asynchronously
+        self._envs_resetting = torch.zeros(
+            self.envs.num_envs, 1, dtype=torch.bool
+        )
+        # Number of environments and pinned buffers of the observations of
+        # the last step of each rollout buffer, see stacked_obs_to_device
+        self._staged_observations: Dict[int, Tuple[int, NDArrayDict]] = {}
         self.running_episode_stats = dict(
             count=torch.zeros(self.envs.num_envs, 1),
             reward=torch.zeros(self.envs.num_envs, 1),
@@ -443,10 +466,7 @@ class PPOTrainer(BaseRLTrainer):
 
         # sample actions
         with inference_mode():
-            step_batch = self.rollouts.buffers[
-                self.rollouts.current_rollout_step_idxs[buffer_index],
-                env_slice,
-            ]
+            step_batch = self.rollouts.get_current_step(buffer_index)
 
             profiling_wrapper.range_push("compute actions")
             action_data = self.actor_critic.act(
@@ -462,20 +482,17 @@ class PPOTrainer(BaseRLTrainer):
 
         t_step_env = time.time()
 
-        for index_env, act in zip(
-            range(env_slice.start, env_slice.stop),
-            action_data.env_actions.cpu().unbind(0),
-        ):
-            if is_continuous_action_space(self.env_action_space):
-                # Clipping actions to the specified limits
-                act = np.clip(
-                    act.numpy(),
-                    self.env_action_space.low,
-                    self.env_action_space.high,
-                )
-            else:
-                act = act.item()
-            self.envs.async_step_at(index_env, act)
+        env_actions = action_data.env_actions.cpu().numpy()
+        if is_continuous_action_space(self.env_action_space):
+            # Clipping actions to the specified limits
+            env_actions = np.clip(
+                env_actions,
+                self.env_action_space.low,
+                self.env_action_space.high,
+            )
+        self.envs.async_step_batched(
+            env_actions, range(env_slice.start, env_slice.stop)
+        )
 
         self.env_time += time.time() - t_step_env
 
@@ -496,35 +513,71 @@ class PPOTrainer(BaseRLTrainer):
         )
 
         t_step_env = time.time()
-        outputs = [
-            self.envs.wait_step_at(index_env)
-            for index_env in range(env_slice.start, env_slice.stop)
-        ]
+        next_observations = None
+        observations_out = None
+        if (
+            len(self.obs_transforms) == 0
+            and not self._static_encoder
+            and self.rollouts.device.type == "cpu"
+        ):
+            # Nothing modifies the observations before they are inserted,
+            # so stack them directly into the rollout storage
+            next_observations = self.rollouts.get_next_observations(
+                buffer_index
+            )
+            observations_out = next_observations.numpy()
+        else:
+            # Stack them into the pinned buffers of the previous step of
+            # this buffer, if the number of environments did not change
+            num_staged, staged = self._staged_observations.get(
+                buffer_index, (None, None)
+            )
+            if num_staged == env_slice.stop - env_slice.start:
+                observations_out = staged
 
-        observations, rewards_l, dones, infos = [
-            list(x) for x in zip(*outputs)
-        ]
+        step_result = self.envs.wait_step_batched(
+            range(env_slice.start, env_slice.stop),
+            observations_out=observations_out,
+        )
+        infos = step_result.infos
 
         self.env_time += time.time() - t_step_env
 
         t_update_stats = time.time()
-        batch = batch_obs(observations, device=self.device)
+        if next_observations is not None:
+            batch = next_observations
+        else:
+            batch, staged = stacked_obs_to_device(
+                step_result.observations,
+                self.device,
+                name=("step_result", buffer_index),
+            )
+            self._staged_observations[buffer_index] = (
+                env_slice.stop - env_slice.start,
+                staged,
+            )
         batch = apply_obs_transforms_batch(batch, self.obs_transforms)  # type: ignore
 
-        rewards = torch.tensor(
-            rewards_l,
-            dtype=torch.float,
-            device=self.current_episode_reward.device,
+        rewards = torch.from_numpy(step_result.rewards).to(
+            self.current_episode_reward.device
         )
         rewards = rewards.unsqueeze(1)
 
-        not_done_masks = torch.tensor(
-            [[not done] for done in dones],
-            dtype=torch.bool,
-            device=self.current_episode_reward.device,
+        not_done_masks = (
+            torch.from_numpy(np.logical_not(step_result.dones))
+            .to(self.current_episode_reward.device)
+            .unsqueeze(1)
         )
         done_masks = torch.logical_not(not_done_masks)
 
+        # The environments that were resetting ignored the action and
+        # returned the first observation of their new episode
+        was_resetting = self._envs_resetting[env_slice].clone()
+        self._envs_resetting[env_slice] = torch.from_numpy(
+            step_result.resetting
+        ).unsqueeze(1)
+        not_done_masks.logical_and_(torch.logical_not(was_resetting))
+
         self.current_episode_reward[env_slice] += rewards
         current_ep_reward = self.current_episode_reward[env_slice]
         self.running_episode_stats["reward"][env_slice] += current_ep_reward.where(done_masks, current_ep_reward.new_zeros(()))  # type: ignore
@@ -549,11 +602,16 @@ class PPOTrainer(BaseRLTrainer):
                     PointNavResNetNet.PRETRAINED_VISUAL_FEATURES_KEY
                 ] = self._encoder(batch)
 
+        loss_kwargs = {}
+        if self.config.habitat_baselines.vector_env.async_auto_reset:
+            loss_kwargs["loss_mask"] = torch.logical_not(was_resetting)
+
         self.rollouts.insert(
-            next_observations=batch,
+            next_observations=batch if next_observations is None else None,
             rewards=rewards,
             next_masks=not_done_masks,
             buffer_index=buffer_index,
+            **loss_kwargs,
         )
 
         self.rollouts.advance_rollout(buffer_index)
@@ -572,9 +630,7 @@ class PPOTrainer(BaseRLTrainer):
         ppo_cfg = self.config.habitat_baselines.rl.ppo
         t_update_model = time.time()
         with inference_mode():
-            step_batch = self.rollouts.buffers[
-                self.rollouts.current_rollout_step_idx
-            ]
+            step_batch = self.rollouts.get_current_step()
 
             next_value = self.actor_critic.get_value(
                 step_batch["observations"],
@@ -699,6 +755,49 @@ class PPOTrainer(BaseRLTrainer):
                 )
             )
 
+            if self.config.habitat_baselines.profiling.log_step_timings:
+                self._log_step_timings(writer)
+
+    def _log_step_timings(self, writer) -> None:
+        r"""Logs the wall time of the environment steps, task actions,
+        sensors and measures since the last call, merged over the
+        environments.
+        """
+        if not isinstance(self.envs, VectorEnv):
+            return
+        step_timings = merge_step_timings(
+            self.envs.call(
+                ["get_step_timings"] * self.envs.num_envs,
+                [{"reset": True}] * self.envs.num_envs,
+            )
+        )
+        timing_stats = {
+            name: histogram.get_stats()
+            for name, histogram in sorted(step_timings.items())
+        }
+        for name, stats in timing_stats.items():
+            writer.add_scalar(
+                f"step_timing/{name}/mean_ms",
+                1000 * stats["mean"],
+                self.num_steps_done,
+            )
+            writer.add_scalar(
+                f"step_timing/{name}/p90_ms",
+                1000 * stats["p90"],
+                self.num_steps_done,
+            )
+        logger.info(
+            "update: {}\tstep timings (mean/p90 ms): {}".format(
+                self.num_updates_done,
+                "  ".join(
+                    "{}: {:.3f}/{:.3f}".format(
+                        name, 1000 * stats["mean"], 1000 * stats["p90"]
+                    )
+                    for name, stats in timing_stats.items()
+                ),
+            )
+        )
+
     def should_end_early(self, rollout_step) -> bool:
         if not self._is_distributed:
             return False
@@ -918,6 +1017,9 @@ class PPOTrainer(BaseRLTrainer):
 
         with read_write(config):
             config.habitat.dataset.split = config.habitat_baselines.eval.split
+            # The evaluation loop does not mask the steps of the resetting
+            # environments
+            config.habitat_baselines.vector_env.async_auto_reset = False
 
         if len(self.config.habitat_baselines.eval.video_option) > 0:
             agent_config = get_agent_config(config.habitat.simulator)
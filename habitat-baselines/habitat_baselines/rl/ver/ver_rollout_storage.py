@@ -9,7 +9,10 @@ from typing import Any, Dict, Iterator, List, Optional, Tuple
 import numpy as np
 import torch
 
-from habitat_baselines.common.rollout_storage import RolloutStorage
+from habitat_baselines.common.rollout_storage import (
+    RolloutStorage,
+    reverse_discounted_cumsum,
+)
 from habitat_baselines.common.tensor_dict import DictTree, TensorDict
 from habitat_baselines.rl.models.rnn_state_encoder import (
     _np_invert_permutation,
@@ -506,45 +509,55 @@ class VERRolloutStorage(RolloutStorage):
         returns = returns_t.view(-1, 1).numpy()
         returns[:] = returns[self.select_inds]
 
-        gae = np.zeros((self.num_seqs_at_step[0], 1))
-        last_values = gae.copy()
-        ptr = returns.size
-        for len_minus_1, n_seqs in reversed(
-            list(enumerate(self.num_seqs_at_step))
-        ):
-            curr_slice = slice(ptr - n_seqs, ptr)
-            q_est = rewards[curr_slice] + gamma * last_values[:n_seqs]
-            delta = q_est - values[curr_slice]
-            gae[:n_seqs] = delta + (tau * gamma) * gae[:n_seqs]
-
-            is_last_step = self.sequence_lengths == (len_minus_1 + 1)
-            is_last_step_for_env = (
-                is_last_step & self.last_sequence_in_batch_mask
-            )
-
-            # For the last step from each worker, we do an extra loop
-            # to fill last_values with the bootstrap.  So we re-zero
-            # the GAE value here
-            gae[is_last_step_for_env] = 0.0
-
-            # If the step isn't stale or we don't have a return
-            # calculate, use the newly calculated return value,
-            # otherwise keep the current one
-            use_new_value = is_not_stale[curr_slice] | np.logical_not(
-                np.isfinite(returns[curr_slice])
-            )
-            returns[curr_slice][use_new_value] = (
-                gae[:n_seqs] + values[curr_slice]
-            )[use_new_value]
-
-            # We also mark these with a nan
-            returns[curr_slice][is_last_step_for_env[:n_seqs]] = float("nan")
-
-            last_values[:n_seqs] = values[curr_slice]
-
-            ptr -= n_seqs
+        # Lay the packed steps out as (step, sequence), the sequences being
+        # sorted by decreasing length
+        num_seqs = int(self.num_seqs_at_step[0])
+        is_valid = (
+            np.arange(num_seqs)[np.newaxis, :]
+            < self.num_seqs_at_step[:, np.newaxis]
+        )
 
-        assert ptr == 0
+        def _to_padded(packed: np.ndarray) -> np.ndarray:
+            padded = np.zeros(is_valid.shape, dtype=np.float64)
+            padded[is_valid] = packed[:, 0]
+            return padded
+
+        rewards_p = _to_padded(rewards)
+        values_p = _to_padded(values)
+
+        # The last step from each worker is only there to bootstrap the
+        # return of the previous one
+        is_last_step_for_env = np.zeros_like(is_valid)
+        last_seqs = np.nonzero(self.last_sequence_in_batch_mask)[0]
+        is_last_step_for_env[
+            self.sequence_lengths[last_seqs] - 1, last_seqs
+        ] = True
+
+        next_values = np.zeros_like(values_p)
+        next_values[:-1] = values_p[1:]
+        deltas = rewards_p + gamma * next_values - values_p
+        discounts = np.zeros_like(values_p)
+        discounts[:-1] = np.where(
+            is_valid[1:] & np.logical_not(is_last_step_for_env[1:]),
+            tau * gamma,
+            0.0,
+        )
+        gae = reverse_discounted_cumsum(
+            torch.from_numpy(deltas),
+            torch.from_numpy(discounts),
+            torch.zeros(num_seqs, dtype=torch.float64),
+        ).numpy()
+        gae[is_last_step_for_env] = 0.0
+
+        # If the step isn't stale or we don't have a return
+        # calculate, use the newly calculated return value,
+        # otherwise keep the current one
+        new_returns = (gae + values_p)[is_valid][:, np.newaxis]
+        use_new_value = is_not_stale | np.logical_not(np.isfinite(returns))
+        returns[use_new_value] = new_returns[use_new_value]
+
+        # We also mark these with a nan
+        returns[is_last_step_for_env[is_valid]] = float("nan")
 
         returns[:] = returns[_np_invert_permutation(self.select_inds)]
 
@@ -39,6 +39,7 @@ from habitat.utils import profiling_wrapper
 from habitat.utils.visualizations.utils import images_to_video
 from habitat_baselines.common.tensor_dict import (
     DictTree,
+    NDArrayDict,
     TensorDict,
     TensorOrNDArrayDict,
 )
@@ -194,8 +195,27 @@ def linear_decay(epoch: int, total_num_updates: int) -> float:
 class _ObservationBatchingCache(metaclass=Singleton):
     r"""Helper for batching observations that maintains a cpu-side tensor
     that is the right size and is pinned to cuda memory
+
+    The buffers are kept alive across calls, keyed by sensor name, shape and
+    device, and sliced to the batch size. When a sensor shows up with a
+    different shape, dtype or device, the buffers of its previous layout are
+    dropped.
     """
     _pool: Dict[Any, Union[torch.Tensor, np.ndarray]] = {}
+    _sensor_layouts: Dict[Any, Tuple] = {}
+
+    def invalidate(self, sensor_name: Optional[Any] = None) -> None:
+        r"""Drops the cached buffers of :p:`sensor_name`, or of all the
+        sensors if it is :py:`None`.
+        """
+        if sensor_name is None:
+            self._pool.clear()
+            self._sensor_layouts.clear()
+            return
+
+        for key in [k for k in self._pool if k[0] == sensor_name]:
+            del self._pool[key]
+        self._sensor_layouts.pop(sensor_name, None)
 
     def get(
         self,
@@ -210,13 +230,18 @@ class _ObservationBatchingCache(metaclass=Singleton):
         be pinned to cuda memory.  If sensor is a cuda tensor, the batched tensor will also be
         a cuda tensor
         """
-        key = (
-            sensor_name,
+        layout = (
             tuple(sensor.size()),
             sensor.type(),
             sensor.device.type,
             sensor.device.index,
+            device.type if device is not None else None,
         )
+        if self._sensor_layouts.get(sensor_name, layout) != layout:
+            self.invalidate(sensor_name)
+        self._sensor_layouts[sensor_name] = layout
+
+        key = (sensor_name, *layout)
         if key in self._pool:
             cache = self._pool[key]
             if cache.shape[0] >= num_obs:
@@ -247,6 +272,7 @@ class _ObservationBatchingCache(metaclass=Singleton):
         self,
         observations: List[DictTree],
         device: Optional[torch.device] = None,
+        out: Optional[TensorDict] = None,
     ) -> TensorDict:
         observations = [
             TensorOrNDArrayDict.from_tree(o).map(
@@ -259,6 +285,15 @@ class _ObservationBatchingCache(metaclass=Singleton):
         observation_keys, _ = observations[0].flatten()
         observation_tensors = [o.flatten()[1] for o in observations]
 
+        out_tensors: Dict[Tuple[str, ...], torch.Tensor] = {}
+        if out is not None:
+            out_tensors = dict(zip(*out.flatten()))
+            for sensor_name in observation_keys:
+                if sensor_name not in out_tensors:
+                    raise KeyError(
+                        f"Observation {'.'.join(sensor_name)} has no destination in out"
+                    )
+
         # Order sensors by size, stack and move the largest first
         upload_ordering = sorted(
             range(len(observation_keys)),
@@ -269,17 +304,29 @@ class _ObservationBatchingCache(metaclass=Singleton):
         )
 
         batched_tensors = []
-        for sensor_name, obs in zip(observation_keys, observation_tensors[0]):
-            batched_tensors.append(
-                self.get(
-                    len(observations),
-                    sensor_name,
-                    torch.as_tensor(obs),
-                    device,
+        # numpy views of the cpu destinations the observations are stacked
+        # straight into, the torch observations are copied to the tensors
+        stacked_in_place: Dict[int, np.ndarray] = {}
+        for idx, (sensor_name, obs) in enumerate(
+            zip(observation_keys, observation_tensors[0])
+        ):
+            dst = out_tensors.get(sensor_name, None)
+            if dst is not None and dst.device.type == "cpu":
+                # Stack straight into the destination
+                batched_tensors.append(dst)
+                stacked_in_place[idx] = dst.numpy()
+            else:
+                batched_tensors.append(
+                    self.get(
+                        len(observations),
+                        sensor_name,
+                        torch.as_tensor(obs),
+                        device if dst is None else dst.device,
+                    )
                 )
-            )
 
         for idx in upload_ordering:
+            batched_numpy = stacked_in_place.get(idx, batched_tensors[idx])
             for i, all_obs in enumerate(observation_tensors):
                 obs = all_obs[idx]
                 # Use isinstance(sensor, np.ndarray) here instead of
@@ -287,13 +334,23 @@ class _ObservationBatchingCache(metaclass=Singleton):
                 # path of sensor being an np.ndarray
                 # np.asarray is ~3x slower than checking
                 if isinstance(obs, np.ndarray):
-                    batched_tensors[idx][i] = obs  # type: ignore
+                    batched_numpy[i] = obs  # type: ignore
                 elif isinstance(obs, torch.Tensor):
                     batched_tensors[idx][i].copy_(obs, non_blocking=True)  # type: ignore
                 # If the sensor wasn't a tensor, then it's some CPU side data
                 # so use a numpy array
                 else:
-                    batched_tensors[idx][i] = np.asarray(obs)  # type: ignore
+                    batched_numpy[i] = np.asarray(obs)  # type: ignore
+
+            if out is not None:
+                dst = out_tensors[observation_keys[idx]]
+                if idx not in stacked_in_place:
+                    dst.copy_(
+                        torch.as_tensor(batched_tensors[idx]),
+                        non_blocking=True,
+                    )
+                batched_tensors[idx] = dst
+                continue
 
             # With the batching cache, we use pinned mem
             # so we can start the move to the GPU async
@@ -311,12 +368,74 @@ class _ObservationBatchingCache(metaclass=Singleton):
 
         return TensorDict.from_flattened(observation_keys, batched_tensors)
 
+    def stacked_obs_to_device(
+        self,
+        observations: DictTree,
+        device: torch.device,
+        name: Any = None,
+    ) -> Tuple[TensorDict, NDArrayDict]:
+        r"""Moves observations already stacked over the environments, like the
+        ones of :ref:`habitat.core.vector_env.VectorEnv.wait_step_batched`, to
+        device.
+
+        The cpu arrays are copied to device through buffers pinned to cuda
+        memory, so that the copies are asynchronous. The arrays that are
+        already these buffers are not copied again.
+
+        :param name: name of the buffers, different for batches that can be
+            in flight at the same time.
+        :return: the observations on device and the pinned buffers, which can
+            be passed as :py:`observations_out` to stack the next batch
+            straight into them.
+        """
+        observation_keys, observation_tensors = TensorOrNDArrayDict.from_tree(
+            observations
+        ).flatten()
+
+        # Order sensors by size, move the largest first
+        upload_ordering = sorted(
+            range(len(observation_keys)),
+            key=lambda idx: int(np.prod(observation_tensors[idx].shape)),
+            reverse=True,
+        )
+
+        staging_keys = []
+        staging_arrays = []
+        device_tensors: List[Any] = [None] * len(observation_keys)
+        for idx in upload_ordering:
+            sensor_name = observation_keys[idx]
+            obs = observation_tensors[idx]
+            if isinstance(obs, torch.Tensor):
+                device_tensors[idx] = obs.to(device, non_blocking=True)
+                continue
+
+            obs = np.asarray(obs)
+            staging = self.get(
+                obs.shape[0],
+                (name, *sensor_name),
+                torch.from_numpy(np.ascontiguousarray(obs[0])),
+                device,
+            )
+            if not np.may_share_memory(staging, obs):
+                staging[...] = obs
+            staging_keys.append(sensor_name)
+            staging_arrays.append(staging)
+            device_tensors[idx] = torch.from_numpy(staging).to(  # type: ignore
+                device, non_blocking=True
+            )
+
+        return (
+            TensorDict.from_flattened(observation_keys, device_tensors),
+            NDArrayDict.from_flattened(staging_keys, staging_arrays),
+        )
+
 
 @inference_mode()
 @profiling_wrapper.RangeContext("batch_obs")
 def batch_obs(
     observations: List[DictTree],
     device: Optional[torch.device] = None,
+    out: Optional[TensorDict] = None,
 ) -> TensorDict:
     r"""Transpose a batch of observation dicts to a dict of batched
     observations.
@@ -325,11 +444,40 @@ def batch_obs(
         observations:  list of dicts of observations.
         device: The torch.device to put the resulting tensors on.
             Will not move the tensors if None
+        out: Optional preallocated destination, for instance a step of
+            the rollout storage. The observations are stacked directly into
+            it and device is ignored.
     Returns:
         transposed dict of torch.Tensor of observations.
     """
 
-    return _ObservationBatchingCache().batch_obs(observations, device)
+    return _ObservationBatchingCache().batch_obs(observations, device, out)
+
+
+@inference_mode()
+@profiling_wrapper.RangeContext("stacked_obs_to_device")
+def stacked_obs_to_device(
+    observations: DictTree,
+    device: torch.device,
+    name: Any = None,
+) -> Tuple[TensorDict, NDArrayDict]:
+    r"""Moves observations already stacked over the environments to device
+    through pinned buffers.
+
+    Args:
+        observations: dict of arrays with the environments as first
+            dimension.
+        device: The torch.device to put the resulting tensors on.
+        name: Name of the pinned buffers, different for batches that can
+            be in flight at the same time.
+    Returns:
+        the observations on device, and the pinned buffers that the next
+        batch of the same name can be stacked into.
+    """
+
+    return _ObservationBatchingCache().stacked_obs_to_device(
+        observations, device, name
+    )
 
 
 def get_checkpoint_id(ckpt_path: str) -> Optional[int]:
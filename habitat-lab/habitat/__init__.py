@@ -4,16 +4,76 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from habitat.config import get_config, read_write
-from habitat.core.agent import Agent
-from habitat.core.benchmark import Benchmark
-from habitat.core.challenge import Challenge
-from habitat.core.dataset import Dataset
-from habitat.core.embodied_task import EmbodiedTask, Measure, Measurements
-from habitat.core.env import Env, RLEnv
-from habitat.core.logging import logger
-from habitat.core.registry import registry  # noqa: F401
-from habitat.core.simulator import Sensor, SensorSuite, SensorTypes, Simulator
-from habitat.core.vector_env import ThreadedVectorEnv, VectorEnv
-from habitat.datasets import make_dataset
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from habitat.version import VERSION as __version__  # noqa: F401
+
+if TYPE_CHECKING:
+    from habitat.config import get_config, read_write
+    from habitat.core.agent import Agent
+    from habitat.core.benchmark import Benchmark
+    from habitat.core.challenge import Challenge
+    from habitat.core.dataset import Dataset
+    from habitat.core.embodied_task import EmbodiedTask, Measure, Measurements
+    from habitat.core.env import Env, RLEnv
+    from habitat.core.logging import logger
+    from habitat.core.registry import registry
+    from habitat.core.simulator import (
+        Sensor,
+        SensorSuite,
+        SensorTypes,
+        Simulator,
+    )
+    from habitat.core.vector_env import ThreadedVectorEnv, VectorEnv
+    from habitat.datasets import make_dataset
+
+# The attributes of the package are imported on first access, so that
+# importing habitat, or one of its modules like habitat.config, does not
+# import the simulator, the tasks or torch.
+_LAZY_ATTRIBUTES = {
+    "get_config": "habitat.config",
+    "read_write": "habitat.config",
+    "Agent": "habitat.core.agent",
+    "Benchmark": "habitat.core.benchmark",
+    "Challenge": "habitat.core.challenge",
+    "Dataset": "habitat.core.dataset",
+    "EmbodiedTask": "habitat.core.embodied_task",
+    "Measure": "habitat.core.embodied_task",
+    "Measurements": "habitat.core.embodied_task",
+    "Env": "habitat.core.env",
+    "RLEnv": "habitat.core.env",
+    "logger": "habitat.core.logging",
+    "registry": "habitat.core.registry",
+    "Sensor": "habitat.core.simulator",
+    "SensorSuite": "habitat.core.simulator",
+    "SensorTypes": "habitat.core.simulator",
+    "Simulator": "habitat.core.simulator",
+    "ThreadedVectorEnv": "habitat.core.vector_env",
+    "VectorEnv": "habitat.core.vector_env",
+    "make_dataset": "habitat.datasets",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        # The subpackages used to be imported with the package.
+        module_name = f"{__name__}.{name}"
+        try:
+            value = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name != module_name:
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals().keys(), *__all__])
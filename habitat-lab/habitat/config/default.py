@@ -4,13 +4,22 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import hashlib
 import inspect
+import json
+import os
 import os.path as osp
+import pickle
+import tempfile
 import threading
 from functools import partial
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import hydra
+import omegaconf
 from hydra import compose, initialize_config_dir
+from hydra.core.plugins import Plugins
+from hydra.plugins.search_path_plugin import SearchPathPlugin
 from omegaconf import DictConfig, OmegaConf
 
 from habitat.config.default_structured_configs import (
@@ -25,6 +34,9 @@ _HABITAT_CFG_DIR = osp.dirname(inspect.getabsfile(inspect.currentframe()))
 # This is equivalent to doing osp.dirname(osp.abspath(__file__))
 # in editable install, this is pwd/habitat-lab/habitat/config
 CONFIG_FILE_SEPARATOR = ","
+# Directory where the composed configs are also cached, to share them between
+# processes and runs. Only the in-memory cache is used when it is not set.
+CONFIG_CACHE_DIR_ENV = "HABITAT_CONFIG_CACHE_DIR"
 
 
 def get_full_config_path(config_path: str, configs_dir: str) -> str:
@@ -74,6 +86,10 @@ def get_agent_config(
 
 
 lock = threading.Lock()
+# Maps the cache key of a composed config to the pickled config.
+_config_cache: Dict[str, bytes] = {}
+# Maps the config directories of the search path to their YAML files.
+_search_path_files: Dict[Tuple[str, ...], List[str]] = {}
 
 
 def patch_config(cfg: DictConfig) -> DictConfig:
@@ -110,6 +126,102 @@ def register_configs():
     register_hydra_plugin(HabitatConfigPlugin)
 
 
+def _get_search_path_files(roots: Tuple[str, ...]) -> List[str]:
+    """
+    The YAML files under the config directories of the search path, listed
+    once per process. A new file can only change a composed config if a file
+    already listed or an override refers to it, which changes the cache key
+    anyway.
+    """
+    if roots not in _search_path_files:
+        files = []
+        for root in roots:
+            for dirpath, _, filenames in os.walk(root):
+                files.extend(
+                    osp.join(dirpath, filename)
+                    for filename in filenames
+                    if filename.endswith(".yaml")
+                )
+        _search_path_files[roots] = files
+    return _search_path_files[roots]
+
+
+def _get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        # Removed since the search path was listed
+        return None
+
+
+def _get_config_cache_key(
+    config_path: str, overrides: List[str], configs_dir: str
+) -> str:
+    """
+    Hash of everything the composed config depends on: the config path and
+    overrides, and the modification times of the config file, of the YAML
+    files of its directory and of the search path, and of the modules
+    defining the search path plugins, which hold the structured configs.
+    """
+    # The directory of the config file is part of the search path of compose
+    roots = {osp.abspath(configs_dir), osp.abspath(osp.dirname(config_path))}
+    files = [config_path]
+    for plugin in Plugins.instance().discover(SearchPathPlugin):
+        plugin_file = inspect.getabsfile(plugin)
+        roots.add(osp.dirname(plugin_file))
+        files.append(plugin_file)
+    files.extend(_get_search_path_files(tuple(sorted(roots))))
+
+    key = json.dumps(
+        {
+            "config_path": config_path,
+            "overrides": overrides,
+            "files": [(file, _get_mtime(file)) for file in sorted(set(files))],
+            "versions": [hydra.__version__, omegaconf.__version__],
+        }
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _load_cached_config(key: str) -> Optional[DictConfig]:
+    data = _config_cache.get(key)
+    cache_dir = os.environ.get(CONFIG_CACHE_DIR_ENV)
+    if data is None and cache_dir:
+        try:
+            with open(osp.join(cache_dir, f"{key}.pkl"), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        _config_cache[key] = data
+    if data is None:
+        return None
+    return pickle.loads(data)
+
+
+def _save_cached_config(key: str, cfg: DictConfig) -> None:
+    data = pickle.dumps(cfg, protocol=pickle.HIGHEST_PROTOCOL)
+    _config_cache[key] = data
+    cache_dir = os.environ.get(CONFIG_CACHE_DIR_ENV)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so that concurrent processes never
+        # read a partially written config.
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, osp.join(cache_dir, f"{key}.pkl"))
+
+
+def clear_config_cache() -> None:
+    """
+    Removes the composed configs cached in memory by :ref:`get_config`, and
+    the list of the config files they depend on.
+    """
+    with lock:
+        _config_cache.clear()
+        _search_path_files.clear()
+
+
 def get_config(
     config_path: str,
     overrides: Optional[List[str]] = None,
@@ -117,6 +229,11 @@ def get_config(
 ) -> DictConfig:
     r"""Returns habitat config object composed of configs from yaml file (config_path) and overrides.
 
+    The composed configs are cached, in memory and in the directory set by the
+    ``HABITAT_CONFIG_CACHE_DIR`` environment variable if any. A cached config
+    is reused as long as the config path, the overrides and the config files
+    of the search path and of the directory of the config file did not change.
+
     :param config_path: path to the yaml config file.
     :param overrides: list of config overrides. For example, :py:`overrides=["habitat.seed=1"]`.
     :param configs_dir: path to the config files root directory (defaults to :ref:`_HABITAT_CFG_DIR`).
@@ -124,15 +241,24 @@ def get_config(
     """
     register_configs()
     config_path = get_full_config_path(config_path, configs_dir)
+    overrides = list(overrides) if overrides is not None else []
     # If get_config is called from different threads, Hydra might
     # get initialized twice leading to issues. This lock fixes it.
-    with lock, initialize_config_dir(
-        version_base=None,
-        config_dir=osp.dirname(config_path),
-    ):
-        cfg = compose(
-            config_name=osp.basename(config_path),
-            overrides=overrides if overrides is not None else [],
-        )
-
-    return patch_config(cfg)
+    with lock:
+        cache_key = _get_config_cache_key(config_path, overrides, configs_dir)
+        cfg = _load_cached_config(cache_key)
+        if cfg is not None:
+            return cfg
+
+        with initialize_config_dir(
+            version_base=None,
+            config_dir=osp.dirname(config_path),
+        ):
+            cfg = compose(
+                config_name=osp.basename(config_path),
+                overrides=overrides,
+            )
+        cfg = patch_config(cfg)
+        _save_cached_config(cache_key, cfg)
+
+    return cfg
@@ -107,9 +107,11 @@ class EnvironmentConfig(HabitatBaseConfig):
 
     :property max_episode_steps: The maximum number of environment steps before the episode ends.
     :property max_episode_seconds: The maximum number of wall-clock seconds before the episode ends.
+    :property num_prefetch_scenes: Number of upcoming scenes of the episode iterator whose files are loaded in the OS page cache in the background, so that scene switches do not wait on the disk. 0 disables the prefetching.
     """
     max_episode_steps: int = 1000
     max_episode_seconds: int = 10000000
+    num_prefetch_scenes: int = 0
     iterator_options: IteratorOptionsConfig = IteratorOptionsConfig()
 
 
@@ -626,6 +628,10 @@ class TopDownMapMeasurementConfig(MeasurementConfig):
     # axes aligned bounding boxes
     draw_goal_aabbs: bool = True
     fog_of_war: FogOfWarConfig = FogOfWarConfig()
+    # Number of maps of the recent scenes and floors kept to be copied on
+    # reset, the goals and paths are still drawn on every reset. 0 computes
+    # the map on every reset.
+    map_cache_size: int = 0
 
 
 @dataclass
@@ -1003,9 +1009,11 @@ class DistanceToGoalMeasurementConfig(MeasurementConfig):
     In Navigation tasks only, measures the geodesic distance to the goal.
 
     :property distance_to: If 'POINT' measures the distance to the closest episode goal. If 'VIEW_POINTS' measures the distance to the episode's goal's viewpoint.
+    :property view_point_distance_grids_path: With `distance_to` 'VIEW_POINTS', path of the precomputed grids of distances to the view points of the episode's object category, with a `{scene}` placeholder for the scene name. The distances are read from the grids instead of being computed with the pathfinder, which falls back for the positions off the grids. The grids are created with `habitat/datasets/object_nav/create_view_point_distance_grids.py`.
     """
     type: str = "DistanceToGoal"
     distance_to: str = "POINT"
+    view_point_distance_grids_path: str = ""
 
 
 @dataclass
@@ -1321,6 +1329,12 @@ class SimulatorConfig(HabitatBaseConfig):
     # should also be displayed
     debug_render_goal: bool = True
     robot_joint_start_noise: float = 0.0
+    # Maximum number of geodesic distances cached by the simulator, 0
+    # disables the cache. Distances are cached for the start positions
+    # quantized to a grid of geodesic_distance_cache_grid_size meters, so a
+    # coarser grid gives more hits but less accurate distances.
+    geodesic_distance_cache_size: int = 0
+    geodesic_distance_cache_grid_size: float = 0.01
     # Rearrange agent setup
     ctrl_freq: float = 120.0
     ac_freq_ratio: int = 4
@@ -1413,6 +1427,9 @@ class DatasetConfig(HabitatBaseConfig):
     :property scenes_dir: The path to the directory containing the scenes that will be used. You should put all your scenes in the same folder (example `data/scene_datasets`) to avoid having to change it.
     :property data_path: The path to the episode dataset. Episodes need to be compatible with the `type` argument (so they will load properly) and only use scenes that are present in the `scenes_dir`.
     :property split: `data_path` can have a `split` in the path. For example: "data/datasets/pointnav/habitat-test-scenes/v1/{split}/{split}.json.gz" the value in "{split}" will be replaced by the value of the `split` argument. This allows to easily swap between training, validation and test episodes by only changing the split argument.
+    :property num_load_workers: Number of processes loading the per-scene episode files (`{data_path}/content/{scene}.json.gz`) of the datasets split by scene, like `PointNav-v1`, `ObjectNav-v1` or `InstanceImageNav-v1`. With 0 or 1 the files are loaded one after the other in the current process. The files are loaded serially in daemonic processes, like the workers of a `VectorEnv`, which cannot start processes.
+    :property shared_dataset_path: Path of a dataset published with `habitat.datasets.shared_dataset.publish_shared_dataset`. When set, the episodes of the `content_scenes` are loaded from this file instead of parsing the dataset at `data_path`, which is how the environment workers share the dataset loaded once by `construct_envs`.
+    :property trajectory_store_path: Path of a store of precomputed shortest path trajectories built with `habitat/datasets/trajectory_store.py`. When set, the navigation datasets, like `PointNav-v1` or `ObjectNav-v1`, set the `shortest_paths` of their episodes found in the store when they load, as the datasets generated with the shortest paths have them.
 
     A dataset consists of episodes
     (a start configuration for a task within a scene) and a scene dataset
@@ -1426,6 +1443,9 @@ class DatasetConfig(HabitatBaseConfig):
         "data/datasets/pointnav/"
         "habitat-test-scenes/v1/{split}/{split}.json.gz"
     )
+    num_load_workers: int = 0
+    shared_dataset_path: Optional[str] = None
+    trajectory_store_path: Optional[str] = None
 
 
 @dataclass
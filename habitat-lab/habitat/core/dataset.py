@@ -11,17 +11,20 @@ of a ``habitat.Agent`` inside ``habitat.Env``.
 import copy
 import os
 import random
-from itertools import groupby
+from collections import deque
+from itertools import chain, groupby
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
     Generic,
     Iterator,
     List,
     Optional,
     Sequence,
+    Tuple,
     TypeVar,
     Union,
 )
@@ -107,9 +110,64 @@ class Episode(BaseEpisode):
 T = TypeVar("T", bound=Episode)
 
 
+_EPISODE_INDEX_KEYS = {
+    "_indexed_episodes",
+    "_num_indexed_episodes",
+    "_scene_episode_indices",
+    "_sorted_scene_ids",
+    "_episode_id_indices",
+}
+
+
 class Dataset(Generic[T]):
-    r"""Base class for dataset specification."""
+    r"""Base class for dataset specification.
+
+    The dataset keeps an index of :ref:`episodes` from scene id and from
+    episode id, built on the first lookup. Assigning a new list to
+    :ref:`episodes` invalidates it and appending to the list extends it on
+    the next lookup. Other in-place changes of the list (or of the scene of
+    an episode) must be followed by an assignment of the list.
+    """
     episodes: List[T]
+    _indexed_episodes: Optional[Sequence[T]] = None
+    _num_indexed_episodes: int = 0
+    _scene_episode_indices: Dict[str, List[int]]
+    _sorted_scene_ids: Optional[List[str]]
+    _episode_id_indices: Dict[str, int]
+
+    def __getstate__(self):
+        return {
+            k: v
+            for k, v in self.__dict__.items()
+            if k not in _EPISODE_INDEX_KEYS
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__["_indexed_episodes"] = None
+
+    def _update_episode_index(self) -> None:
+        r"""Brings the index up to date with :ref:`episodes`, indexing only
+        the new episodes if the list was appended to.
+        """
+        if (
+            self._indexed_episodes is not self.episodes
+            or self._num_indexed_episodes > len(self.episodes)
+        ):
+            self._indexed_episodes = self.episodes
+            self._num_indexed_episodes = 0
+            self._scene_episode_indices = {}
+            self._sorted_scene_ids = None
+            self._episode_id_indices = {}
+
+        for index in range(self._num_indexed_episodes, len(self.episodes)):
+            episode = self.episodes[index]
+            if episode.scene_id not in self._scene_episode_indices:
+                self._scene_episode_indices[episode.scene_id] = []
+                self._sorted_scene_ids = None
+            self._scene_episode_indices[episode.scene_id].append(index)
+            self._episode_id_indices.setdefault(episode.episode_id, index)
+        self._num_indexed_episodes = len(self.episodes)
 
     @staticmethod
     def scene_from_scene_path(scene_path: str) -> str:
@@ -159,7 +217,10 @@ class Dataset(Generic[T]):
     @property
     def scene_ids(self) -> List[str]:
         r"""unique scene ids present in the dataset."""
-        return sorted({episode.scene_id for episode in self.episodes})
+        self._update_episode_index()
+        if self._sorted_scene_ids is None:
+            self._sorted_scene_ids = sorted(self._scene_episode_indices)
+        return list(self._sorted_scene_ids)
 
     def get_scene_episodes(self, scene_id: str) -> List[T]:
         r"""..
@@ -167,9 +228,29 @@ class Dataset(Generic[T]):
         :param scene_id: id of scene in scene dataset.
         :return: list of episodes for the :p:`scene_id`.
         """
-        return list(
-            filter(lambda x: x.scene_id == scene_id, iter(self.episodes))
-        )
+        return self.get_episodes(self.get_scene_episode_indices(scene_id))
+
+    def get_scene_episode_indices(self, scene_id: str) -> List[int]:
+        r"""..
+
+        :param scene_id: id of scene in scene dataset.
+        :return: indices in :ref:`episodes` of the episodes for the
+            :p:`scene_id`, in order.
+        """
+        self._update_episode_index()
+        return list(self._scene_episode_indices.get(scene_id, []))
+
+    def get_episode_index(self, episode_id: str) -> int:
+        r"""..
+
+        :param episode_id: id of the episode.
+        :return: index in :ref:`episodes` of the first episode with the
+            :p:`episode_id`.
+        """
+        self._update_episode_index()
+        if episode_id not in self._episode_id_indices:
+            raise KeyError(f"No episode with id {episode_id}")
+        return self._episode_id_indices[episode_id]
 
     def get_episodes(self, indexes: List[int]) -> List[T]:
         r"""..
@@ -311,13 +392,15 @@ class Dataset(Generic[T]):
         new_episodes = []
         for nn in range(num_splits):
             new_dataset = copy.copy(self)  # Creates a shallow copy
-            new_dataset.episodes = []
-            new_datasets.append(new_dataset)
-            for _ii in range(split_lengths[nn]):
-                new_dataset.episodes.append(self.episodes[rand_items[ep_ind]])
-                ep_ind += 1
+            split_episodes = [
+                self.episodes[rand_ind]
+                for rand_ind in rand_items[ep_ind : ep_ind + split_lengths[nn]]
+            ]
+            ep_ind += split_lengths[nn]
             if sort_by_episode_id:
-                new_dataset.episodes.sort(key=lambda ep: ep.episode_id)
+                split_episodes.sort(key=lambda ep: ep.episode_id)
+            new_dataset.episodes = split_episodes
+            new_datasets.append(new_dataset)
             new_episodes.extend(new_dataset.episodes)
         if remove_unused_episodes:
             self.episodes = new_episodes
@@ -350,6 +433,9 @@ class EpisodeIterator(Iterator[T]):
         loaded consecutively.
     Sample episodes:
         sample the specified number of episodes.
+    Scene look-ahead:
+        :ref:`peek_scene_ids` gives the scenes of the upcoming episodes, so
+        that their assets can be loaded ahead of the scene switch.
     """
 
     def __init__(
@@ -395,10 +481,9 @@ class EpisodeIterator(Iterator[T]):
                 episodes, num_episode_sample, replace=False  # type: ignore[arg-type]
             )
 
-        if not isinstance(episodes, list):
-            episodes = list(episodes)
-
-        self.episodes = episodes
+        # The iterator shuffles its own list, so that the order of the
+        # episodes of the dataset, and its index, are left untouched
+        self.episodes = list(episodes)
         self.cycle = cycle
         self.group_by_scene = group_by_scene
         self.shuffle = shuffle
@@ -417,6 +502,15 @@ class EpisodeIterator(Iterator[T]):
         self._prev_scene_id: Optional[str] = None
 
         self._iterator = iter(self.episodes)
+        # Episodes taken out of _iterator by peek_scene_ids
+        self._lookahead: Deque[T] = deque()
+        # Result of the last peek_scene_ids, with the number of scenes, the
+        # number of scene switches and whether a forced switch was due. It
+        # stays valid until the scene changes or the order is rearranged.
+        self._scene_switch_count = 0
+        self._peeked_scene_ids: Optional[
+            Tuple[Tuple[int, int, bool], List[str]]
+        ] = None
 
         self.step_repetition_range = step_repetition_range
         self._set_shuffle_intervals()
@@ -431,12 +525,16 @@ class EpisodeIterator(Iterator[T]):
         """
         self._forced_scene_switch_if()
 
-        next_episode = next(self._iterator, None)
+        if len(self._lookahead) > 0:
+            next_episode = self._lookahead.popleft()
+        else:
+            next_episode = next(self._iterator, None)
         if next_episode is None:
             if not self.cycle:
                 raise StopIteration
 
             self._iterator = iter(self.episodes)
+            self._peeked_scene_ids = None
 
             if self.shuffle:
                 self._shuffle()
@@ -450,16 +548,91 @@ class EpisodeIterator(Iterator[T]):
             self._rep_count = 0
             self._step_count = 0
 
+        if self._prev_scene_id != next_episode.scene_id:
+            self._scene_switch_count += 1
         self._prev_scene_id = next_episode.scene_id
         return next_episode
 
+    def peek_scene_ids(self, num_scenes: int = 1) -> List[str]:
+        r"""Returns the ids of the next scenes the iterator will switch to,
+        in order, without advancing it.
+
+        The scene of the last returned episode is not included. A scene
+        switch forced by the repeat thresholds is accounted for if it is due
+        on the next episode. When cycling with shuffle, the look-ahead stops
+        at the end of the current cycle since the order of the next one is
+        not known yet.
+
+        :param num_scenes: maximum number of scene ids to return.
+        :return: list of at most :p:`num_scenes` distinct scene ids.
+        """
+        scene_ids: List[str] = []
+        if num_scenes <= 0:
+            return scene_ids
+
+        # A forced switch moves the first group of episodes to the end
+        in_moved_group = self._is_scene_switch_due(self._rep_count + 1)
+        # The upcoming scenes only change on a scene switch, so they are
+        # only looked up once per scene and not on every episode
+        cache_key = (num_scenes, self._scene_switch_count, in_moved_group)
+        if (
+            self._peeked_scene_ids is not None
+            and self._peeked_scene_ids[0] == cache_key
+        ):
+            return list(self._peeked_scene_ids[1])
+        self._peeked_scene_ids = (cache_key, scene_ids)
+
+        def _add_scene_id(scene_id: str) -> bool:
+            if scene_id != self._prev_scene_id and scene_id not in scene_ids:
+                scene_ids.append(scene_id)
+            return len(scene_ids) >= num_scenes
+
+        def _remaining() -> Iterator[T]:
+            yield from list(self._lookahead)
+            # Pull from the iterator only what is needed
+            for episode in self._iterator:
+                self._lookahead.append(episode)
+                yield episode
+
+        moved_scene_id: Optional[str] = None
+        for episode in _remaining():
+            if in_moved_group:
+                if moved_scene_id is None:
+                    moved_scene_id = episode.scene_id
+                if episode.scene_id == moved_scene_id:
+                    continue
+                in_moved_group = False
+
+            if _add_scene_id(episode.scene_id):
+                return list(scene_ids)
+
+        if moved_scene_id is not None and _add_scene_id(moved_scene_id):
+            return list(scene_ids)
+
+        if self.cycle and not self.shuffle:
+            for episode in self.episodes:
+                if _add_scene_id(episode.scene_id):
+                    break
+
+        return list(scene_ids)
+
+    def _remaining_episodes(self) -> Iterator[T]:
+        r"""Internal method that consumes the episodes left in the current
+        cycle, including the ones looked ahead.
+        """
+        lookahead = list(self._lookahead)
+        self._lookahead.clear()
+        return chain(lookahead, self._iterator)
+
     def _forced_scene_switch(self) -> None:
         r"""Internal method to switch the scene. Moves remaining episodes
         from current scene to the end and switch to next scene episodes.
         """
         grouped_episodes = [
             list(g)
-            for k, g in groupby(self._iterator, key=lambda x: x.scene_id)
+            for k, g in groupby(
+                self._remaining_episodes(), key=lambda x: x.scene_id
+            )
         ]
 
         if len(grouped_episodes) > 1:
@@ -467,13 +640,14 @@ class EpisodeIterator(Iterator[T]):
             grouped_episodes = grouped_episodes[1:] + grouped_episodes[0:1]
 
         self._iterator = iter(sum(grouped_episodes, []))
+        self._peeked_scene_ids = None
 
     def _shuffle(self) -> None:
         r"""Internal method that shuffles the remaining episodes.
         If self.group_by_scene is true, then shuffle groups of scenes.
         """
         assert self.shuffle
-        episodes = list(self._iterator)
+        episodes = list(self._remaining_episodes())
 
         random.shuffle(episodes)
 
@@ -481,6 +655,7 @@ class EpisodeIterator(Iterator[T]):
             episodes = self._group_scenes(episodes)
 
         self._iterator = iter(episodes)
+        self._peeked_scene_ids = None
 
     def _group_scenes(
         self, episodes: Union[Sequence[Episode], List[Episode], ndarray]
@@ -523,14 +698,13 @@ class EpisodeIterator(Iterator[T]):
         else:
             self._max_rep_step = None
 
-    def _forced_scene_switch_if(self) -> None:
+    def _is_scene_switch_due(self, rep_count: int) -> bool:
         do_switch = False
-        self._rep_count += 1
 
         # Shuffle if a scene has been selected more than _max_rep_episode times in a row
         if (
             self._max_rep_episode is not None
-            and self._rep_count >= self._max_rep_episode
+            and rep_count >= self._max_rep_episode
         ):
             do_switch = True
 
@@ -541,6 +715,11 @@ class EpisodeIterator(Iterator[T]):
         ):
             do_switch = True
 
-        if do_switch:
+        return do_switch
+
+    def _forced_scene_switch_if(self) -> None:
+        self._rep_count += 1
+
+        if self._is_scene_switch_due(self._rep_count):
             self._forced_scene_switch()
             self._set_shuffle_intervals()
@@ -8,7 +8,16 @@ r"""Implements task and measurements needed for training and benchmarking of
 """
 
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 from omegaconf import OmegaConf
@@ -20,6 +29,8 @@ from habitat.core.spaces import ActionSpace, EmptySpace, Space
 if TYPE_CHECKING:
     from omegaconf import DictConfig
 
+    from habitat.utils.step_timing import StepTimer
+
 
 class Action:
     r"""
@@ -97,6 +108,13 @@ class Measure:
 
     _metric: Any
     uuid: str
+    # A lazy measure is not updated at each step, only when the metrics are
+    # read with :ref:`Measurements.get_metrics` or when a measure that is
+    # updated depends on it. It is then updated with the arguments of the
+    # last step, so its metric must only depend on the current state of the
+    # environment, and the measures reading it must declare it with
+    # :ref:`Measurements.check_measure_dependencies`.
+    is_lazy: bool = False
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.uuid = self._get_uuid(*args, **kwargs)
@@ -146,6 +164,8 @@ class Measurements:
     """
 
     measures: Dict[str, Measure]
+    # Records the time of each measure when set.
+    step_timer: Optional["StepTimer"] = None
 
     def __init__(self, measures: Iterable[Measure]) -> None:
         """Constructor
@@ -159,19 +179,101 @@ class Measurements:
                 measure.uuid not in self.measures
             ), "'{}' is duplicated measure uuid".format(measure.uuid)
             self.measures[measure.uuid] = measure
+        # Dependencies of the measures, declared when they are reset.
+        self._dependencies: Dict[str, List[str]] = {}
+        # Measures updated at each step and lazy measures not needed by
+        # them, see `_plan_updates`.
+        self._step_measures: Optional[List[Measure]] = None
+        self._lazy_measures: List[Measure] = []
+        # Lazy measures not updated since the last step and the arguments
+        # of that step.
+        self._stale_measures: List[Measure] = []
+        self._last_update_args: Tuple[Any, Dict[str, Any]] = ((), {})
 
     def reset_measures(self, *args: Any, **kwargs: Any) -> None:
+        self._dependencies = {}
+        self._step_measures = None
+        self._stale_measures = []
         for measure in self.measures.values():
             measure.reset_metric(*args, **kwargs)
 
-    def update_measures(self, *args: Any, **kwargs: Any) -> None:
-        for measure in self.measures.values():
+    def _plan_updates(self) -> None:
+        r"""Splits the measures in the ones to update at each step, the
+        measures that are not lazy and the ones they depend on, and the lazy
+        measures only updated when the metrics are read.
+        """
+        required = {
+            uuid
+            for uuid, measure in self.measures.items()
+            if not measure.is_lazy
+        }
+        # The measures are listed after their dependencies.
+        for uuid in reversed(self.measures.keys()):
+            if uuid in required:
+                required.update(self._dependencies.get(uuid, []))
+        self._step_measures = []
+        self._lazy_measures = []
+        for uuid, measure in self.measures.items():
+            if uuid in required:
+                self._step_measures.append(measure)
+            else:
+                self._lazy_measures.append(measure)
+
+    def _update_measure(
+        self, measure: Measure, args: Any, kwargs: Dict[str, Any]
+    ) -> None:
+        if self.step_timer is None:
+            measure.update_metric(*args, **kwargs)
+            return
+        with self.step_timer.timed(f"measure/{measure.uuid}"):
             measure.update_metric(*args, **kwargs)
 
-    def get_metrics(self) -> Metrics:
+    def update_measures(self, *args: Any, **kwargs: Any) -> None:
+        if self._step_measures is None:
+            self._plan_updates()
+        for measure in self._step_measures:
+            self._update_measure(measure, args, kwargs)
+        self._stale_measures = self._lazy_measures
+        self._last_update_args = (args, kwargs)
+
+    def _update_stale_measures(self, uuid: Optional[str] = None) -> None:
+        r"""Updates the lazy measures not updated since the last step, only
+        :p:`uuid` and the measures it depends on if given.
+        """
+        if len(self._stale_measures) == 0:
+            return
+        needed = None
+        if uuid is not None:
+            needed = {uuid}
+            for measure in reversed(self._stale_measures):
+                if measure.uuid in needed:
+                    needed.update(self._dependencies.get(measure.uuid, []))
+
+        args, kwargs = self._last_update_args
+        stale_measures = []
+        for measure in self._stale_measures:
+            if needed is None or measure.uuid in needed:
+                self._update_measure(measure, args, kwargs)
+            else:
+                stale_measures.append(measure)
+        self._stale_measures = stale_measures
+
+    def get_metric(self, uuid: str) -> Any:
+        r"""Returns the metric of a single :ref:`Measure`, only updating the
+        lazy measures it needs.
+        """
+        self._update_stale_measures(uuid)
+        return self.measures[uuid].get_metric()
+
+    def get_metrics(self, update_lazy: bool = True) -> Metrics:
         r"""Collects measurement from all :ref:`Measure`\ s and returns it
         packaged inside :ref:`Metrics`.
+
+        :param update_lazy: update the lazy measures first. Otherwise their
+            metrics may be from an earlier step.
         """
+        if update_lazy:
+            self._update_stale_measures()
         return Metrics(self.measures)
 
     def _get_measure_index(self, measure_name):
@@ -186,6 +288,7 @@ class Measurements:
         the measure.
         :return:
         """
+        self._dependencies.setdefault(measure_name, []).extend(dependencies)
         measure_index = self._get_measure_index(measure_name)
         for dependency_measure in dependencies:
             assert (
@@ -225,6 +328,8 @@ class EmbodiedTask:
     _is_episode_active: bool
     measurements: Measurements
     sensor_suite: SensorSuite
+    # Records the time of each action when set, see `set_step_timer`.
+    step_timer: Optional["StepTimer"] = None
 
     def __init__(
         self,
@@ -260,6 +365,14 @@ class EmbodiedTask:
 
         self._is_episode_active = False
 
+    def set_step_timer(self, step_timer: Optional["StepTimer"]) -> None:
+        r"""Records the time of the actions, sensors and measures of the task
+        in :p:`step_timer`, or stops recording them if :py:`None`.
+        """
+        self.step_timer = step_timer
+        self.sensor_suite.step_timer = step_timer
+        self.measurements.step_timer = step_timer
+
     def _init_entities(self, entities_configs, register_func) -> OrderedDict:
         entities = OrderedDict()
         for entity_name, entity_cfg in entities_configs.items():
@@ -307,13 +420,20 @@ class EmbodiedTask:
             action_name in self.actions
         ), f"Can't find '{action_name}' action in {self.actions.keys()}."
         task_action = self.actions[action_name]
-        observations.update(
-            task_action.step(
+        if self.step_timer is None:
+            action_observations = task_action.step(
                 **action["action_args"],
                 task=self,
                 is_last_action=is_last_action,
             )
-        )
+        else:
+            with self.step_timer.timed(f"action/{action_name}"):
+                action_observations = task_action.step(
+                    **action["action_args"],
+                    task=self,
+                    is_last_action=is_last_action,
+                )
+        observations.update(action_observations)
 
     def step(self, action: Dict[str, Any], episode: Episode):
         action_name = action["action"]
@@ -31,6 +31,8 @@ from habitat.datasets import make_dataset
 from habitat.sims import make_sim
 from habitat.tasks.registration import make_task
 from habitat.utils import profiling_wrapper
+from habitat.utils.scene_prefetch import ScenePrefetcher
+from habitat.utils.step_timing import StepTimer, TimingHistogram
 
 if TYPE_CHECKING:
     from omegaconf import DictConfig
@@ -66,6 +68,8 @@ class Env:
     _episode_over: bool
     _episode_from_iter_on_reset: bool
     _episode_force_changed: bool
+    _scene_prefetcher: Optional[ScenePrefetcher]
+    _step_timer: StepTimer
 
     def __init__(
         self, config: "DictConfig", dataset: Optional[Dataset[Episode]] = None
@@ -93,6 +97,9 @@ class Env:
         self._episode_iterator = None
         self._episode_from_iter_on_reset = True
         self._episode_force_changed = False
+        self._scene_prefetcher: Optional[ScenePrefetcher] = None
+        if config.environment.num_prefetch_scenes > 0:
+            self._scene_prefetcher = ScenePrefetcher()
 
         # load the first scene if dataset is present
         if self._dataset:
@@ -121,6 +128,8 @@ class Env:
             sim=self._sim,
             dataset=self._dataset,
         )
+        self._step_timer = StepTimer()
+        self._task.set_step_timer(self._step_timer)
         self.observation_space = spaces.Dict(
             {
                 **self._sim.sensor_suite.observation_spaces.spaces,
@@ -251,6 +260,15 @@ class Env:
         ):
             self._current_episode = next(self._episode_iterator)
 
+        if self._scene_prefetcher is not None and isinstance(
+            self._episode_iterator, EpisodeIterator
+        ):
+            self._scene_prefetcher.prefetch(
+                self._episode_iterator.peek_scene_ids(
+                    self._config.environment.num_prefetch_scenes
+                )
+            )
+
         # This is always set to true after a reset that way
         # on the next reset an new episode is taken (if possible)
         self._episode_from_iter_on_reset = True
@@ -306,21 +324,36 @@ class Env:
         if isinstance(action, (str, int, np.integer)):
             action = {"action": action}
 
-        observations = self.task.step(
-            action=action, episode=self.current_episode
-        )
+        with self._step_timer.timed("env/step"):
+            observations = self.task.step(
+                action=action, episode=self.current_episode
+            )
 
-        self._task.measurements.update_measures(
-            episode=self.current_episode,
-            action=action,
-            task=self.task,
-            observations=observations,
-        )
+            self._task.measurements.update_measures(
+                episode=self.current_episode,
+                action=action,
+                task=self.task,
+                observations=observations,
+            )
 
-        self._update_step_stats()
+            self._update_step_stats()
 
         return observations
 
+    def get_step_timings(
+        self, reset: bool = False
+    ) -> Dict[str, TimingHistogram]:
+        r"""Returns the histograms of the wall time of the steps and of each
+        action, sensor and measure of the task, named ``env/step``,
+        ``action/{name}``, ``sensor/{uuid}`` and ``measure/{uuid}``.
+
+        :param reset: start new histograms after returning these ones.
+        """
+        histograms = self._step_timer.get_histograms()
+        if reset:
+            self._step_timer.reset()
+        return histograms
+
     @staticmethod
     @numba.njit
     def _seed_numba(seed: int):
@@ -345,6 +378,8 @@ class Env:
         return self._sim.render(mode)
 
     def close(self) -> None:
+        if self._scene_prefetcher is not None:
+            self._scene_prefetcher.close()
         self._sim.close()
 
     def __enter__(self):
@@ -401,6 +436,12 @@ class RLEnv(gym.Env):
     def episodes(self, episodes: List[Episode]) -> None:
         self._env.episodes = episodes
 
+    def get_step_timings(
+        self, reset: bool = False
+    ) -> Dict[str, TimingHistogram]:
+        r"""See :ref:`Env.get_step_timings`."""
+        return self._env.get_step_timings(reset)
+
     def current_episode(self, all_info: bool = False) -> BaseEpisode:
         r"""Returns the current episode of the environment.
 
@@ -68,7 +68,9 @@ class RLTaskEnv(habitat.RLEnv):
         return (-np.inf, np.inf)
 
     def get_reward(self, observations):
-        current_measure = self._env.get_metrics()[self._reward_measure_name]
+        current_measure = self._env.task.measurements.get_metric(
+            self._reward_measure_name
+        )
         reward = self.config.task.slack_reward
 
         reward += current_measure
@@ -79,7 +81,9 @@ class RLTaskEnv(habitat.RLEnv):
         return reward
 
     def _episode_success(self):
-        return self._env.get_metrics()[self._success_measure_name]
+        return self._env.task.measurements.get_metric(
+            self._success_measure_name
+        )
 
     def get_done(self, observations):
         done = False
@@ -214,8 +214,20 @@ class Registry(metaclass=Singleton):
 
     @classmethod
     def _get_impl(cls, _type: str, name: str) -> Type:
+        if name not in cls.mapping[_type]:
+            cls._import_default_modules()
         return cls.mapping[_type].get(name, None)
 
+    @classmethod
+    def _import_default_modules(cls) -> None:
+        r"""Imports the modules of the simulators, tasks, datasets and
+        environments of habitat, which register themselves when imported.
+        Importing habitat does not import them.
+        """
+        import habitat.core.env  # noqa: F401
+        import habitat.datasets  # noqa: F401
+        import habitat.gym  # noqa: F401
+
     @classmethod
     def get_task(cls, name: str) -> Type[EmbodiedTask]:
         return cls._get_impl("task", name)
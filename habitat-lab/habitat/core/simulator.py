@@ -31,6 +31,8 @@ if TYPE_CHECKING:
         pass
     from omegaconf import DictConfig
 
+    from habitat.utils.step_timing import StepTimer
+
 VisualObservation = Union[np.ndarray, "Tensor"]
 
 
@@ -202,6 +204,8 @@ class SensorSuite:
 
     sensors: Dict[str, Sensor]
     observation_spaces: spaces.Dict
+    # Records the time of each sensor when set.
+    step_timer: Optional["StepTimer"] = None
 
     def __init__(self, sensors: Iterable[Sensor]) -> None:
         """Constructor
@@ -226,7 +230,14 @@ class SensorSuite:
         r"""Collects data from all sensors and returns it packaged inside
         :ref:`Observations`.
         """
-        return Observations(self.sensors, *args, **kwargs)
+        if self.step_timer is None:
+            return Observations(self.sensors, *args, **kwargs)
+
+        observations = Observations({})
+        for uuid, sensor in self.sensors.items():
+            with self.step_timer.timed(f"sensor/{uuid}"):
+                observations[uuid] = sensor.get_observation(*args, **kwargs)
+        return observations
 
 
 @attr.s(auto_attribs=True)
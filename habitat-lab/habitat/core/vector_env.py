@@ -4,8 +4,10 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import functools
 import signal
 import warnings
+from collections import defaultdict, deque
 from multiprocessing.connection import Connection
 from multiprocessing.context import BaseContext
 from queue import Queue
@@ -14,6 +16,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Deque,
     Dict,
     Iterator,
     List,
@@ -63,6 +66,11 @@ RENDER_COMMAND = "render"
 CLOSE_COMMAND = "close"
 CALL_COMMAND = "call"
 COUNT_EPISODES_COMMAND = "count_episodes"
+SET_SHARED_OBS_BUFFERS_COMMAND = "set_shared_obs_buffers"
+
+# Info key set on the terminal step of an environment whose reset is
+# deferred by the asynchronous auto-reset
+RESETTING_INFO_KEY = "vector_env_resetting"
 
 EPISODE_OVER_NAME = "episode_over"
 GET_METRICS_NAME = "get_metrics"
@@ -90,6 +98,116 @@ def _make_env_fn(
     return habitat_env
 
 
+def _write_shared_observations(
+    observations: Dict[str, Any], shared_buffers: Dict[str, np.ndarray]
+) -> Dict[str, Any]:
+    r"""Writes the observations that have a shared-memory slab in place and
+    returns the remaining ones, which still need to go through the pipe.
+    """
+    remaining = {}
+    for k, v in observations.items():
+        if k in shared_buffers:
+            shared_buffers[k][...] = v
+        else:
+            remaining[k] = v
+    return remaining
+
+
+def _stack_observations(
+    observations: Sequence[Dict[str, Any]],
+    out: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    r"""Stacks a list of (possibly nested) observation dicts into a dict of
+    contiguous arrays, writing into :p:`out` if it is given.
+    """
+    stacked = {} if out is None else out
+    for k, v in observations[0].items():
+        if isinstance(v, dict):
+            stacked[k] = _stack_observations(
+                [o[k] for o in observations],
+                None if out is None else out[k],
+            )
+        else:
+            stacked[k] = np.stack(
+                [o[k] for o in observations],
+                out=None if out is None else out[k],
+            )
+    return stacked
+
+
+def _flatten_scalar_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    r"""Flattens the nested keys of an info dict with :py:`"."` and only keeps
+    the scalar values.
+    """
+    result = {}
+    for k, v in info.items():
+        if isinstance(v, dict):
+            result.update(
+                {
+                    f"{k}.{subk}": subv
+                    for subk, subv in _flatten_scalar_info(v).items()
+                }
+            )
+        elif np.size(v) == 1 and not isinstance(v, str):
+            result[k] = v
+    return result
+
+
+@attr.s(auto_attribs=True, slots=True)
+class VectorEnvStepResult:
+    r"""Outputs of :ref:`VectorEnv.step_batched`, stacked over the
+    environments.
+
+    :property observations: dict of arrays with the environments as first
+        dimension.
+    :property rewards: float32 vector of the rewards.
+    :property dones: bool vector of the done flags.
+    :property infos: list of the info dicts of the environments.
+    :property resetting: bool vector of the environments that returned their
+        terminal observation and are resetting with the asynchronous
+        auto-reset. They ignore the next action and answer it with the first
+        observation of their next episode.
+    """
+    observations: Dict[str, Any]
+    rewards: np.ndarray
+    dones: np.ndarray
+    infos: List[Dict[str, Any]]
+    resetting: np.ndarray
+
+    def scalar_infos(self) -> Dict[str, np.ndarray]:
+        r"""Returns the scalar infos that all the environments reported, as
+        vectors. Nested info keys are joined with :py:`"."`.
+        """
+        flat_infos = [_flatten_scalar_info(info) for info in self.infos]
+        common_keys = set(flat_infos[0].keys()).intersection(
+            *(info.keys() for info in flat_infos[1:])
+        )
+        return {
+            k: np.asarray([info[k] for info in flat_infos])
+            for k in flat_infos[0]
+            if k in common_keys
+        }
+
+
+@attr.s(auto_attribs=True, slots=True)
+class _WorkerEnvState:
+    r"""State of one of the environments hosted by a worker."""
+    env: gym.Env
+    shared_obs_buffers: Dict[str, np.ndarray] = attr.ib(factory=dict)
+    # Set on the terminal step with the asynchronous auto-reset, the reset
+    # runs once the result has been sent
+    needs_reset: bool = False
+    reset_observations: Optional[Any] = None
+    terminal_info: Optional[Dict[str, Any]] = None
+
+    def write_observations(self, observations: Any) -> Any:
+        if self.shared_obs_buffers:
+            return _write_shared_observations(
+                observations, self.shared_obs_buffers
+            )
+        return observations
+
+
 @attr.s(auto_attribs=True, slots=True)
 class _ReadWrapper:
     r"""Convenience wrapper to track if a connection to a worker process
@@ -130,6 +248,48 @@ class _WriteWrapper:
         self.read_wrapper.is_waiting = True
 
 
+class _WorkerConnection:
+    r"""Parent side of the connection to a worker, shared by all the
+    environments that the worker hosts.
+
+    Commands are tagged with the index of the environment inside the worker,
+    or :py:`None` to address all of them at once with one message. The
+    results are routed back to the environment they belong to.
+    """
+
+    def __init__(
+        self,
+        send_fn: Callable[[Any], None],
+        recv_fn: Callable[[], Any],
+        num_envs: int,
+    ) -> None:
+        self.send_fn = send_fn
+        self.recv_fn = recv_fn
+        self.num_envs = num_envs
+        self._results: List[Deque[Any]] = [deque() for _ in range(num_envs)]
+
+    def write_at(self, env_index: int, data: Tuple[str, Any]) -> None:
+        command, command_data = data
+        self.send_fn((command, env_index, command_data))
+
+    def write_all(self, command: str, data_list: Sequence[Any]) -> None:
+        self.send_fn((command, None, list(data_list)))
+
+    def read_at(self, env_index: int) -> Any:
+        while len(self._results[env_index]) == 0:
+            result_index, result = self.recv_fn()
+            if result_index is None:
+                for results, r in zip(self._results, result):
+                    results.append(r)
+            else:
+                self._results[result_index].append(result)
+
+        return self._results[env_index].popleft()
+
+    def close(self) -> None:
+        self.send_fn((CLOSE_COMMAND, None, None))
+
+
 class VectorEnv:
     r"""Vectorized environment which creates multiple processes where each
     process runs its own environment. Main class for parallelization of
@@ -145,9 +305,14 @@ class VectorEnv:
     _workers: List[Union[mp.Process, Thread]]
     _num_envs: int
     _auto_reset_done: bool
+    _async_auto_reset: bool
     _mp_ctx: BaseContext
     _connection_read_fns: List[_ReadWrapper]
     _connection_write_fns: List[_WriteWrapper]
+    _worker_connections: List[_WorkerConnection]
+    _env_locations: List[Tuple[int, int]]
+    _shared_obs_buffers: Optional[Dict[str, "torch.Tensor"]]
+    _shared_obs_views: List[Dict[str, np.ndarray]]
 
     def __init__(
         self,
@@ -156,6 +321,9 @@ class VectorEnv:
         auto_reset_done: bool = True,
         multiprocessing_start_method: str = "forkserver",
         workers_ignore_signals: bool = False,
+        use_shared_memory_obs: bool = False,
+        envs_per_worker: int = 1,
+        async_auto_reset: bool = False,
     ) -> None:
         """..
 
@@ -173,6 +341,27 @@ class VectorEnv:
             used, the subproccess  must be started before any other GPU usage.
         :param workers_ignore_signals: Whether or not workers will ignore SIGINT and SIGTERM
             and instead will only exit when :ref:`close` is called
+        :param use_shared_memory_obs: Preallocate shared-memory slabs sized
+            from the observation space and have the workers write the
+            :py:`spaces.Box` observations in place, so that only a small
+            header goes through the pipe. The observations returned by
+            :ref:`step` and :ref:`reset` are then views into these slabs and
+            are only valid until the next step or reset of that environment.
+            Requires torch.
+        :param envs_per_worker: number of environments hosted by each worker
+            process. A worker steps its environments in a loop and the
+            batched calls (:ref:`step_batched`, :ref:`reset`) exchange a
+            single message with it. This decouples the number of processes
+            from the number of environments.
+        :param async_auto_reset: with :py:`auto_reset_done`, a done
+            environment returns its terminal observation right away, flagged
+            as resetting (:ref:`VectorEnvStepResult.resetting`, or the
+            :py:`RESETTING_INFO_KEY` info key with :ref:`step`), and its
+            worker resets it after sending the result, while the other
+            environments and the policy are running. The next action sent to
+            that environment is ignored and answered with the first
+            observation of the new episode, a reward of 0 and the info of
+            the terminal step, so the caller must mask that step.
         """
         self._is_closed = True
 
@@ -185,17 +374,39 @@ class VectorEnv:
         assert multiprocessing_start_method in self._valid_start_methods, (
             "multiprocessing_start_method must be one of {}. Got '{}'"
         ).format(self._valid_start_methods, multiprocessing_start_method)
+        assert envs_per_worker > 0, "envs_per_worker must be positive"
+        assert (
+            auto_reset_done or not async_auto_reset
+        ), "async_auto_reset requires auto_reset_done"
         self._auto_reset_done = auto_reset_done
+        self._async_auto_reset = async_auto_reset
         self._mp_ctx = mp.get_context(multiprocessing_start_method)
         self._workers = []
-        (
-            self._connection_read_fns,
-            self._connection_write_fns,
-        ) = self._spawn_workers(
-            env_fn_args,
+        self._worker_connections = self._spawn_workers(
+            [
+                env_fn_args[i : i + envs_per_worker]
+                for i in range(0, self._num_envs, envs_per_worker)
+            ],
             make_env_fn,
             workers_ignore_signals=workers_ignore_signals,
         )
+        self._env_locations = []
+        self._connection_read_fns = []
+        self._connection_write_fns = []
+        for worker_index, connection in enumerate(self._worker_connections):
+            for env_index in range(connection.num_envs):
+                read_fn = _ReadWrapper(
+                    functools.partial(connection.read_at, env_index),
+                    len(self._env_locations),
+                )
+                self._connection_read_fns.append(read_fn)
+                self._connection_write_fns.append(
+                    _WriteWrapper(
+                        functools.partial(connection.write_at, env_index),
+                        read_fn,
+                    )
+                )
+                self._env_locations.append((worker_index, env_index))
 
         self._is_closed = False
 
@@ -223,24 +434,178 @@ class VectorEnv:
         ]
         self._paused: List[Tuple] = []
 
+        self._shared_obs_buffers = None
+        self._shared_obs_views = [{} for _ in range(self._num_envs)]
+        if use_shared_memory_obs:
+            self._init_shared_obs_buffers()
+
     @property
     def num_envs(self):
         r"""number of individual environments."""
         return self._num_envs - len(self._paused)
 
+    def _init_shared_obs_buffers(self) -> None:
+        r"""Allocates one shared-memory slab of shape
+        :py:`(num_envs, *space.shape)` per :py:`spaces.Box` observation and
+        hands each worker its slice of it.
+        """
+        if torch is None:
+            raise RuntimeError(
+                "use_shared_memory_obs requires torch to allocate the shared memory"
+            )
+
+        obs_space = self.observation_spaces[0]
+        buffers: Dict[str, torch.Tensor] = {}
+        for k, space in obs_space.spaces.items():
+            if not isinstance(space, spaces.Box):
+                continue
+            if any(
+                not isinstance(o.spaces.get(k, None), spaces.Box)
+                or o.spaces[k].shape != space.shape
+                or o.spaces[k].dtype != space.dtype
+                for o in self.observation_spaces
+            ):
+                raise ValueError(
+                    f"Observation '{k}' does not have the same space in all"
+                    " the environments, it cannot be put in shared memory"
+                )
+            try:
+                buffers[k] = torch.from_numpy(
+                    np.zeros((self._num_envs, *space.shape), dtype=space.dtype)
+                ).share_memory_()
+            except TypeError:
+                # The dtype is not supported by torch, send it through the pipe
+                continue
+
+        for rank, write_fn in enumerate(self._connection_write_fns):
+            write_fn(
+                (
+                    SET_SHARED_OBS_BUFFERS_COMMAND,
+                    {k: v[rank] for k, v in buffers.items()},
+                )
+            )
+        for read_fn in self._connection_read_fns:
+            read_fn()
+
+        self._shared_obs_buffers = buffers
+        self._shared_obs_views = [
+            {k: v[rank].numpy() for k, v in buffers.items()}
+            for rank in range(self._num_envs)
+        ]
+
+    @property
+    def shared_observations(self) -> Optional[Dict[str, "torch.Tensor"]]:
+        r"""The shared-memory observation slabs of the active environments,
+        stacked along the first dimension, or :py:`None` if not all the
+        observations are in shared memory. Without paused environments these
+        are the slabs themselves, so reading them does not copy anything.
+        """
+        if self._shared_obs_buffers is None or len(
+            self._shared_obs_buffers
+        ) != len(self.observation_spaces[0].spaces):
+            return None
+
+        if len(self._paused) == 0:
+            return self._shared_obs_buffers
+
+        ranks = torch.tensor(
+            [read_fn.rank for read_fn in self._connection_read_fns],
+            dtype=torch.long,
+        )
+        return {k: v[ranks] for k, v in self._shared_obs_buffers.items()}
+
+    def _read_shared_observations(
+        self, rank: int, observations: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        r"""Adds the views into the shared-memory slabs of the worker with the
+        given rank to the observations received through the pipe.
+        """
+        if len(self._shared_obs_views[rank]) == 0:
+            return observations
+        return {**self._shared_obs_views[rank], **observations}
+
+    @staticmethod
+    def _run_worker_command(
+        state: _WorkerEnvState,
+        command: str,
+        data: Any,
+        auto_reset_done: bool,
+        async_auto_reset: bool,
+    ) -> Any:
+        r"""Runs one command on one of the environments of a worker and
+        returns its result.
+        """
+        env = state.env
+        if command == STEP_COMMAND:
+            if state.reset_observations is not None:
+                # The action was sent for the terminal observation
+                observations = state.reset_observations
+                state.reset_observations = None
+                return (
+                    state.write_observations(observations),
+                    0.0,
+                    False,
+                    state.terminal_info,
+                )
+
+            observations, reward, done, info = env.step(data)
+            if auto_reset_done and done:
+                if async_auto_reset:
+                    state.needs_reset = True
+                    state.terminal_info = info
+                    info = {**info, RESETTING_INFO_KEY: True}
+                else:
+                    observations = env.reset()
+            return state.write_observations(observations), reward, done, info
+
+        elif command == RESET_COMMAND:
+            state.needs_reset = False
+            state.reset_observations = None
+            return state.write_observations(env.reset())
+
+        elif command == RENDER_COMMAND:
+            return env.render(*data[0], **data[1])
+
+        elif command == CALL_COMMAND:
+            function_name, function_args = data
+            if function_args is None:
+                function_args = {}
+
+            result_or_fn = getattr(env, function_name)
+
+            if len(function_args) > 0 or callable(result_or_fn):
+                return result_or_fn(**function_args)
+            else:
+                return result_or_fn
+
+        elif command == COUNT_EPISODES_COMMAND:
+            return len(env.episodes)
+
+        elif command == SET_SHARED_OBS_BUFFERS_COMMAND:
+            # The numpy views keep the tensors, which own the shared
+            # memory, alive
+            state.shared_obs_buffers = {k: v.numpy() for k, v in data.items()}
+            return None
+
+        else:
+            raise NotImplementedError(f"Unknown command {command}")
+
     @staticmethod
     @profiling_wrapper.RangeContext("_worker_env")
     def _worker_env(
         connection_read_fn: Callable,
         connection_write_fn: Callable,
         env_fn: Callable,
-        env_fn_args: Tuple[Any],
+        env_fn_args: Sequence[Tuple[Any]],
         auto_reset_done: bool,
         mask_signals: bool = False,
         child_pipe: Optional[Connection] = None,
         parent_pipe: Optional[Connection] = None,
+        async_auto_reset: bool = False,
     ) -> None:
-        r"""process worker for creating and interacting with the environment."""
+        r"""process worker for creating and interacting with the environments
+        hosted by the worker.
+        """
         if mask_signals:
             signal.signal(signal.SIGINT, signal.SIG_IGN)
             signal.signal(signal.SIGTERM, signal.SIG_IGN)
@@ -248,68 +613,71 @@ class VectorEnv:
             signal.signal(signal.SIGUSR1, signal.SIG_IGN)
             signal.signal(signal.SIGUSR2, signal.SIG_IGN)
 
-        env = EnvCountEpisodeWrapper(EnvObsDictWrapper(env_fn(*env_fn_args)))
+        states = [
+            _WorkerEnvState(
+                EnvCountEpisodeWrapper(EnvObsDictWrapper(env_fn(*args)))
+            )
+            for args in env_fn_args
+        ]
         if parent_pipe is not None:
             parent_pipe.close()
         try:
-            command, data = connection_read_fn()
+            command, env_index, data = connection_read_fn()
             while command != CLOSE_COMMAND:
-                if command == STEP_COMMAND:
-                    observations, reward, done, info = env.step(data)
-                    if auto_reset_done and done:
-                        observations = env.reset()
-                    with profiling_wrapper.RangeContext(
-                        "worker write after step"
-                    ):
-                        connection_write_fn((observations, reward, done, info))
-
-                elif command == RESET_COMMAND:
-                    observations = env.reset()
-                    connection_write_fn(observations)
-
-                elif command == RENDER_COMMAND:
-                    connection_write_fn(env.render(*data[0], **data[1]))
-
-                elif command == CALL_COMMAND:
-                    function_name, function_args = data
-                    if function_args is None:
-                        function_args = {}
-
-                    result_or_fn = getattr(env, function_name)
-
-                    if len(function_args) > 0 or callable(result_or_fn):
-                        result = result_or_fn(**function_args)
-                    else:
-                        result = result_or_fn
-
-                    connection_write_fn(result)
-
-                elif command == COUNT_EPISODES_COMMAND:
-                    connection_write_fn(len(env.episodes))
-
+                if env_index is None:
+                    # One message for all the environments of the worker
+                    result = [
+                        VectorEnv._run_worker_command(
+                            state,
+                            command,
+                            env_data,
+                            auto_reset_done,
+                            async_auto_reset,
+                        )
+                        for state, env_data in zip(states, data)
+                    ]
                 else:
-                    raise NotImplementedError(f"Unknown command {command}")
+                    result = VectorEnv._run_worker_command(
+                        states[env_index],
+                        command,
+                        data,
+                        auto_reset_done,
+                        async_auto_reset,
+                    )
+
+                with profiling_wrapper.RangeContext("worker write result"):
+                    connection_write_fn((env_index, result))
+
+                # Deferred resets overlap with the work of the caller
+                for state in states:
+                    if state.needs_reset:
+                        with profiling_wrapper.RangeContext(
+                            "worker async reset"
+                        ):
+                            state.reset_observations = state.env.reset()
+                        state.needs_reset = False
 
                 with profiling_wrapper.RangeContext("worker wait for command"):
-                    command, data = connection_read_fn()
+                    command, env_index, data = connection_read_fn()
 
         except KeyboardInterrupt:
             logger.info("Worker KeyboardInterrupt")
         finally:
             if child_pipe is not None:
                 child_pipe.close()
-            env.close()
+            for state in states:
+                state.env.close()
 
     def _spawn_workers(
         self,
-        env_fn_args: Sequence[Tuple],
+        env_fn_args: Sequence[Sequence[Tuple]],
         make_env_fn: Callable[..., Union[Env, RLEnv]] = _make_env_fn,
         workers_ignore_signals: bool = False,
-    ) -> Tuple[List[_ReadWrapper], List[_WriteWrapper]]:
+    ) -> List[_WorkerConnection]:
         parent_connections, worker_connections = zip(
             *[
                 [ConnectionWrapper(c) for c in self._mp_ctx.Pipe(duplex=True)]
-                for _ in range(self._num_envs)
+                for _ in range(len(env_fn_args))
             ]
         )
         self._workers = []
@@ -327,6 +695,7 @@ class VectorEnv:
                     workers_ignore_signals,
                     worker_conn,
                     parent_conn,
+                    self._async_auto_reset,
                 ),
             )
             self._workers.append(cast(mp.Process, ps))
@@ -334,16 +703,46 @@ class VectorEnv:
             ps.start()
             worker_conn.close()
 
-        read_fns = [
-            _ReadWrapper(p.recv, rank)
-            for rank, p in enumerate(parent_connections)
-        ]
-        write_fns = [
-            _WriteWrapper(p.send, read_fn)
-            for p, read_fn in zip(parent_connections, read_fns)
+        return [
+            _WorkerConnection(p.send, p.recv, len(env_args))
+            for p, env_args in zip(parent_connections, env_fn_args)
         ]
 
-        return read_fns, write_fns
+    def _write_grouped(
+        self,
+        command: str,
+        index_envs: Sequence[int],
+        data_list: Sequence[Any],
+    ) -> None:
+        r"""Sends a command to the given environments, with a single message
+        for each worker whose environments are all addressed.
+        """
+        by_worker: Dict[int, Dict[int, Tuple[int, Any]]] = defaultdict(dict)
+        for index_env, data in zip(index_envs, data_list):
+            worker_index, env_index = self._env_locations[
+                self._connection_read_fns[index_env].rank
+            ]
+            by_worker[worker_index][env_index] = (index_env, data)
+
+        for worker_index, env_data in by_worker.items():
+            connection = self._worker_connections[worker_index]
+            if len(env_data) < connection.num_envs:
+                for index_env, data in env_data.values():
+                    self._connection_write_fns[index_env]((command, data))
+                continue
+
+            for index_env, _ in env_data.values():
+                read_fn = self._connection_read_fns[index_env]
+                if read_fn.is_waiting:
+                    raise RuntimeError(
+                        f"Tried to write to process {read_fn.rank}"
+                        " but the last write has not been read"
+                    )
+                read_fn.is_waiting = True
+            connection.write_all(
+                command,
+                [env_data[i][1] for i in range(connection.num_envs)],
+            )
 
     def current_episodes(self):
         for write_fn in self._connection_write_fns:
@@ -382,11 +781,14 @@ class VectorEnv:
 
         :return: list of outputs from the reset method of envs.
         """
-        for write_fn in self._connection_write_fns:
-            write_fn((RESET_COMMAND, None))
+        self._write_grouped(
+            RESET_COMMAND, range(self.num_envs), [None] * self.num_envs
+        )
         results = []
         for read_fn in self._connection_read_fns:
-            results.append(read_fn())
+            results.append(
+                self._read_shared_observations(read_fn.rank, read_fn())
+            )
         return results
 
     def reset_at(self, index_env: int):
@@ -396,7 +798,8 @@ class VectorEnv:
         :return: list containing the output of reset method of indexed env.
         """
         self._connection_write_fns[index_env]((RESET_COMMAND, None))
-        results = [self._connection_read_fns[index_env]()]
+        read_fn = self._connection_read_fns[index_env]
+        results = [self._read_shared_observations(read_fn.rank, read_fn())]
         return results
 
     def async_step_at(
@@ -407,7 +810,17 @@ class VectorEnv:
 
     @profiling_wrapper.RangeContext("wait_step_at")
     def wait_step_at(self, index_env: int) -> Any:
-        return self._connection_read_fns[index_env]()
+        read_fn = self._connection_read_fns[index_env]
+        if len(self._shared_obs_views[read_fn.rank]) == 0:
+            return read_fn()
+
+        observations, reward, done, info = read_fn()
+        return (
+            self._read_shared_observations(read_fn.rank, observations),
+            reward,
+            done,
+            info,
+        )
 
     def step_at(self, index_env: int, action: Union[int, np.ndarray]):
         r"""Step in the index_env environment in the vector.
@@ -448,6 +861,105 @@ class VectorEnv:
         self.async_step(data)
         return self.wait_step()
 
+    def async_step_batched(
+        self,
+        actions: np.ndarray,
+        index_envs: Optional[Sequence[int]] = None,
+    ) -> None:
+        r"""Asynchronously step in the environments with a single action
+        array.
+
+        :param actions: array with one action per stepped environment along
+            its first dimension. Discrete actions are converted to python
+            ints in one go.
+        :param index_envs: indices of the environments to step, all of them
+            if :py:`None`.
+        """
+        if index_envs is None:
+            index_envs = range(self.num_envs)
+        assert len(actions) == len(
+            index_envs
+        ), f"Got {len(actions)} actions for {len(index_envs)} environments"
+
+        env_actions: Sequence[Union[int, np.ndarray]]
+        if isinstance(self.action_spaces[0], spaces.Discrete):
+            env_actions = np.asarray(actions).reshape(len(index_envs)).tolist()
+        else:
+            env_actions = actions
+
+        self._write_grouped(STEP_COMMAND, index_envs, env_actions)
+
+    @profiling_wrapper.RangeContext("wait_step_batched")
+    def wait_step_batched(
+        self,
+        index_envs: Optional[Sequence[int]] = None,
+        observations_out: Optional[Dict[str, Any]] = None,
+    ) -> VectorEnvStepResult:
+        r"""Wait for the environments stepped with :ref:`async_step_batched`
+        and stack their outputs.
+
+        :param index_envs: indices of the environments to wait for, all of
+            them if :py:`None`.
+        :param observations_out: optional dict of arrays to stack the
+            observations into. Without it and with shared-memory observations,
+            the returned observations are views into the shared memory.
+        """
+        if index_envs is None:
+            index_envs = range(self.num_envs)
+
+        outputs = [self.wait_step_at(index_env) for index_env in index_envs]
+        observations, rewards, dones, infos = zip(*outputs)
+        resetting = np.asarray(
+            [RESETTING_INFO_KEY in info for info in infos], dtype=bool
+        )
+        if resetting.any():
+            infos = tuple(
+                {k: v for k, v in info.items() if k != RESETTING_INFO_KEY}
+                if is_resetting
+                else info
+                for info, is_resetting in zip(infos, resetting)
+            )
+
+        shared_observations = self.shared_observations
+        if shared_observations is not None:
+            if isinstance(index_envs, range) and index_envs.step == 1:
+                env_index: Any = slice(index_envs.start, index_envs.stop)
+            else:
+                env_index = list(index_envs)
+            stacked = {
+                k: v[env_index].numpy() for k, v in shared_observations.items()
+            }
+            if observations_out is not None:
+                for k, v in stacked.items():
+                    observations_out[k][...] = v
+                stacked = observations_out
+        else:
+            stacked = _stack_observations(observations, observations_out)
+
+        return VectorEnvStepResult(
+            observations=stacked,
+            rewards=np.asarray(rewards, dtype=np.float32),
+            dones=np.asarray(dones, dtype=bool),
+            infos=list(infos),
+            resetting=resetting,
+        )
+
+    def step_batched(
+        self,
+        actions: np.ndarray,
+        index_envs: Optional[Sequence[int]] = None,
+    ) -> VectorEnvStepResult:
+        r"""Perform one action array in the vectorized environments.
+
+        :param actions: array with one action per stepped environment along
+            its first dimension.
+        :param index_envs: indices of the environments to step, all of them
+            if :py:`None`.
+        :return: the stacked outputs of the step method of the envs.
+        """
+        self.async_step_batched(actions, index_envs)
+        return self.wait_step_batched(index_envs)
+
     def close(self) -> None:
         if self._is_closed:
             return
@@ -456,18 +968,12 @@ class VectorEnv:
             if read_fn.is_waiting:
                 read_fn()
 
-        for write_fn in self._connection_write_fns:
-            write_fn((CLOSE_COMMAND, None))
-
-        for _, _, write_fn, _ in self._paused:
-            write_fn((CLOSE_COMMAND, None))
+        for connection in self._worker_connections:
+            connection.close()
 
         for process in self._workers:
             process.join()
 
-        for _, _, _, process in self._paused:
-            process.join()
-
         self._is_closed = True
 
     def pause_at(self, index: int) -> None:
@@ -484,15 +990,13 @@ class VectorEnv:
             self._connection_read_fns[index]()
         read_fn = self._connection_read_fns.pop(index)
         write_fn = self._connection_write_fns.pop(index)
-        worker = self._workers.pop(index)
-        self._paused.append((index, read_fn, write_fn, worker))
+        self._paused.append((index, read_fn, write_fn))
 
     def resume_all(self) -> None:
         r"""Resumes any paused envs."""
-        for index, read_fn, write_fn, worker in reversed(self._paused):
+        for index, read_fn, write_fn in reversed(self._paused):
             self._connection_read_fns.insert(index, read_fn)
             self._connection_write_fns.insert(index, write_fn)
-            self._workers.insert(index, worker)
         self._paused = []
 
     def call_at(
@@ -607,12 +1111,12 @@ class ThreadedVectorEnv(VectorEnv):
 
     def _spawn_workers(
         self,
-        env_fn_args: Sequence[Tuple],
+        env_fn_args: Sequence[Sequence[Tuple]],
         make_env_fn: Callable[..., Env] = _make_env_fn,
         workers_ignore_signals: bool = False,
-    ) -> Tuple[List[_ReadWrapper], List[_WriteWrapper]]:
+    ) -> List[_WorkerConnection]:
         queues: Iterator[Tuple[Any, ...]] = zip(
-            *[(Queue(), Queue()) for _ in range(self._num_envs)]
+            *[(Queue(), Queue()) for _ in range(len(env_fn_args))]
         )
         parent_read_queues, parent_write_queues = queues
         self._workers = []
@@ -627,18 +1131,19 @@ class ThreadedVectorEnv(VectorEnv):
                     make_env_fn,
                     env_args,
                     self._auto_reset_done,
+                    False,
+                    None,
+                    None,
+                    self._async_auto_reset,
                 ),
             )
             self._workers.append(thread)
             thread.daemon = True
             thread.start()
 
-        read_fns = [
-            _ReadWrapper(q.get, rank)
-            for rank, q in enumerate(parent_read_queues)
-        ]
-        write_fns = [
-            _WriteWrapper(q.put, read_wrapper)
-            for q, read_wrapper in zip(parent_write_queues, read_fns)
+        return [
+            _WorkerConnection(write_q.put, read_q.get, len(env_args))
+            for read_q, write_q, env_args in zip(
+                parent_read_queues, parent_write_queues, env_fn_args
+            )
         ]
-        return read_fns, write_fns
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Precomputes the grids of distances to the goal view points of the scenes
+of an ObjectNav dataset, read by the DistanceToGoal measure when
+habitat.task.measurements.distance_to_goal.view_point_distance_grids_path
+is set. One ``{scene}.npz`` file is written per scene, for example:
+
+    python -m habitat.datasets.object_nav.create_view_point_distance_grids \\
+        --config benchmark/nav/objectnav/objectnav_hm3d.yaml \\
+        --output-dir data/datasets/objectnav/hm3d/v1/val/distance_grids
+"""
+
+import argparse
+import os
+from typing import Dict, List
+
+import habitat
+from habitat.core.dataset import ALL_SCENES_MASK
+from habitat.datasets import make_dataset
+from habitat.sims import make_sim
+from habitat.tasks.nav.view_point_distance_grid import (
+    compute_view_point_distance_grid,
+    get_floor_heights,
+)
+
+
+def create_view_point_distance_grids(
+    config_path: str,
+    output_dir: str,
+    content_scenes: List[str],
+    cell_size: float,
+    distance_resolution: float,
+) -> None:
+    config = habitat.get_config(config_path)
+    with habitat.config.read_write(config):
+        config.habitat.dataset.content_scenes = content_scenes
+        # Only the navmesh is needed
+        for agent_config in config.habitat.simulator.agents.values():
+            agent_config.sim_sensors.clear()
+    dataset = make_dataset(
+        config.habitat.dataset.type, config=config.habitat.dataset
+    )
+    os.makedirs(output_dir, exist_ok=True)
+
+    for scene_id in dataset.scene_ids:
+        episodes = dataset.get_scene_episodes(scene_id)
+        view_points_by_category: Dict[str, List[List[float]]] = {}
+        for episode in episodes:
+            if episode.object_category in view_points_by_category:
+                continue
+            view_points_by_category[episode.object_category] = [
+                view_point.agent_state.position
+                for goal in episode.goals
+                for view_point in goal.view_points
+            ]
+        floor_heights = get_floor_heights(
+            [episode.start_position[1] for episode in episodes]
+        )
+
+        with habitat.config.read_write(config):
+            config.habitat.simulator.scene = scene_id
+        with make_sim(
+            config.habitat.simulator.type, config=config.habitat.simulator
+        ) as sim:
+            grid = compute_view_point_distance_grid(
+                sim,
+                view_points_by_category,
+                floor_heights,
+                cell_size=cell_size,
+                distance_resolution=distance_resolution,
+            )
+
+        scene = dataset.scene_from_scene_path(scene_id)
+        grid.save(os.path.join(output_dir, f"{scene}.npz"))
+        print(
+            f"{scene}: {len(grid.categories)} categories,"
+            f" {len(floor_heights)} floors"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute the distances to the goal view points of an"
+        " ObjectNav dataset"
+    )
+    parser.add_argument(
+        "--config", required=True, help="ObjectNav habitat config"
+    )
+    parser.add_argument(
+        "--output-dir", required=True, help="directory of the grids"
+    )
+    parser.add_argument(
+        "--content-scenes",
+        nargs="+",
+        default=[ALL_SCENES_MASK],
+        help="scenes to process, all of them by default",
+    )
+    parser.add_argument(
+        "--cell-size", type=float, default=0.1, help="in meters"
+    )
+    parser.add_argument(
+        "--distance-resolution",
+        type=float,
+        default=0.01,
+        help="meters per unit of the stored uint16 distances",
+    )
+    args = parser.parse_args()
+    create_view_point_distance_grids(
+        args.config,
+        args.output_dir,
+        args.content_scenes,
+        args.cell_size,
+        args.distance_resolution,
+    )
+
+
+if __name__ == "__main__":
+    main()
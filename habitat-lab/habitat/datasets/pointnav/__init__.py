@@ -17,6 +17,9 @@ from habitat.core.registry import registry
 # Post that PR we would no longer need try register blocks.
 def _try_register_pointnavdatasetv1():
     try:
+        from habitat.datasets.pointnav.columnar_pointnav_dataset import (  # noqa: F401
+            ColumnarPointNavDatasetV1,
+        )
         from habitat.datasets.pointnav.pointnav_dataset import (  # noqa: F401
             PointNavDatasetV1,
         )
@@ -28,3 +31,8 @@ def _try_register_pointnavdatasetv1():
         class PointnavDatasetImportError(Dataset):
             def __init__(self, *args, **kwargs):
                 raise pointnav_import_error
+
+        @registry.register_dataset(name="PointNav-v1-columnar")
+        class ColumnarPointnavDatasetImportError(Dataset):
+            def __init__(self, *args, **kwargs):
+                raise pointnav_import_error
@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+r"""Columnar on-disk format for PointNav episodes.
+
+A dataset is stored as a directory with one ``.npy`` array per episode field
+and a ``metadata.json`` file holding the string tables. The arrays are memory
+mapped, so loading a dataset does not parse anything and the episode data is
+shared through the page cache by all the processes reading it.
+:ref:`NavigationEpisode` objects are only built when they are accessed, for
+instance when :ref:`EpisodeIterator` yields them.
+
+Convert an existing ``.json.gz`` dataset, including its per-scene content
+files, with:
+
+.. code:: sh
+
+    python -m habitat.datasets.pointnav.columnar_pointnav_dataset \
+        --input data/datasets/pointnav/gibson/v1/train/train.json.gz \
+        --output data/datasets/pointnav/gibson/v1/train/train.columnar
+"""
+
+import argparse
+import json
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+import attr
+import numpy as np
+
+from habitat.core.dataset import ALL_SCENES_MASK, EpisodeIterator
+from habitat.core.registry import registry
+from habitat.core.utils import DatasetJSONEncoder
+from habitat.datasets.pointnav.pointnav_dataset import (
+    DEFAULT_SCENE_PATH_PREFIX,
+    PointNavDatasetV1,
+)
+from habitat.tasks.nav.nav import (
+    NavigationEpisode,
+    NavigationGoal,
+    ShortestPathPoint,
+)
+
+if TYPE_CHECKING:
+    from omegaconf import DictConfig
+
+
+COLUMNAR_FORMAT_NAME = "habitat-columnar-episodes"
+COLUMNAR_FORMAT_VERSION = 1
+METADATA_FILENAME = "metadata.json"
+
+# Fixed size columns, one row per episode unless noted otherwise
+_ARRAY_COLUMNS = (
+    "episode_id",
+    "scene_index",
+    "scene_dataset_config_index",
+    "start_room_index",
+    "start_position",
+    "start_rotation",
+    # Goals of episode i are the rows goal_offsets[i]:goal_offsets[i + 1]
+    # of the goal columns
+    "goal_offsets",
+    "goal_position",
+    "goal_radius",
+)
+# Rarely used fields, stored as JSON strings packed in a byte blob
+_JSON_COLUMNS = ("info", "shortest_paths", "additional_obj_config_paths")
+
+
+def _pack_json_column(values: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Packs values as JSON strings in a byte blob with offsets. :py:`None`
+    is stored as an empty string.
+    """
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    chunks = []
+    for i, value in enumerate(values):
+        chunk = (
+            b""
+            if value is None
+            else json.dumps(value, cls=DatasetJSONEncoder).encode("utf-8")
+        )
+        chunks.append(chunk)
+        offsets[i + 1] = offsets[i] + len(chunk)
+    return offsets, np.frombuffer(b"".join(chunks), dtype=np.uint8)
+
+
+def _table_index(table: Dict[str, int], value: Optional[str]) -> int:
+    if value is None:
+        return -1
+    return table.setdefault(value, len(table))
+
+
+def save_columnar_episodes(
+    episodes: Sequence[NavigationEpisode], output_dir: str
+) -> None:
+    r"""Writes episodes in the columnar format.
+
+    :param episodes: episodes to write. Only :ref:`NavigationEpisode` with
+        :ref:`NavigationGoal` goals are supported, episode types with more
+        fields would lose them.
+    :param output_dir: directory of the columnar dataset, created if needed.
+    """
+    scene_table: Dict[str, int] = {}
+    scene_dataset_config_table: Dict[str, int] = {}
+    start_room_table: Dict[str, int] = {}
+    goal_offsets = np.zeros(len(episodes) + 1, dtype=np.int64)
+    goals: List[NavigationGoal] = []
+    for i, episode in enumerate(episodes):
+        if type(episode) is not NavigationEpisode:
+            raise ValueError(
+                f"Unsupported episode type {type(episode).__name__}, only"
+                " NavigationEpisode can be stored in the columnar format"
+            )
+        for goal in episode.goals:
+            if type(goal) is not NavigationGoal:
+                raise ValueError(
+                    f"Unsupported goal type {type(goal).__name__}, only"
+                    " NavigationGoal can be stored in the columnar format"
+                )
+        goals.extend(episode.goals)
+        goal_offsets[i + 1] = len(goals)
+
+    columns: Dict[str, np.ndarray] = {
+        "episode_id": np.array(
+            [str(episode.episode_id).encode("utf-8") for episode in episodes],
+            dtype=np.bytes_,
+        ),
+        "scene_index": np.array(
+            [_table_index(scene_table, e.scene_id) for e in episodes],
+            dtype=np.int32,
+        ),
+        "scene_dataset_config_index": np.array(
+            [
+                _table_index(
+                    scene_dataset_config_table, e.scene_dataset_config
+                )
+                for e in episodes
+            ],
+            dtype=np.int32,
+        ),
+        "start_room_index": np.array(
+            [_table_index(start_room_table, e.start_room) for e in episodes],
+            dtype=np.int32,
+        ),
+        "start_position": np.array(
+            [e.start_position for e in episodes], dtype=np.float32
+        ).reshape(-1, 3),
+        "start_rotation": np.array(
+            [e.start_rotation for e in episodes], dtype=np.float32
+        ).reshape(-1, 4),
+        "goal_offsets": goal_offsets,
+        "goal_position": np.array(
+            [goal.position for goal in goals], dtype=np.float32
+        ).reshape(-1, 3),
+        "goal_radius": np.array(
+            [np.nan if goal.radius is None else goal.radius for goal in goals],
+            dtype=np.float64,
+        ),
+    }
+    json_values = {
+        "info": [e.info for e in episodes],
+        "shortest_paths": [e.shortest_paths for e in episodes],
+        "additional_obj_config_paths": [
+            e.additional_obj_config_paths or None for e in episodes
+        ],
+    }
+    for name, values in json_values.items():
+        (
+            columns[f"{name}_offsets"],
+            columns[f"{name}_data"],
+        ) = _pack_json_column(values)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for name, column in columns.items():
+        np.save(os.path.join(output_dir, f"{name}.npy"), column)
+
+    metadata = {
+        "format": COLUMNAR_FORMAT_NAME,
+        "version": COLUMNAR_FORMAT_VERSION,
+        "num_episodes": len(episodes),
+        "scene_ids": list(scene_table),
+        "scene_dataset_configs": list(scene_dataset_config_table),
+        "start_rooms": list(start_room_table),
+    }
+    # Written last, a directory without it is an incomplete dataset
+    with open(os.path.join(output_dir, METADATA_FILENAME), "w") as f:
+        json.dump(metadata, f)
+
+
+class ColumnarEpisodes:
+    r"""Read access to the episodes of a columnar dataset directory.
+
+    Pickling only sends the path, the arrays are mapped again on the other
+    side.
+    """
+
+    def __init__(self, path: str, mmap: bool = True) -> None:
+        r"""..
+
+        :param path: directory written by :ref:`save_columnar_episodes`.
+        :param mmap: if :py:`True`, memory map the arrays instead of reading
+            them.
+        """
+        self.path = path
+        self.mmap = mmap
+        metadata_path = os.path.join(path, METADATA_FILENAME)
+        if not os.path.exists(metadata_path):
+            raise FileNotFoundError(
+                f"Could not find columnar dataset `{metadata_path}`"
+            )
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+        if (
+            metadata.get("format") != COLUMNAR_FORMAT_NAME
+            or metadata.get("version") != COLUMNAR_FORMAT_VERSION
+        ):
+            raise ValueError(
+                f"`{path}` is not a columnar episode dataset of version"
+                f" {COLUMNAR_FORMAT_VERSION}"
+            )
+
+        self.num_episodes: int = metadata["num_episodes"]
+        self.scene_ids: List[str] = metadata["scene_ids"]
+        self.scene_dataset_configs: List[str] = metadata[
+            "scene_dataset_configs"
+        ]
+        self.start_rooms: List[str] = metadata["start_rooms"]
+
+        column_names = list(_ARRAY_COLUMNS) + [
+            f"{name}_{part}"
+            for name in _JSON_COLUMNS
+            for part in ("offsets", "data")
+        ]
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(
+                os.path.join(path, f"{name}.npy"),
+                mmap_mode="r" if mmap else None,
+            )
+            for name in column_names
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"path": self.path, "mmap": self.mmap}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def _json_value(self, name: str, index: int) -> Any:
+        offsets = self.columns[f"{name}_offsets"]
+        start, end = offsets[index], offsets[index + 1]
+        if start == end:
+            return None
+        return json.loads(self.columns[f"{name}_data"][start:end].tobytes())
+
+    def episode(
+        self, index: int, scene_ids: Optional[List[str]] = None
+    ) -> NavigationEpisode:
+        r"""Builds the episode at :p:`index`.
+
+        :param index: row of the episode in the columns.
+        :param scene_ids: scene id table to use instead of the stored one,
+            see :ref:`resolve_scene_ids`.
+        """
+        columns = self.columns
+        if scene_ids is None:
+            scene_ids = self.scene_ids
+
+        goal_start, goal_end = columns["goal_offsets"][index : index + 2]
+        goals = [
+            NavigationGoal(
+                position=position.tolist(),
+                radius=None if np.isnan(radius) else float(radius),
+            )
+            for position, radius in zip(
+                columns["goal_position"][goal_start:goal_end],
+                columns["goal_radius"][goal_start:goal_end],
+            )
+        ]
+
+        shortest_paths = self._json_value("shortest_paths", index)
+        if shortest_paths is not None:
+            shortest_paths = [
+                [ShortestPathPoint(**point) for point in path]
+                for path in shortest_paths
+            ]
+
+        start_room_index = columns["start_room_index"][index]
+        return NavigationEpisode(
+            episode_id=columns["episode_id"][index].decode("utf-8"),
+            scene_id=scene_ids[columns["scene_index"][index]],
+            scene_dataset_config=self.scene_dataset_configs[
+                columns["scene_dataset_config_index"][index]
+            ],
+            additional_obj_config_paths=self._json_value(
+                "additional_obj_config_paths", index
+            )
+            or [],
+            start_position=columns["start_position"][index].tolist(),
+            start_rotation=columns["start_rotation"][index].tolist(),
+            info=self._json_value("info", index),
+            goals=goals,
+            start_room=None
+            if start_room_index < 0
+            else self.start_rooms[start_room_index],
+            shortest_paths=shortest_paths,
+        )
+
+    def resolve_scene_ids(self, scenes_dir: Optional[str]) -> List[str]:
+        r"""Returns the scene id table with the scene ids placed in
+        :p:`scenes_dir`, like :ref:`PointNavDatasetV1.from_json` does.
+        """
+        if scenes_dir is None:
+            return list(self.scene_ids)
+
+        scene_ids = []
+        for scene_id in self.scene_ids:
+            if scene_id.startswith(DEFAULT_SCENE_PATH_PREFIX):
+                scene_id = scene_id[len(DEFAULT_SCENE_PATH_PREFIX) :]
+            scene_ids.append(os.path.join(scenes_dir, scene_id))
+        return scene_ids
+
+
+class LazyEpisodeList(Sequence[NavigationEpisode]):
+    r"""Read-only sequence of a subset of the episodes of a columnar
+    dataset, that builds the episodes when they are accessed.
+    """
+
+    def __init__(
+        self,
+        columnar_episodes: ColumnarEpisodes,
+        indices: np.ndarray,
+        scene_ids: List[str],
+    ) -> None:
+        r"""..
+
+        :param columnar_episodes: the columns of the dataset.
+        :param indices: rows of the episodes of the sequence.
+        :param scene_ids: scene id table, as given by
+            :ref:`ColumnarEpisodes.resolve_scene_ids`.
+        """
+        self.columnar_episodes = columnar_episodes
+        self.indices = indices
+        self.scene_ids = scene_ids
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @overload
+    def __getitem__(self, index: int) -> NavigationEpisode:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LazyEpisodeList":
+        ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[NavigationEpisode, "LazyEpisodeList"]:
+        if isinstance(index, slice):
+            return self.select(self.indices[index])
+        return self.columnar_episodes.episode(
+            int(self.indices[index]), self.scene_ids
+        )
+
+    def __iter__(self) -> Iterator[NavigationEpisode]:
+        for index in self.indices:
+            yield self.columnar_episodes.episode(int(index), self.scene_ids)
+
+    @property
+    def scene_indices(self) -> np.ndarray:
+        r"""Index in :ref:`scene_ids` of the scene of each episode."""
+        return self.columnar_episodes.columns["scene_index"][self.indices]
+
+    def select(self, indices: np.ndarray) -> "LazyEpisodeList":
+        r"""Returns the sequence of the episodes at the given rows of the
+        columns.
+        """
+        return LazyEpisodeList(
+            self.columnar_episodes, np.asarray(indices), self.scene_ids
+        )
+
+    def episode_handles(self) -> List["_EpisodeHandle"]:
+        return [
+            _EpisodeHandle(int(index), self.scene_ids[scene_index])
+            for index, scene_index in zip(self.indices, self.scene_indices)
+        ]
+
+
+@attr.s(auto_attribs=True, slots=True)
+class _EpisodeHandle:
+    r"""Placeholder for an episode that :ref:`EpisodeIterator` can order."""
+    index: int
+    scene_id: str
+
+
+class LazyEpisodeIterator(EpisodeIterator):
+    r""":ref:`EpisodeIterator` over the episodes of a
+    :ref:`LazyEpisodeList` that only builds the episodes it yields.
+    """
+
+    def __init__(
+        self, episodes: LazyEpisodeList, *args: Any, **kwargs: Any
+    ) -> None:
+        super().__init__(episodes.episode_handles(), *args, **kwargs)  # type: ignore[arg-type]
+        self._lazy_episodes = episodes
+
+    def __next__(self) -> NavigationEpisode:
+        handle = super().__next__()
+        return self._lazy_episodes.columnar_episodes.episode(
+            handle.index, self._lazy_episodes.scene_ids
+        )
+
+
+@registry.register_dataset(name="PointNav-v1-columnar")
+class ColumnarPointNavDatasetV1(PointNavDatasetV1):
+    r"""PointNav dataset stored in the columnar format, see
+    :ref:`habitat.datasets.pointnav.columnar_pointnav_dataset`.
+
+    :py:`data_path` is the directory of the columnar dataset. The episodes
+    are a :ref:`LazyEpisodeList` until they are replaced, for instance by
+    :ref:`filter_episodes` or :ref:`get_splits`.
+    """
+
+    episodes: Sequence[NavigationEpisode]  # type: ignore[assignment]
+
+    @staticmethod
+    def check_config_paths_exist(config: "DictConfig") -> bool:
+        return os.path.exists(
+            os.path.join(
+                config.data_path.format(split=config.split), METADATA_FILENAME
+            )
+        ) and os.path.exists(config.scenes_dir)
+
+    @classmethod
+    def get_scenes_to_load(cls, config: "DictConfig") -> List[str]:
+        columnar_episodes = ColumnarEpisodes(
+            config.data_path.format(split=config.split)
+        )
+        return sorted(
+            set(map(cls.scene_from_scene_path, columnar_episodes.scene_ids))
+        )
+
+    def __init__(self, config: Optional["DictConfig"] = None) -> None:
+        self.episodes = []
+
+        if config is None:
+            return
+
+        columnar_episodes = ColumnarEpisodes(
+            config.data_path.format(split=config.split)
+        )
+        indices = np.arange(columnar_episodes.num_episodes, dtype=np.int64)
+        if ALL_SCENES_MASK not in config.content_scenes:
+            scenes_to_load = set(config.content_scenes)
+            scene_mask = np.array(
+                [
+                    self.scene_from_scene_path(scene_id) in scenes_to_load
+                    for scene_id in columnar_episodes.scene_ids
+                ],
+                dtype=bool,
+            )
+            indices = indices[
+                scene_mask[columnar_episodes.columns["scene_index"]]
+            ]
+
+        self.episodes = LazyEpisodeList(
+            columnar_episodes,
+            indices,
+            columnar_episodes.resolve_scene_ids(config.scenes_dir),
+        )
+
+    @property
+    def scene_ids(self) -> List[str]:
+        if not isinstance(self.episodes, LazyEpisodeList):
+            return super().scene_ids
+        return sorted(
+            self.episodes.scene_ids[i]
+            for i in np.unique(self.episodes.scene_indices)
+        )
+
+    def get_scene_episodes(self, scene_id: str) -> List[NavigationEpisode]:
+        if not isinstance(self.episodes, LazyEpisodeList):
+            return super().get_scene_episodes(scene_id)
+        if scene_id not in self.episodes.scene_ids:
+            return []
+        scene_index = self.episodes.scene_ids.index(scene_id)
+        return list(
+            self.episodes.select(
+                self.episodes.indices[
+                    self.episodes.scene_indices == scene_index
+                ]
+            )
+        )
+
+    def get_episode_iterator(
+        self, *args: Any, **kwargs: Any
+    ) -> Iterator[NavigationEpisode]:
+        if not isinstance(self.episodes, LazyEpisodeList):
+            return super().get_episode_iterator(*args, **kwargs)
+        return LazyEpisodeIterator(self.episodes, *args, **kwargs)
+
+
+def convert_to_columnar(
+    input_path: str, output_dir: str, content_scenes: Sequence[str] = ("*",)
+) -> int:
+    r"""Converts a PointNav ``.json.gz`` dataset, with its per-scene content
+    files if it has some, to the columnar format.
+
+    :param input_path: path of the ``.json.gz`` dataset file.
+    :param output_dir: directory of the columnar dataset.
+    :param content_scenes: scenes to convert.
+    :return: the number of converted episodes.
+    """
+    from omegaconf import OmegaConf
+
+    config = OmegaConf.create(
+        {
+            "data_path": input_path,
+            "split": "",
+            # Keep the scene ids as they are stored
+            "scenes_dir": None,
+            "content_scenes": list(content_scenes),
+        }
+    )
+    dataset = PointNavDatasetV1(config)
+    save_columnar_episodes(dataset.episodes, output_dir)
+    return len(dataset.episodes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a PointNav .json.gz dataset to the columnar"
+        " format"
+    )
+    parser.add_argument("--input", required=True, help=".json.gz dataset")
+    parser.add_argument(
+        "--output", required=True, help="columnar dataset directory"
+    )
+    parser.add_argument(
+        "--content-scenes",
+        nargs="+",
+        default=[ALL_SCENES_MASK],
+        help="scenes to convert, all of them by default",
+    )
+    args = parser.parse_args()
+    num_episodes = convert_to_columnar(
+        args.input, args.output, args.content_scenes
+    )
+    print(f"Wrote {num_episodes} episodes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
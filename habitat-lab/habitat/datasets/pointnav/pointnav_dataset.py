@@ -6,12 +6,15 @@
 
 import gzip
 import json
+import multiprocessing as mp
 import os
-from typing import TYPE_CHECKING, List, Optional
+from functools import partial
+from typing import TYPE_CHECKING, List, Optional, Type
 
 from habitat.config import read_write
 from habitat.core.dataset import ALL_SCENES_MASK, Dataset
 from habitat.core.registry import registry
+from habitat.datasets.trajectory_store import TrajectoryStore
 from habitat.tasks.nav.nav import (
     NavigationEpisode,
     NavigationGoal,
@@ -115,18 +118,60 @@ class PointNavDatasetV1(Dataset):
                     dataset_dir=dataset_dir,
                 )
 
-            for scene in scenes:
-                scene_filename = self.content_scenes_path.format(
+            scene_filenames = [
+                self.content_scenes_path.format(
                     data_path=dataset_dir, scene=scene
                 )
-                with gzip.open(scene_filename, "rt") as f:
-                    self.from_json(f.read(), scenes_dir=config.scenes_dir)
+                for scene in scenes
+            ]
+            num_load_workers = min(
+                config.get("num_load_workers", 0), len(scene_filenames)
+            )
+            # Daemonic processes, like the VectorEnv workers, cannot have
+            # children.
+            if num_load_workers > 1 and not mp.current_process().daemon:
+                with mp.get_context("forkserver").Pool(
+                    num_load_workers
+                ) as pool:
+                    for scene_dataset in pool.imap(
+                        partial(
+                            _load_scene_dataset,
+                            type(self),
+                            scenes_dir=config.scenes_dir,
+                        ),
+                        scene_filenames,
+                    ):
+                        self._merge_scene_dataset(scene_dataset)
+            else:
+                for scene_filename in scene_filenames:
+                    with gzip.open(scene_filename, "rt") as f:
+                        self.from_json(f.read(), scenes_dir=config.scenes_dir)
 
         else:
             self.episodes = list(
                 filter(self.build_content_scenes_filter(config), self.episodes)
             )
 
+        if config.get("trajectory_store_path"):
+            TrajectoryStore(config.trajectory_store_path).set_shortest_paths(
+                self.episodes
+            )
+
+    def _merge_scene_dataset(self, scene_dataset: "PointNavDatasetV1") -> None:
+        r"""Adds the episodes of a scene file loaded by another process, along
+        with the state :ref:`from_json` keeps on the dataset, like the goals
+        of ObjectNav.
+        """
+        for key, value in scene_dataset.__getstate__().items():
+            if key == "episodes":
+                self.episodes.extend(value)
+            elif isinstance(value, dict) and isinstance(
+                self.__dict__.get(key), dict
+            ):
+                self.__dict__[key].update(value)
+            else:
+                self.__dict__[key] = value
+
     def from_json(
         self, json_str: str, scenes_dir: Optional[str] = None
     ) -> None:
@@ -152,3 +197,17 @@ class PointNavDatasetV1(Dataset):
                     for p_index, point in enumerate(path):
                         path[p_index] = ShortestPathPoint(**point)
             self.episodes.append(episode)
+
+
+def _load_scene_dataset(
+    dataset_cls: Type[PointNavDatasetV1],
+    scene_filename: str,
+    scenes_dir: Optional[str],
+) -> PointNavDatasetV1:
+    r"""Loads the episodes of a scene file in a dataset of its own, run in
+    the processes loading the scene files in parallel.
+    """
+    dataset = dataset_cls()
+    with gzip.open(scene_filename, "rt") as f:
+        dataset.from_json(f.read(), scenes_dir=scenes_dir)
+    return dataset
@@ -378,12 +378,20 @@ class RearrangeEpisodeGenerator:
         for sampler in self._obj_samplers.values():
             sampler.reset()
 
-    def generate_scene(self) -> str:
+    def get_scenes(self) -> List[str]:
         """
-        Sample a new scene and re-initialize the Simulator.
+        Return the handles of the scenes episodes can be generated in.
+        """
+        return self._scene_sampler.get_scenes()
+
+    def generate_scene(self, scene: Optional[str] = None) -> str:
+        """
+        Sample a new scene, or use the provided scene handle, and re-initialize the Simulator.
         Return the generated scene's handle.
         """
-        cur_scene_name = self._scene_sampler.sample()
+        cur_scene_name = (
+            self._scene_sampler.sample() if scene is None else scene
+        )
         logger.info(f"Initializing scene {cur_scene_name}")
         self.initialize_sim(cur_scene_name, self.cfg.dataset_path)
 
@@ -442,9 +450,11 @@ class RearrangeEpisodeGenerator:
 
         return generated_episodes
 
-    def generate_single_episode(self) -> Optional[RearrangeEpisode]:
+    def generate_single_episode(
+        self, scene: Optional[str] = None
+    ) -> Optional[RearrangeEpisode]:
         """
-        Generate a single episode, sampling the scene.
+        Generate a single episode, sampling the scene unless a scene handle is provided.
         """
 
         # Reset the number of allowed objects per receptacle.
@@ -459,7 +469,7 @@ class RearrangeEpisodeGenerator:
             "sampled_targets": {},  # target sampler name -> (object, target state)
         }
 
-        ep_scene_handle = self.generate_scene()
+        ep_scene_handle = self.generate_scene(scene)
         scene_base_dir = osp.dirname(osp.dirname(ep_scene_handle))
 
         scene_name = ep_scene_handle.split(".")[0]
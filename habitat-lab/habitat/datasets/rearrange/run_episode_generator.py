@@ -4,17 +4,25 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gzip
+import multiprocessing as mp
 import os
 import os.path as osp
 import random
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any, List
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from omegaconf import OmegaConf
 
 from habitat.core.logging import logger
-from habitat.datasets.rearrange.rearrange_dataset import RearrangeDatasetV0
+from habitat.core.utils import DatasetFloatJSONEncoder
+from habitat.datasets.rearrange.rearrange_dataset import (
+    RearrangeDatasetV0,
+    RearrangeEpisode,
+)
 from habitat.datasets.rearrange.rearrange_generator import (
     RearrangeEpisodeGenerator,
 )
@@ -202,6 +210,212 @@ def get_config_defaults() -> "DictConfig":
     return OmegaConf.create(RearrangeEpisodeGeneratorConfig())  # type: ignore[call-overload]
 
 
+def get_output_path(out: Optional[str]) -> str:
+    """
+    Returns the path of the generated dataset file for the --out argument and creates its directory.
+    """
+    output_path = out
+    if output_path is None:
+        # default
+        output_path = "rearrange_ep_dataset.json.gz"
+    elif osp.isdir(output_path) or output_path.endswith("/"):
+        # append a default filename
+        output_path = (
+            osp.abspath(output_path) + "/rearrange_ep_dataset.json.gz"
+        )
+    else:
+        # filename
+        if not output_path.endswith(".json.gz"):
+            output_path += ".json.gz"
+
+    if (
+        not osp.exists(osp.dirname(output_path))
+        and len(osp.dirname(output_path)) > 0
+    ):
+        os.makedirs(osp.dirname(output_path))
+    return output_path
+
+
+@dataclass
+class EpisodeShard:
+    """
+    Episodes of a scene generated by one worker of :ref:`generate_episodes_parallel`.
+    """
+
+    # index of the shard, the episodes are written in the order of the shards
+    index: int
+    scene: str
+    num_episodes: int
+    # seed of the random generators for this shard, not seeded if None
+    seed: Optional[int] = None
+
+
+def get_episode_shards(
+    scenes: List[str],
+    num_episodes: int,
+    episodes_per_shard: int,
+    seed: Optional[int] = None,
+) -> List[EpisodeShard]:
+    """
+    Splits the episodes evenly between the scenes, and the episodes of each scene in shards of at most episodes_per_shard episodes.
+    The shards only depend on the arguments, not on the number of workers, so that a seeded generation is reproducible.
+    """
+    shards: List[EpisodeShard] = []
+    for scene_index, scene in enumerate(scenes):
+        scene_episodes = num_episodes // len(scenes) + int(
+            scene_index < num_episodes % len(scenes)
+        )
+        for start in range(0, scene_episodes, episodes_per_shard):
+            shards.append(
+                EpisodeShard(
+                    index=len(shards),
+                    scene=scene,
+                    num_episodes=min(
+                        episodes_per_shard, scene_episodes - start
+                    ),
+                    seed=None if seed is None else seed + len(shards),
+                )
+            )
+    return shards
+
+
+# The episode generator of each worker process, with its own Simulator.
+_worker_generator: Optional[RearrangeEpisodeGenerator] = None
+
+
+def _init_worker(
+    cfg: "DictConfig",
+    limit_scene_set: Optional[str],
+    debug: bool,
+    db_output: str,
+) -> None:
+    global _worker_generator
+    _worker_generator = RearrangeEpisodeGenerator(
+        cfg=cfg,
+        debug_visualization=debug,
+        limit_scene_set=limit_scene_set,
+    )
+    _worker_generator.vdb.output_path = osp.abspath(db_output)
+
+
+def _get_worker_scenes() -> List[str]:
+    return _worker_generator.get_scenes()
+
+
+def _generate_shard(
+    args: Tuple[EpisodeShard, int]
+) -> Tuple[EpisodeShard, List[RearrangeEpisode], int, float]:
+    """
+    Generates the episodes of a shard in a worker process.
+    Returns the shard, its episodes, the number of failed tries and the generation time.
+    """
+    shard, max_consecutive_failures = args
+    if shard.seed is not None:
+        random.seed(shard.seed)
+        np.random.seed(shard.seed)
+
+    start_time = time.time()
+    episodes: List[RearrangeEpisode] = []
+    num_failures = consecutive_failures = 0
+    while len(episodes) < shard.num_episodes:
+        episode = _worker_generator.generate_single_episode(shard.scene)
+        if episode is not None:
+            episodes.append(episode)
+            consecutive_failures = 0
+            continue
+        num_failures += 1
+        consecutive_failures += 1
+        if consecutive_failures >= max_consecutive_failures:
+            logger.warning(
+                f"Giving up on scene '{shard.scene}' after {consecutive_failures} failed tries in a row."
+            )
+            break
+    return shard, episodes, num_failures, time.time() - start_time
+
+
+def generate_episodes_parallel(
+    cfg: "DictConfig",
+    num_episodes: int,
+    output_path: str,
+    num_workers: int,
+    seed: Optional[int] = None,
+    limit_scene_set: Optional[str] = None,
+    episodes_per_shard: int = 10,
+    max_consecutive_failures: int = 100,
+    debug: bool = False,
+    db_output: str = "rearrange_ep_gen_output/",
+) -> int:
+    """
+    Generates episodes in num_workers processes, each with its own RearrangeEpisodeGenerator and Simulator.
+    The episodes are split in shards by scene (see :ref:`get_episode_shards`), and the episodes of the finished shards are streamed to this process, which appends them to the .json.gz dataset file as they arrive and reports the failure rate of each scene and the throughput.
+    Returns the number of episodes written, fewer than num_episodes if a scene failed max_consecutive_failures times in a row.
+    """
+    if debug:
+        os.makedirs(db_output, exist_ok=True)
+    # Each process loads its own simulator
+    with mp.get_context("forkserver").Pool(
+        num_workers,
+        initializer=_init_worker,
+        initargs=(cfg, limit_scene_set, debug, db_output),
+    ) as pool:
+        scenes = pool.apply(_get_worker_scenes)
+        shards = get_episode_shards(
+            scenes, num_episodes, episodes_per_shard, seed
+        )
+        logger.info(
+            f"Generating {num_episodes} episodes in {len(scenes)} scenes with {num_workers} workers, {len(shards)} shards."
+        )
+
+        # {scene -> [episodes, failed tries, generation time]}
+        scene_stats: Dict[str, List[float]] = defaultdict(lambda: [0, 0, 0.0])
+        encoder = DatasetFloatJSONEncoder()
+        num_written = 0
+        start_time = time.time()
+        # The file only gets its final name once complete.
+        tmp_output_path = output_path + ".tmp"
+        with gzip.open(tmp_output_path, "wt") as f:
+            # Same layout as RearrangeDatasetV0.to_json
+            f.write('{"config": null, "episodes": [')
+            # imap returns the shards in order, so the file does not depend
+            # on the scheduling of the workers.
+            for shard, episodes, num_failures, duration in pool.imap(
+                _generate_shard,
+                [(shard, max_consecutive_failures) for shard in shards],
+            ):
+                for episode in episodes:
+                    episode.episode_id = str(num_written)
+                    if num_written > 0:
+                        f.write(", ")
+                    f.write(encoder.encode(episode))
+                    num_written += 1
+                f.flush()
+
+                stats = scene_stats[shard.scene]
+                stats[0] += len(episodes)
+                stats[1] += num_failures
+                stats[2] += duration
+                elapsed = time.time() - start_time
+                logger.info(
+                    f"{num_written}/{num_episodes} episodes written in {elapsed:.1f}s ({num_written / elapsed:.2f} episodes/s)."
+                )
+            f.write("]}")
+        os.replace(tmp_output_path, output_path)
+
+    elapsed = time.time() - start_time
+    logger.info("Per scene generation statistics:")
+    for scene, (num_scene_episodes, num_failures, duration) in sorted(
+        scene_stats.items()
+    ):
+        num_tries = num_scene_episodes + num_failures
+        logger.info(
+            f"  {scene}: {num_scene_episodes} episodes, {num_failures}/{num_tries} failed tries ({num_failures / max(num_tries, 1):.1%}), {num_scene_episodes / max(duration, 1e-6):.2f} episodes/s per worker."
+        )
+    logger.info(
+        f"Generated {num_written} episodes in {elapsed:.1f}s ({num_written / max(elapsed, 1e-6):.2f} episodes/s)."
+    )
+    return num_written
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -263,6 +477,24 @@ if __name__ == "__main__":
         help="The number of episodes to generate.",
     )
     parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="The number of processes generating episodes, each with its own Simulator. With more than one, the episodes are split evenly between the scenes.",
+    )
+    parser.add_argument(
+        "--episodes-per-shard",
+        type=int,
+        default=10,
+        help="The number of episodes of a scene generated at once by a worker.",
+    )
+    parser.add_argument(
+        "--max-consecutive-failures",
+        type=int,
+        default=100,
+        help="The number of failed tries in a row after which a worker gives up on a scene.",
+    )
 
     args, _ = parser.parse_known_args()
 
@@ -282,107 +514,103 @@ if __name__ == "__main__":
 
     logger.info(f"\n\nModified Config:\n{cfg}\n\n")
 
-    dataset = RearrangeDatasetV0()
-    with RearrangeEpisodeGenerator(
-        cfg=cfg,
-        debug_visualization=args.debug,
-        limit_scene_set=args.limit_scene_set,
-    ) as ep_gen:
-        if not osp.isdir(args.db_output):
-            os.makedirs(args.db_output)
-        ep_gen.vdb.output_path = osp.abspath(args.db_output)
-
-        # Simulator has been initialized and SceneDataset is populated
-        if args.list:
-            # NOTE: you can retrieve a string CSV rep of the full SceneDataset with ep_gen.sim.metadata_mediator.dataset_report()
-            mm = ep_gen.sim.metadata_mediator
-            receptacles = get_all_scenedataset_receptacles(ep_gen.sim)
-            list_sep = "\n    "
-            logger.info("==================================")
-            logger.info("Listing SceneDataset Summary")
-            logger.info("==================================")
-            logger.info(f" SceneDataset: {mm.active_dataset}\n")
-            logger.info("--------")
-            logger.info(" Scenes:")
-            logger.info("--------\n    ")
-            logger.info("\n     ".join(mm.get_scene_handles()))
-            logger.info("---------------")
-            logger.info(" Rigid Objects:")
-            logger.info("---------------\n    ")
-            logger.info(
-                "\n     ".join(
-                    mm.object_template_manager.get_template_handles()
-                ),
-            )
-            logger.info("---------------------")
-            logger.info(" Articulated Objects:")
-            logger.info("---------------------\n    ")
-            logger.info("\n     ".join(mm.urdf_paths))
-
-            logger.info("-------------------------")
-            logger.info("Stage Global Receptacles:")
-            logger.info("-------------------------")
-            for handle, r_list in receptacles["stage"].items():
-                logger.info(f"  - {handle}\n    ")
-                logger.info("\n     ".join(r_list))
-
-            logger.info("-------------------------")
-            logger.info("Rigid Object Receptacles:")
-            logger.info("-------------------------")
-            for handle, r_list in receptacles["rigid"].items():
-                logger.info(f"  - {handle}\n    ")
-                logger.info("\n     ".join(r_list))
-            logger.info("-------------------------------")
-            logger.info("Articulated Object receptacles:")
-            logger.info("-------------------------------")
-            for handle, r_list in receptacles["articulated"].items():
-                logger.info(f"  - {handle}\n    ")
-                logger.info("\n     ".join(r_list))
-
-            logger.info("==================================")
-            logger.info("Done listing SceneDataset summary")
-            logger.info("==================================")
-        else:
-            import time
-
-            start_time = time.time()
-            dataset.episodes += ep_gen.generate_episodes(
-                args.num_episodes, args.verbose
-            )
-            output_path = args.out
-            if output_path is None:
-                # default
-                output_path = "rearrange_ep_dataset.json.gz"
-            elif osp.isdir(output_path) or output_path.endswith("/"):
-                # append a default filename
-                output_path = (
-                    osp.abspath(output_path) + "/rearrange_ep_dataset.json.gz"
+    if not args.list and args.num_workers > 1:
+        output_path = get_output_path(args.out)
+        generate_episodes_parallel(
+            cfg,
+            args.num_episodes,
+            output_path,
+            args.num_workers,
+            seed=args.seed,
+            limit_scene_set=args.limit_scene_set,
+            episodes_per_shard=args.episodes_per_shard,
+            max_consecutive_failures=args.max_consecutive_failures,
+            debug=args.debug,
+            db_output=args.db_output,
+        )
+        logger.info(
+            f"RearrangeDatasetV0 saved to '{osp.abspath(output_path)}'"
+        )
+    else:
+        dataset = RearrangeDatasetV0()
+        with RearrangeEpisodeGenerator(
+            cfg=cfg,
+            debug_visualization=args.debug,
+            limit_scene_set=args.limit_scene_set,
+        ) as ep_gen:
+            if not osp.isdir(args.db_output):
+                os.makedirs(args.db_output)
+            ep_gen.vdb.output_path = osp.abspath(args.db_output)
+
+            # Simulator has been initialized and SceneDataset is populated
+            if args.list:
+                # NOTE: you can retrieve a string CSV rep of the full SceneDataset with ep_gen.sim.metadata_mediator.dataset_report()
+                mm = ep_gen.sim.metadata_mediator
+                receptacles = get_all_scenedataset_receptacles(ep_gen.sim)
+                list_sep = "\n    "
+                logger.info("==================================")
+                logger.info("Listing SceneDataset Summary")
+                logger.info("==================================")
+                logger.info(f" SceneDataset: {mm.active_dataset}\n")
+                logger.info("--------")
+                logger.info(" Scenes:")
+                logger.info("--------\n    ")
+                logger.info("\n     ".join(mm.get_scene_handles()))
+                logger.info("---------------")
+                logger.info(" Rigid Objects:")
+                logger.info("---------------\n    ")
+                logger.info(
+                    "\n     ".join(
+                        mm.object_template_manager.get_template_handles()
+                    ),
                 )
+                logger.info("---------------------")
+                logger.info(" Articulated Objects:")
+                logger.info("---------------------\n    ")
+                logger.info("\n     ".join(mm.urdf_paths))
+
+                logger.info("-------------------------")
+                logger.info("Stage Global Receptacles:")
+                logger.info("-------------------------")
+                for handle, r_list in receptacles["stage"].items():
+                    logger.info(f"  - {handle}\n    ")
+                    logger.info("\n     ".join(r_list))
+
+                logger.info("-------------------------")
+                logger.info("Rigid Object Receptacles:")
+                logger.info("-------------------------")
+                for handle, r_list in receptacles["rigid"].items():
+                    logger.info(f"  - {handle}\n    ")
+                    logger.info("\n     ".join(r_list))
+                logger.info("-------------------------------")
+                logger.info("Articulated Object receptacles:")
+                logger.info("-------------------------------")
+                for handle, r_list in receptacles["articulated"].items():
+                    logger.info(f"  - {handle}\n    ")
+                    logger.info("\n     ".join(r_list))
+
+                logger.info("==================================")
+                logger.info("Done listing SceneDataset summary")
+                logger.info("==================================")
             else:
-                # filename
-                if not output_path.endswith(".json.gz"):
-                    output_path += ".json.gz"
-
-            if (
-                not osp.exists(osp.dirname(output_path))
-                and len(osp.dirname(output_path)) > 0
-            ):
-                os.makedirs(osp.dirname(output_path))
-            # serialize the dataset
-            import gzip
-
-            with gzip.open(output_path, "wt") as f:
-                f.write(dataset.to_json())
+                start_time = time.time()
+                dataset.episodes += ep_gen.generate_episodes(
+                    args.num_episodes, args.verbose
+                )
+                output_path = get_output_path(args.out)
+                # serialize the dataset
+                with gzip.open(output_path, "wt") as f:
+                    f.write(dataset.to_json())
 
-            logger.info(
-                "=============================================================="
-            )
-            logger.info(
-                f"RearrangeEpisodeGenerator generated {args.num_episodes} episodes in {time.time()-start_time} seconds."
-            )
-            logger.info(
-                f"RearrangeDatasetV0 saved to '{osp.abspath(output_path)}'"
-            )
-            logger.info(
-                "=============================================================="
-            )
+                logger.info(
+                    "=============================================================="
+                )
+                logger.info(
+                    f"RearrangeEpisodeGenerator generated {args.num_episodes} episodes in {time.time()-start_time} seconds."
+                )
+                logger.info(
+                    f"RearrangeDatasetV0 saved to '{osp.abspath(output_path)}'"
+                )
+                logger.info(
+                    "=============================================================="
+                )
@@ -19,6 +19,12 @@ class SceneSampler(ABC):
     def sample(self):
         pass
 
+    @abstractmethod
+    def get_scenes(self) -> List[str]:
+        """
+        Returns the handles of all the scenes which can be sampled.
+        """
+
 
 class SingleSceneSampler(SceneSampler):
     """
@@ -34,6 +40,9 @@ class SingleSceneSampler(SceneSampler):
     def num_scenes(self) -> int:
         return 1
 
+    def get_scenes(self) -> List[str]:
+        return [self.scene]
+
 
 class MultiSceneSampler(SceneSampler):
     """
@@ -49,3 +58,6 @@ class MultiSceneSampler(SceneSampler):
 
     def num_scenes(self) -> int:
         return len(self.scenes)
+
+    def get_scenes(self) -> List[str]:
+        return list(self.scenes)
@@ -11,11 +11,18 @@ from habitat.datasets.image_nav import _try_register_instanceimagenavdatasetv1
 from habitat.datasets.object_nav import _try_register_objectnavdatasetv1
 from habitat.datasets.pointnav import _try_register_pointnavdatasetv1
 from habitat.datasets.rearrange import _try_register_rearrangedatasetv0
+from habitat.datasets.shared_dataset import load_shared_dataset
 from habitat.datasets.vln import _try_register_r2r_vln_dataset
 
 
 def make_dataset(id_dataset, **kwargs):
     logger.info("Initializing dataset {}".format(id_dataset))
+    config = kwargs.get("config")
+    if config is not None and config.get("shared_dataset_path"):
+        return load_shared_dataset(
+            config.shared_dataset_path, config.content_scenes
+        )
+
     _dataset = registry.get_dataset(id_dataset)
     assert _dataset is not None, "Could not find dataset {}".format(id_dataset)
 
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+r"""Sharing of a loaded dataset between processes.
+
+The process creating the environments loads the dataset once and publishes
+it with :ref:`publish_shared_dataset` into a single file, in shared memory
+(``/dev/shm``) when available. The file holds the dataset without its
+episodes, the episodes packed per scene and an index of the scenes. Each
+worker then loads its scene split with :ref:`load_shared_dataset`, which
+only unpickles the episodes of the requested scenes instead of parsing the
+whole dataset.
+
+A config with ``shared_dataset_path`` set makes :ref:`habitat.make_dataset`
+load from the shared file.
+"""
+
+import copy
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from habitat.core.dataset import ALL_SCENES_MASK, Dataset
+
+if TYPE_CHECKING:
+    from habitat.core.dataset import Episode
+
+SHARED_DATASET_FORMAT = "habitat-shared-dataset"
+SHARED_DATASET_VERSION = 1
+_SHM_DIR = "/dev/shm"
+# The file starts with the offset of the index, stored after the episodes.
+_HEADER = struct.Struct("<Q")
+
+
+def publish_shared_dataset(
+    dataset: Dataset, directory: Optional[str] = None
+) -> str:
+    r"""Writes the dataset in a file that processes load with
+    :ref:`load_shared_dataset`. The caller owns the file and removes it once
+    the processes loaded their dataset.
+
+    :param dataset: the dataset to publish.
+    :param directory: where to create the file. Defaults to ``/dev/shm`` if
+        it exists, otherwise to the temporary directory.
+    :return: the path of the file.
+    """
+    if directory is None:
+        directory = (
+            _SHM_DIR if os.path.isdir(_SHM_DIR) else tempfile.gettempdir()
+        )
+
+    episodes_per_scene: Dict[str, List["Episode"]] = OrderedDict()
+    for episode in dataset.episodes:
+        scene = dataset.scene_from_scene_path(episode.scene_id)
+        episodes_per_scene.setdefault(scene, []).append(episode)
+
+    # Everything but the episodes, e.g. the goals of ObjectNav.
+    dataset_header = copy.copy(dataset)
+    dataset_header.episodes = []
+
+    fd, path = tempfile.mkstemp(
+        prefix="habitat-dataset-", suffix=".bin", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(0))
+            scene_ranges: Dict[str, Tuple[int, int]] = {}
+            for scene, episodes in episodes_per_scene.items():
+                data = pickle.dumps(episodes, protocol=pickle.HIGHEST_PROTOCOL)
+                scene_ranges[scene] = (f.tell(), len(data))
+                f.write(data)
+
+            index_offset = f.tell()
+            pickle.dump(
+                {
+                    "format": SHARED_DATASET_FORMAT,
+                    "version": SHARED_DATASET_VERSION,
+                    "dataset": pickle.dumps(
+                        dataset_header, protocol=pickle.HIGHEST_PROTOCOL
+                    ),
+                    "scenes": scene_ranges,
+                },
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            f.seek(0)
+            f.write(_HEADER.pack(index_offset))
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return path
+
+
+def load_shared_dataset(
+    path: str, content_scenes: Sequence[str] = (ALL_SCENES_MASK,)
+) -> Dataset:
+    r"""Loads a dataset published by :ref:`publish_shared_dataset`.
+
+    :param path: path of the published file.
+    :param content_scenes: names of the scenes to load the episodes of, in
+        order, or ``["*"]`` for all the scenes.
+    :return: a dataset of the class of the published one, holding the
+        episodes of the requested scenes.
+    """
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buffer:
+        (index_offset,) = _HEADER.unpack_from(buffer, 0)
+        index = pickle.loads(buffer[index_offset:])
+        if index.get("format") != SHARED_DATASET_FORMAT:
+            raise ValueError(f"{path} is not a shared dataset file")
+        if index["version"] > SHARED_DATASET_VERSION:
+            raise ValueError(
+                f"Unsupported shared dataset version {index['version']}"
+            )
+
+        dataset = pickle.loads(index["dataset"])
+        scene_ranges = index["scenes"]
+        scenes = (
+            list(scene_ranges.keys())
+            if ALL_SCENES_MASK in content_scenes
+            else content_scenes
+        )
+
+        episodes = []
+        for scene in scenes:
+            if scene not in scene_ranges:
+                continue
+            offset, size = scene_ranges[scene]
+            episodes.extend(pickle.loads(buffer[offset : offset + size]))
+
+    dataset.episodes = episodes
+    return dataset
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+r"""Store of the precomputed shortest path action trajectories of the
+episodes of a dataset.
+
+The trajectories are computed once by the shortest path follower (see
+:ref:`habitat.datasets.utils.get_action_shortest_path`) and saved in a single
+binary file: a JSON header with the episode keys and the layout of the
+arrays, followed by the raw arrays of the actions, positions and rotations
+of all the trajectories. :ref:`TrajectoryStore` memory-maps the file and only
+reads the trajectories that are looked up.
+
+The store of a dataset is built in parallel with:
+
+    python -m habitat.datasets.trajectory_store \\
+        --config benchmark/nav/pointnav/pointnav_habitat_test.yaml \\
+        --output data/trajectories/pointnav_habitat_test.bin \\
+        --num-workers 8
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import struct
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from habitat.core.dataset import ALL_SCENES_MASK, Dataset
+from habitat.core.simulator import ShortestPathPoint
+
+if TYPE_CHECKING:
+    from habitat.core.dataset import Episode
+
+TRAJECTORY_STORE_FORMAT = "habitat-trajectory-store"
+TRAJECTORY_STORE_VERSION = 1
+_HEADER_SIZE = struct.Struct("<Q")
+_ALIGNMENT = 64
+_ARRAY_DTYPES = {
+    "offsets": np.int64,
+    "actions": np.int16,
+    "positions": np.float32,
+    "rotations": np.float32,
+}
+
+
+def get_episode_key(episode: "Episode") -> str:
+    r"""Key of an episode in the store. Episode ids are only unique within a
+    scene in some datasets, so the key includes the scene name.
+    """
+    return (
+        f"{Dataset.scene_from_scene_path(episode.scene_id)}"
+        f"/{episode.episode_id}"
+    )
+
+
+def save_trajectories(
+    path: str,
+    trajectories: Iterable[Tuple[str, Sequence[ShortestPathPoint]]],
+) -> int:
+    r"""Writes a trajectory store.
+
+    :param path: path of the store file.
+    :param trajectories: pairs of episode key (see :ref:`get_episode_key`)
+        and shortest path, the keys must be unique.
+    :return: the number of trajectories written.
+    """
+    keys: List[str] = []
+    keys_set: Set[str] = set()
+    lengths: List[int] = []
+    actions: List[int] = []
+    positions: List[Sequence[float]] = []
+    rotations: List[Sequence[float]] = []
+    for key, shortest_path in trajectories:
+        if key in keys_set:
+            raise ValueError(f"Duplicate trajectory key {key}")
+        keys_set.add(key)
+        keys.append(key)
+        lengths.append(len(shortest_path))
+        for point in shortest_path:
+            actions.append(-1 if point.action is None else int(point.action))
+            positions.append(point.position)
+            rotations.append(point.rotation)
+
+    arrays = {
+        "offsets": np.concatenate([[0], np.cumsum(lengths)]),
+        "actions": np.array(actions),
+        "positions": np.array(positions).reshape(-1, 3),
+        "rotations": np.array(rotations).reshape(-1, 4),
+    }
+    arrays = {
+        name: np.ascontiguousarray(array, dtype=_ARRAY_DTYPES[name])
+        for name, array in arrays.items()
+    }
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {
+            "offset": offset,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+        }
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps(
+        {
+            "format": TRAJECTORY_STORE_FORMAT,
+            "version": TRAJECTORY_STORE_VERSION,
+            "keys": keys,
+            "arrays": layout,
+        }
+    ).encode("utf-8")
+    data_start = _HEADER_SIZE.size + len(header)
+    data_start = -(-data_start // _ALIGNMENT) * _ALIGNMENT
+
+    with open(path, "wb") as f:
+        f.write(_HEADER_SIZE.pack(len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    return len(keys)
+
+
+class TrajectoryStore:
+    r"""Read access to a trajectory store written by
+    :ref:`save_trajectories`. The arrays are memory-mapped, looking up a
+    trajectory only reads its own data.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            (header_size,) = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+            header = json.loads(f.read(header_size).decode("utf-8"))
+        if header.get("format") != TRAJECTORY_STORE_FORMAT:
+            raise ValueError(f"{path} is not a trajectory store")
+        if header["version"] > TRAJECTORY_STORE_VERSION:
+            raise ValueError(
+                f"Unsupported trajectory store version {header['version']}"
+            )
+
+        data_start = _HEADER_SIZE.size + header_size
+        data_start = -(-data_start // _ALIGNMENT) * _ALIGNMENT
+        self._indices: Dict[str, int] = {
+            key: index for index, key in enumerate(header["keys"])
+        }
+        self._arrays: Dict[str, np.ndarray] = {}
+        for name, layout in header["arrays"].items():
+            shape = tuple(layout["shape"])
+            if np.prod(shape) == 0:
+                self._arrays[name] = np.empty(shape, dtype=layout["dtype"])
+                continue
+            self._arrays[name] = np.memmap(
+                path,
+                dtype=layout["dtype"],
+                mode="r",
+                offset=data_start + layout["offset"],
+                shape=shape,
+            )
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._indices
+
+    def _get_range(self, key: str) -> slice:
+        index = self._indices[key]
+        offsets = self._arrays["offsets"]
+        return slice(int(offsets[index]), int(offsets[index + 1]))
+
+    def get_actions(self, key: str) -> np.ndarray:
+        r"""Returns the actions of the trajectory of an episode.
+
+        :param key: key of the episode, see :ref:`get_episode_key`.
+        """
+        return np.array(self._arrays["actions"][self._get_range(key)])
+
+    def get_shortest_path(self, key: str) -> List[ShortestPathPoint]:
+        r"""Returns the trajectory of an episode, as
+        :ref:`habitat.datasets.utils.get_action_shortest_path` does.
+
+        :param key: key of the episode, see :ref:`get_episode_key`.
+        """
+        trajectory = self._get_range(key)
+        return [
+            ShortestPathPoint(
+                position.tolist(),
+                rotation.tolist(),
+                None if action < 0 else int(action),
+            )
+            for action, position, rotation in zip(
+                self._arrays["actions"][trajectory],
+                self._arrays["positions"][trajectory],
+                self._arrays["rotations"][trajectory],
+            )
+        ]
+
+    def set_shortest_paths(self, episodes: Iterable["Episode"]) -> int:
+        r"""Sets the :py:`shortest_paths` of the navigation episodes found
+        in the store, as the datasets generated with
+        ``is_gen_shortest_path=True`` have them.
+
+        :return: the number of episodes updated.
+        """
+        num_updated = 0
+        for episode in episodes:
+            key = get_episode_key(episode)
+            if key in self._indices:
+                episode.shortest_paths = [self.get_shortest_path(key)]
+                num_updated += 1
+        return num_updated
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+
+def _compute_scene_trajectories(
+    args: Tuple[str, str, List["Episode"], float, int]
+) -> List[Tuple[str, List[ShortestPathPoint]]]:
+    r"""Computes the trajectories of the episodes of a scene, run in the
+    processes building the store.
+    """
+    import habitat
+    from habitat.datasets.utils import get_action_shortest_path
+    from habitat.sims import make_sim
+
+    (
+        config_path,
+        scene_id,
+        episodes,
+        success_distance,
+        max_episode_steps,
+    ) = args
+    config = habitat.get_config(config_path)
+    with habitat.config.read_write(config):
+        config.habitat.simulator.scene = scene_id
+        # Only the navmesh is needed
+        for agent_config in config.habitat.simulator.agents.values():
+            agent_config.sim_sensors.clear()
+
+    trajectories = []
+    with make_sim(
+        config.habitat.simulator.type, config=config.habitat.simulator
+    ) as sim:
+        for episode in episodes:
+            trajectories.append(
+                (
+                    get_episode_key(episode),
+                    get_action_shortest_path(
+                        sim,
+                        source_position=episode.start_position,
+                        source_rotation=episode.start_rotation,
+                        goal_position=episode.goals[0].position,
+                        success_distance=success_distance,
+                        max_episode_steps=max_episode_steps,
+                    ),
+                )
+            )
+    return trajectories
+
+
+def build_trajectory_store(
+    config_path: str,
+    output_path: str,
+    content_scenes: Sequence[str] = (ALL_SCENES_MASK,),
+    success_distance: float = 0.2,
+    max_episode_steps: int = 500,
+    num_workers: int = 1,
+) -> int:
+    r"""Computes the shortest path trajectories of the episodes of the
+    dataset of a config and saves them in a store, one scene per process.
+
+    :return: the number of trajectories written.
+    """
+    import habitat
+    from habitat.datasets import make_dataset
+
+    config = habitat.get_config(config_path)
+    with habitat.config.read_write(config):
+        config.habitat.dataset.content_scenes = list(content_scenes)
+    dataset = make_dataset(
+        config.habitat.dataset.type, config=config.habitat.dataset
+    )
+    tasks = [
+        (
+            config_path,
+            scene_id,
+            dataset.get_scene_episodes(scene_id),
+            success_distance,
+            max_episode_steps,
+        )
+        for scene_id in dataset.scene_ids
+    ]
+
+    trajectories: List[Tuple[str, List[ShortestPathPoint]]] = []
+    if num_workers > 1:
+        # Each process loads its own simulator
+        with mp.get_context("forkserver").Pool(
+            num_workers, maxtasksperchild=1
+        ) as pool:
+            for scene_trajectories in pool.imap_unordered(
+                _compute_scene_trajectories, tasks
+            ):
+                trajectories.extend(scene_trajectories)
+    else:
+        for task in tasks:
+            trajectories.extend(_compute_scene_trajectories(task))
+
+    return save_trajectories(
+        output_path, sorted(trajectories, key=lambda t: t[0])
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompute the shortest path trajectories of the"
+        " episodes of a dataset"
+    )
+    parser.add_argument("--config", required=True, help="habitat config")
+    parser.add_argument(
+        "--output", required=True, help="trajectory store file"
+    )
+    parser.add_argument(
+        "--content-scenes",
+        nargs="+",
+        default=[ALL_SCENES_MASK],
+        help="scenes to process, all of them by default",
+    )
+    parser.add_argument("--success-distance", type=float, default=0.2)
+    parser.add_argument("--max-episode-steps", type=int, default=500)
+    parser.add_argument("--num-workers", type=int, default=1)
+    args = parser.parse_args()
+    num_trajectories = build_trajectory_store(
+        args.config,
+        args.output,
+        args.content_scenes,
+        args.success_distance,
+        args.max_episode_steps,
+        args.num_workers,
+    )
+    print(f"Wrote {num_trajectories} trajectories to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
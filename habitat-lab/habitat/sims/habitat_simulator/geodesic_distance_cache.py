@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class GeodesicDistanceCache:
+    r"""LRU cache of the geodesic distances computed in a scene.
+
+    Distances are keyed on the goal positions and on the start position
+    quantized to a grid of :p:`grid_size` meters, so that an agent moving
+    around in a cell reuses the distance computed from whichever start
+    first filled the cell. The returned distances are therefore approximate,
+    off by the geodesic distance between the two starts: at most the cell
+    diagonal, :py:`sqrt(3) * grid_size`, when they are connected within the
+    cell, more when an obstacle separates them.
+
+    The cache holds distances of a single navmesh and must be cleared when
+    the scene changes or its navmesh is loaded or recomputed.
+    """
+
+    def __init__(self, max_size: int, grid_size: float) -> None:
+        r"""..
+
+        :param max_size: maximum number of cached distances, the least
+            recently used ones are evicted first.
+        :param grid_size: size of the cells the start positions are
+            quantized to, in meters.
+        """
+        assert max_size > 0, "The cache size must be positive"
+        assert grid_size > 0, "The grid size must be positive"
+        self._max_size = max_size
+        self._grid_size = grid_size
+        self._distances: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(
+        self,
+        start: Union[Sequence[float], np.ndarray],
+        ends: np.ndarray,
+    ) -> Tuple[bytes, Tuple[int, ...]]:
+        cell = np.floor(np.asarray(start, dtype=np.float64) / self._grid_size)
+        return ends.tobytes(), tuple(cell.astype(np.int64).tolist())
+
+    def get_distance(
+        self,
+        start: Union[Sequence[float], np.ndarray],
+        ends: np.ndarray,
+        compute_distance: Callable[[], float],
+    ) -> float:
+        r"""Returns the cached distance from the cell of :p:`start` to
+        :p:`ends`, calling :p:`compute_distance` on a miss.
+
+        :param start: start position.
+        :param ends: array of the goal positions.
+        :param compute_distance: computes the distance from :p:`start`.
+        """
+        key = self._key(start, ends)
+        distance = self._distances.get(key)
+        if distance is not None:
+            self._hits += 1
+            self._distances.move_to_end(key)
+            return distance
+
+        self._misses += 1
+        distance = compute_distance()
+        self._distances[key] = distance
+        if len(self._distances) > self._max_size:
+            self._distances.popitem(last=False)
+        return distance
+
+    def clear(self) -> None:
+        r"""Removes the cached distances, the statistics are kept."""
+        self._distances.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        r"""Returns the number of hits and misses, the hit rate and the
+        number of cached distances.
+        """
+        num_queries = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / num_queries if num_queries > 0 else 0.0,
+            "size": len(self._distances),
+        }
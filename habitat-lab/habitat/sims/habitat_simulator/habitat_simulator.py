@@ -39,6 +39,9 @@ from habitat.core.simulator import (
     VisualObservation,
 )
 from habitat.core.spaces import Space
+from habitat.sims.habitat_simulator.geodesic_distance_cache import (
+    GeodesicDistanceCache,
+)
 
 if TYPE_CHECKING:
     from torch import Tensor
@@ -300,6 +303,15 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
             )
         )
         self._prev_sim_obs: Optional[Observations] = None
+        # Incremented when the navmesh of the current scene changes, for the
+        # caches of what is computed from the navmesh.
+        self.navmesh_version = 0
+        self.geodesic_distance_cache: Optional[GeodesicDistanceCache] = None
+        if self.habitat_config.geodesic_distance_cache_size > 0:
+            self.geodesic_distance_cache = GeodesicDistanceCache(
+                self.habitat_config.geodesic_distance_cache_size,
+                self.habitat_config.geodesic_distance_cache_grid_size,
+            )
 
     def create_sim_config(
         self, _sensor_suite: SensorSuite
@@ -452,6 +464,7 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         self.sim_config = self.create_sim_config(self._sensor_suite)
         if not is_same_scene:
             self._current_scene = habitat_config.scene
+            self.clear_geodesic_distance_cache()
             if should_close_on_new_scene:
                 self.close(destroy=False)
             super().reconfigure(self.sim_config)
@@ -477,14 +490,33 @@ class HabitatSim(habitat_sim.Simulator, Simulator):
         else:
             path = episode._shortest_path_cache
 
-        path.requested_start = np.array(position_a, dtype=np.float32)
-
-        self.pathfinder.find_path(path)
-
         if episode is not None:
             episode._shortest_path_cache = path
 
-        return path.geodesic_distance
+        def compute_distance() -> float:
+            path.requested_start = np.array(position_a, dtype=np.float32)
+            self.pathfinder.find_path(path)
+            return path.geodesic_distance
+
+        if self.geodesic_distance_cache is None:
+            return compute_distance()
+        return self.geodesic_distance_cache.get_distance(
+            position_a,
+            np.asarray(path.requested_ends, dtype=np.float32),
+            compute_distance,
+        )
+
+    def clear_geodesic_distance_cache(self) -> None:
+        r"""Removes the cached geodesic distances, which must be done when the
+        navmesh changes.
+        """
+        if self.geodesic_distance_cache is not None:
+            self.geodesic_distance_cache.clear()
+
+    def recompute_navmesh(self, *args: Any, **kwargs: Any) -> bool:
+        self.navmesh_version += 1
+        self.clear_geodesic_distance_cache()
+        return super().recompute_navmesh(*args, **kwargs)
 
     def action_space_shortest_path(
         self,
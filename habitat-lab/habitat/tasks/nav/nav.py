@@ -6,7 +6,18 @@
 
 # TODO, lots of typing errors in here
 
-from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
+import os
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import attr
 import numpy as np
@@ -34,6 +45,7 @@ from habitat.core.simulator import (
 from habitat.core.spaces import ActionSpace
 from habitat.core.utils import not_none_validator, try_cv2_import
 from habitat.sims.habitat_simulator.actions import HabitatSimActions
+from habitat.tasks.nav.view_point_distance_grid import ViewPointDistanceGrid
 from habitat.tasks.utils import cartesian_to_polar
 from habitat.utils.geometry_utils import (
     quaternion_from_coeff,
@@ -706,17 +718,44 @@ class TopDownMap(Measure):
         self.point_padding = 2 * int(
             np.ceil(self._map_resolution / MAP_THICKNESS_SCALAR)
         )
+        # Maps of the recent (scene, navmesh, floor), copied on reset instead
+        # of being computed again.
+        self._map_cache: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
         super().__init__()
 
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return "top_down_map"
 
+    def _get_cached_map(self, key: Hashable) -> Optional[np.ndarray]:
+        top_down_map = self._map_cache.get(key)
+        if top_down_map is None:
+            return None
+        self._map_cache.move_to_end(key)
+        return top_down_map.copy()
+
+    def _cache_map(self, key: Hashable, top_down_map: np.ndarray) -> None:
+        if self._config.map_cache_size <= 0:
+            return
+        self._map_cache[key] = top_down_map.copy()
+        while len(self._map_cache) > self._config.map_cache_size:
+            self._map_cache.popitem(last=False)
+
     def get_original_map(self):
-        top_down_map = maps.get_topdown_map_from_sim(
-            self._sim,
-            map_resolution=self._map_resolution,
-            draw_border=self._config.draw_border,
+        key = (
+            self._sim.habitat_config.scene,
+            self._sim.navmesh_version,
+            float(self._sim.get_agent(0).state.position[1]),
+            self._map_resolution,
+            self._config.draw_border,
         )
+        top_down_map = self._get_cached_map(key)
+        if top_down_map is None:
+            top_down_map = maps.get_topdown_map_from_sim(
+                self._sim,
+                map_resolution=self._map_resolution,
+                draw_border=self._config.draw_border,
+            )
+            self._cache_map(key, top_down_map)
 
         if self._config.fog_of_war.draw:
             self._fog_of_war_mask = np.zeros_like(top_down_map)
@@ -876,6 +915,7 @@ class TopDownMap(Measure):
             agent_state = self._sim.get_agent_state(agent_index)
             map_positions.append(self.update_map(agent_state, agent_index))
             map_angles.append(TopDownMap.get_polar_angle(agent_state))
+        self.update_fog_of_war_mask(np.array(map_positions), map_angles)
         self._metric = {
             "map": self._top_down_map,
             "fog_of_war_mask": self._fog_of_war_mask,
@@ -916,25 +956,28 @@ class TopDownMap(Measure):
                     color,
                     thickness=thickness,
                 )
-        angle = TopDownMap.get_polar_angle(agent_state)
-        self.update_fog_of_war_mask(np.array([a_x, a_y]), angle)
-
         self._previous_xy_location[agent_index] = (a_y, a_x)
         return a_x, a_y
 
     def update_fog_of_war_mask(self, agent_position, angle):
+        r"""Reveals the fog-of-war from the map position(s) of the agent(s),
+        all the agents being handled in a single batched pass.
+        """
         if self._config.fog_of_war.draw:
-            self._fog_of_war_mask = fog_of_war.reveal_fog_of_war(
-                self._top_down_map,
-                self._fog_of_war_mask,
-                agent_position,
-                angle,
+            fog_of_war_mask = self._fog_of_war_mask.copy()
+            fog_of_war.reveal_fog_of_war_batch(
+                [self._top_down_map],
+                [fog_of_war_mask],
+                np.reshape(agent_position, (-1, 2)),
+                np.reshape(angle, -1),
+                map_indices=np.zeros(np.size(angle), dtype=np.int64),
                 fov=self._config.fog_of_war.fov,
                 max_line_len=self._config.fog_of_war.visibility_dist
                 / maps.calculate_meters_per_pixel(
                     self._map_resolution, sim=self._sim
                 ),
             )
+            self._fog_of_war_mask = fog_of_war_mask
 
 
 @registry.register_measure
@@ -953,12 +996,29 @@ class DistanceToGoal(Measure):
             List[Tuple[float, float, float]]
         ] = None
         self._distance_to = self._config.distance_to
+        self._distance_grid_scene: Optional[str] = None
+        self._distance_grid: Optional[ViewPointDistanceGrid] = None
 
         super().__init__(**kwargs)
 
     def _get_uuid(self, *args: Any, **kwargs: Any) -> str:
         return self.cls_uuid
 
+    def _load_distance_grid(self, episode) -> None:
+        scene = Dataset.scene_from_scene_path(episode.scene_id)
+        if scene == self._distance_grid_scene:
+            return
+        self._distance_grid_scene = scene
+        path = self._config.view_point_distance_grids_path.format(scene=scene)
+        if os.path.exists(path):
+            self._distance_grid = ViewPointDistanceGrid.load(path)
+        else:
+            logger.warning(
+                f"No view point distance grids at {path}, distances are"
+                " computed with the pathfinder"
+            )
+            self._distance_grid = None
+
     def reset_metric(self, episode, *args: Any, **kwargs: Any):
         self._previous_position = None
         if self._distance_to == "VIEW_POINTS":
@@ -967,6 +1027,8 @@ class DistanceToGoal(Measure):
                 for goal in episode.goals
                 for view_point in goal.view_points
             ]
+            if self._config.view_point_distance_grids_path:
+                self._load_distance_grid(episode)
         self.update_metric(episode=episode, *args, **kwargs)  # type: ignore
 
     def update_metric(
@@ -984,9 +1046,15 @@ class DistanceToGoal(Measure):
                     episode,
                 )
             elif self._distance_to == "VIEW_POINTS":
-                distance_to_target = self._sim.geodesic_distance(
-                    current_position, self._episode_view_points, episode
-                )
+                distance_to_target = None
+                if self._distance_grid is not None:
+                    distance_to_target = self._distance_grid.get_distance(
+                        current_position, episode.object_category
+                    )
+                if distance_to_target is None:
+                    distance_to_target = self._sim.geodesic_distance(
+                        current_position, self._episode_view_points, episode
+                    )
             else:
                 logger.error(
                     f"Non valid distance_to parameter was provided: {self._distance_to }"
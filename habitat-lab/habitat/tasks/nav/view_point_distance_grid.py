@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+r"""Precomputed distances to the view points of the ObjectNav goals.
+
+A :ref:`ViewPointDistanceGrid` holds, for each object category of a scene,
+the geodesic distance from the cells of a grid laid over each floor of the
+navmesh to the nearest view point of the objects of that category. The
+distances are stored as :py:`uint16` in units of ``distance_resolution``
+meters, which makes :ref:`habitat.tasks.nav.nav.DistanceToGoal` a lookup
+instead of a path search to hundreds of view points.
+
+The grids are computed offline with
+``habitat/datasets/object_nav/create_view_point_distance_grids.py``, by one
+multi-source Dijkstra search per floor over the navigable cells, connected
+to their 16 nearest neighbours. Paths on such a grid are at most 2.8%
+longer than straight lines and the lookups go through the center of a
+neighbouring cell, so the distances over-estimate the geodesic distances by
+at most 2.8% plus half a cell, and around obstacles by the detour through
+the centers of the navigable cells at their corners. Within 2 cells of a
+view point, the distance is the straight line to it, so that the success
+distance of ObjectNav is not affected by the size of the cells.
+"""
+
+import math
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from habitat.core.simulator import Simulator
+
+# Distance of the cells that are not navigable or cannot reach a view point.
+UNREACHABLE_DISTANCE = np.iinfo(np.uint16).max
+# (row, col) offsets of the neighbours of a cell, half of the 16 nearest ones
+# since the edges go both ways, and of the other cells the straight line to
+# them goes through.
+_NEIGHBOUR_OFFSETS = {
+    (0, 1): (),
+    (1, 0): (),
+    (1, 1): ((0, 1), (1, 0)),
+    (1, -1): ((0, -1), (1, 0)),
+    (1, 2): ((0, 1), (1, 1)),
+    (2, 1): ((1, 0), (1, 1)),
+    (2, -1): ((1, 0), (1, -1)),
+    (1, -2): ((0, -1), (1, -1)),
+}
+# Distance to a view point under which the straight line to it is used, in
+# cells.
+_VIEW_POINT_RADIUS = 2.0
+
+
+def get_floor_heights(
+    heights: Sequence[float], min_floor_separation: float = 1.0
+) -> List[float]:
+    r"""Groups heights, like the start positions of the episodes of a scene,
+    in floors.
+
+    :param heights: heights of navigable positions.
+    :param min_floor_separation: minimum difference of height between two
+        floors.
+    :return: the lowest height of each floor, in increasing order.
+    """
+    floor_heights: List[float] = []
+    for height in sorted(heights):
+        if (
+            len(floor_heights) == 0
+            or height - floor_heights[-1] >= min_floor_separation
+        ):
+            floor_heights.append(float(height))
+    return floor_heights
+
+
+class ViewPointDistanceGrid:
+    r"""Per-category grids of distances to the nearest goal view point of a
+    scene.
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[str],
+        distances: np.ndarray,
+        origin: Sequence[float],
+        cell_size: float,
+        floor_heights: Sequence[float],
+        distance_resolution: float,
+        max_floor_offset: float = 0.5,
+        view_points: Optional[np.ndarray] = None,
+        view_point_categories: Optional[np.ndarray] = None,
+    ) -> None:
+        r"""..
+
+        :param categories: object categories of the grids.
+        :param distances: :py:`uint16` array of shape
+            ``(len(categories), len(floor_heights), height, width)``, indexed
+            by ``(category, floor, z cell, x cell)``. The distances are from
+            the centers of the cells.
+        :param origin: ``(x, z)`` corner of the first cell.
+        :param cell_size: size of the cells in meters.
+        :param floor_heights: height of each floor.
+        :param distance_resolution: meters per unit of :p:`distances`.
+        :param max_floor_offset: maximum difference of height between a
+            position and the floor it is looked up in.
+        :param view_points: ``(n, 3)`` array of the view points, to measure
+            the distances close to them exactly.
+        :param view_point_categories: index in :p:`categories` of each view
+            point.
+        """
+        assert distances.dtype == np.uint16
+        assert distances.shape[:2] == (len(categories), len(floor_heights))
+        self.categories = list(categories)
+        self._category_indices = {
+            category: i for i, category in enumerate(self.categories)
+        }
+        self.distances = distances
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.floor_heights = np.asarray(floor_heights, dtype=np.float64)
+        self.distance_resolution = float(distance_resolution)
+        self.max_floor_offset = max_floor_offset
+        if view_points is None:
+            view_points = np.zeros((0, 3))
+            view_point_categories = np.zeros((0,), dtype=np.int64)
+        self.view_points = np.asarray(view_points, dtype=np.float64)
+        self.view_point_categories = np.asarray(
+            view_point_categories, dtype=np.int64
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ViewPointDistanceGrid":
+        with np.load(path) as data:
+            return cls(
+                categories=data["categories"].tolist(),
+                distances=data["distances"],
+                origin=data["origin"],
+                cell_size=float(data["cell_size"]),
+                floor_heights=data["floor_heights"],
+                distance_resolution=float(data["distance_resolution"]),
+                view_points=data.get("view_points"),
+                view_point_categories=data.get("view_point_categories"),
+            )
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            categories=np.array(self.categories),
+            distances=self.distances,
+            origin=self.origin,
+            cell_size=self.cell_size,
+            floor_heights=self.floor_heights,
+            distance_resolution=self.distance_resolution,
+            view_points=self.view_points,
+            view_point_categories=self.view_point_categories,
+        )
+
+    def get_distance(
+        self,
+        position: Union[Sequence[float], np.ndarray],
+        category: str,
+    ) -> Optional[float]:
+        r"""Returns the distance from :p:`position` to the nearest view point
+        of :p:`category`, or :py:`None` if the grids do not have it: unknown
+        category, position off the grids or in a cell that is not navigable.
+
+        The distance is the shortest of the straight lines to the view points
+        closer than 2 cells and of the distances through the centers of
+        the neighbouring cells.
+        """
+        category_index = self._category_indices.get(category)
+        if category_index is None or len(self.floor_heights) == 0:
+            return None
+
+        floor_offsets = np.abs(self.floor_heights - position[1])
+        floor = int(np.argmin(floor_offsets))
+        if floor_offsets[floor] > self.max_floor_offset:
+            return None
+
+        col = math.floor((position[0] - self.origin[0]) / self.cell_size)
+        row = math.floor((position[2] - self.origin[1]) / self.cell_size)
+        grid = self.distances[category_index, floor]
+        if not (0 <= row < grid.shape[0] and 0 <= col < grid.shape[1]):
+            return None
+        if grid[row, col] == UNREACHABLE_DISTANCE:
+            return None
+
+        # Go through the center of the cell of the position or of one of
+        # its neighbours
+        rows = slice(max(row - 1, 0), row + 2)
+        cols = slice(max(col - 1, 0), col + 2)
+        neighbours = grid[rows, cols].astype(np.float64)
+        neighbours[neighbours == UNREACHABLE_DISTANCE] = np.inf
+        center_x = (
+            self.origin[0]
+            + (np.arange(grid.shape[1])[cols] + 0.5) * self.cell_size
+        )
+        center_z = (
+            self.origin[1]
+            + (np.arange(grid.shape[0])[rows] + 0.5) * self.cell_size
+        )
+        offsets = np.hypot(
+            center_x[None, :] - position[0], center_z[:, None] - position[2]
+        )
+        distance = float(
+            np.min(neighbours * self.distance_resolution + offsets)
+        )
+
+        # Straight line to the closest view points
+        view_points = self.view_points[
+            self.view_point_categories == category_index
+        ]
+        if len(view_points) > 0:
+            view_point_distances = np.linalg.norm(
+                view_points - np.asarray(position, dtype=np.float64), axis=1
+            )
+            view_point_distances = view_point_distances[
+                view_point_distances < _VIEW_POINT_RADIUS * self.cell_size
+            ]
+            if len(view_point_distances) > 0:
+                distance = min(distance, float(view_point_distances.min()))
+        return distance
+
+
+def _get_navigable_cells(
+    sim: "Simulator",
+    origin: Tuple[float, float],
+    floor_height: float,
+    shape: Tuple[int, int],
+    cell_size: float,
+) -> np.ndarray:
+    navigable = np.zeros(shape, dtype=bool)
+    for row in range(shape[0]):
+        for col in range(shape[1]):
+            navigable[row, col] = sim.is_navigable(
+                [
+                    origin[0] + (col + 0.5) * cell_size,
+                    floor_height,
+                    origin[1] + (row + 0.5) * cell_size,
+                ]
+            )
+    return navigable
+
+
+def _get_grid_edges(navigable: np.ndarray) -> Tuple[np.ndarray, ...]:
+    r"""Returns the start cells, end cells and lengths in cells of the edges
+    between the navigable cells. An edge needs the cells it crosses to be
+    navigable too.
+    """
+    height, width = navigable.shape
+    cell_indices = np.arange(height * width).reshape(height, width)
+    starts, ends, lengths = [], [], []
+    for (d_row, d_col), crossed in _NEIGHBOUR_OFFSETS.items():
+        rows = slice(0, height - d_row)
+        cols = slice(max(-d_col, 0), width - max(d_col, 0))
+        valid = navigable[rows, cols].copy()
+        for c_row, c_col in ((d_row, d_col), *crossed):
+            valid &= navigable[
+                c_row : height - d_row + c_row,
+                cols.start + c_col : cols.stop + c_col,
+            ]
+        starts.append(cell_indices[rows, cols][valid])
+        ends.append(
+            cell_indices[
+                d_row:height,
+                cols.start + d_col : cols.stop + d_col,
+            ][valid]
+        )
+        lengths.append(np.full(int(valid.sum()), math.hypot(d_row, d_col)))
+    return (
+        np.concatenate(starts),
+        np.concatenate(ends),
+        np.concatenate(lengths),
+    )
+
+
+def compute_view_point_distance_grid(
+    sim: "Simulator",
+    view_points_by_category: Dict[str, Sequence[Sequence[float]]],
+    floor_heights: Sequence[float],
+    cell_size: float = 0.1,
+    distance_resolution: float = 0.01,
+    max_floor_offset: float = 0.5,
+) -> ViewPointDistanceGrid:
+    r"""Computes the grids of a scene with one Dijkstra search per floor from
+    the view points of all the categories over the navigable cells.
+
+    The cells must be smaller than the non-navigable margin around the
+    obstacles of the navmesh, the default 10cm are, so that two neighbouring
+    navigable cells are connected.
+
+    :param sim: simulator with the scene loaded.
+    :param view_points_by_category: positions of the view points of the
+        goals of each object category in the scene.
+    :param floor_heights: height of the navmesh on each floor, see
+        :ref:`get_floor_heights`.
+    :param cell_size: size of the cells in meters.
+    :param distance_resolution: meters per unit of the stored distances.
+    :param max_floor_offset: maximum difference of height between a view
+        point and its floor.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    lower_bound, upper_bound = sim.pathfinder.get_bounds()
+    origin = (float(lower_bound[0]), float(lower_bound[2]))
+    width = max(
+        int(math.ceil((upper_bound[0] - lower_bound[0]) / cell_size)), 1
+    )
+    height = max(
+        int(math.ceil((upper_bound[2] - lower_bound[2]) / cell_size)), 1
+    )
+    categories = sorted(view_points_by_category.keys())
+    distances = np.full(
+        (len(categories), len(floor_heights), height, width),
+        UNREACHABLE_DISTANCE,
+        dtype=np.uint16,
+    )
+    num_cells = height * width
+    center_x = origin[0] + (np.arange(width) + 0.5) * cell_size
+    center_z = origin[1] + (np.arange(height) + 0.5) * cell_size
+
+    all_view_points = []
+    view_point_categories = []
+    for category_index, category in enumerate(categories):
+        for view_point in view_points_by_category[category]:
+            all_view_points.append(view_point)
+            view_point_categories.append(category_index)
+    view_points = np.array(all_view_points, dtype=np.float64).reshape(-1, 3)
+
+    for floor, floor_height in enumerate(floor_heights):
+        navigable = _get_navigable_cells(
+            sim, origin, floor_height, (height, width), cell_size
+        )
+        starts, ends, lengths = _get_grid_edges(navigable)
+        lengths = lengths * cell_size
+
+        # One source node per category, after the cells, linked to the
+        # navigable cells close to its view points on this floor by the
+        # straight line to their center.
+        source_starts, source_ends, source_lengths = [], [], []
+        for view_point, category_index in zip(
+            view_points, view_point_categories
+        ):
+            if abs(view_point[1] - floor_height) > max_floor_offset:
+                continue
+            offsets = np.hypot(
+                center_x[None, :] - view_point[0],
+                center_z[:, None] - view_point[2],
+            )
+            close = navigable & (offsets < _VIEW_POINT_RADIUS * cell_size)
+            source_starts.append(
+                np.full(int(close.sum()), num_cells + category_index)
+            )
+            source_ends.append(np.flatnonzero(close))
+            source_lengths.append(offsets[close])
+        if len(source_starts) == 0:
+            continue
+        source_starts = np.concatenate(source_starts)
+        source_ends = np.concatenate(source_ends)
+        source_lengths = np.concatenate(source_lengths)
+
+        graph = coo_matrix(
+            (
+                np.concatenate([lengths, lengths, source_lengths]),
+                (
+                    np.concatenate([starts, ends, source_starts]),
+                    np.concatenate([ends, starts, source_ends]),
+                ),
+            ),
+            shape=(num_cells + len(categories), num_cells + len(categories)),
+        ).tocsr()
+        floor_distances = dijkstra(
+            graph,
+            directed=True,
+            indices=num_cells + np.arange(len(categories)),
+        )[:, :num_cells]
+        reachable = np.isfinite(floor_distances)
+        floor_distances = np.minimum(
+            np.round(
+                np.where(reachable, floor_distances, 0) / distance_resolution
+            ),
+            UNREACHABLE_DISTANCE - 1,
+        ).astype(np.uint16)
+        floor_distances[~reachable] = UNREACHABLE_DISTANCE
+        distances[:, floor] = floor_distances.reshape(
+            len(categories), height, width
+        )
+
+    return ViewPointDistanceGrid(
+        categories=categories,
+        distances=distances,
+        origin=origin,
+        cell_size=cell_size,
+        floor_heights=floor_heights,
+        distance_resolution=distance_resolution,
+        max_floor_offset=max_floor_offset,
+        view_points=view_points,
+        view_point_categories=np.array(view_point_categories, dtype=np.int64),
+    )
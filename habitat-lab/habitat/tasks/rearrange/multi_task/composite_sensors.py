@@ -49,8 +49,9 @@ class GlobalPredicatesSensor(Sensor):
         )
 
     def get_observation(self, observations, episode, *args, **kwargs):
-        sim_info = self._task.pddl_problem.sim_info
-        truth_values = [p.is_true(sim_info) for p in self.predicates_list]
+        truth_values = self._task.pddl_problem.are_predicates_true(
+            self.predicates_list
+        )
         return np.array(truth_values, dtype=np.float32)
 
 
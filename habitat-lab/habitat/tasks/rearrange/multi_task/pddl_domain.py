@@ -6,7 +6,17 @@
 
 import itertools
 import os.path as osp
-from typing import TYPE_CHECKING, Dict, List, Optional, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 import yaml  # type: ignore[import]
 
@@ -60,6 +70,15 @@ class PddlDomain:
         self._sim_info: Optional[PddlSimInfo] = None
         self._config = cur_task_config
 
+        # Predicates and actions grounded over all the entities, built on
+        # first use.
+        self._grounded_predicates: Optional[List[Predicate]] = None
+        self._possible_predicates: Optional[List[Predicate]] = None
+        self._grounded_actions: Dict[
+            str, List[Tuple[Tuple[PddlEntity, ...], PddlAction]]
+        ] = {}
+        self._reset_truth_cache()
+
         if not osp.isabs(domain_file_path):
             parent_dir = osp.dirname(__file__)
             domain_file_path = osp.join(
@@ -318,6 +337,7 @@ class PddlDomain:
         # Ensure that all objects are accounted for.
         for entity in self.all_entities.values():
             self._sim_info.search_for_entity_any(entity)
+        self._reset_truth_cache()
 
     @property
     def sim_info(self) -> PddlSimInfo:
@@ -345,48 +365,129 @@ class PddlDomain:
 
         return expr.is_true(self.sim_info)
 
-    def get_true_predicates(self) -> List[Predicate]:
+    def _reset_truth_cache(self) -> None:
+        self._state_step = 0
+        # Last simulator state of each entity and step it changed at.
+        self._entity_states: Dict[str, Tuple[Any, ...]] = {}
+        self._entity_changed_at: Dict[str, int] = {}
+        # Maps the id of a predicate to the predicate, the names of the
+        # entities it depends on, the step it was evaluated at and its value.
+        self._truth_values: Dict[
+            int, Tuple[Predicate, List[str], int, bool]
+        ] = {}
+
+    def are_predicates_true(self, preds: Sequence[Predicate]) -> List[bool]:
+        """
+        Get the truth value of each predicate in the current simulator state.
+        A predicate is only evaluated again if the simulator state of one of
+        its entities changed since its last evaluation. This is meant for
+        predicates that are checked repeatedly, like the ones returned by
+        `get_possible_predicates`.
+        """
+
+        sim_info = self.sim_info
+        self._state_step += 1
+        step = self._state_step
+        for entity in self.all_entities.values():
+            state = sim_info.get_entity_state(entity)
+            if self._entity_states.get(entity.name) != state:
+                self._entity_states[entity.name] = state
+                self._entity_changed_at[entity.name] = step
+
+        truth_values = []
+        for pred in preds:
+            cached = self._truth_values.get(id(pred))
+            if cached is not None and cached[0] is pred:
+                _, entity_names, evaluated_at, is_true = cached
+                if all(
+                    self._entity_changed_at.get(name, step) <= evaluated_at
+                    for name in entity_names
+                ):
+                    truth_values.append(is_true)
+                    continue
+            else:
+                entity_names = [e.name for e in pred.get_entities()]
+
+            is_true = pred.is_true(sim_info)
+            self._truth_values[id(pred)] = (pred, entity_names, step, is_true)
+            truth_values.append(is_true)
+        return truth_values
+
+    def _get_grounded_predicates(self) -> List[Predicate]:
         """
-        Get all the predicates that are true in the current simulator state.
+        All the predicates with arguments compatible with the entities.
         """
 
-        all_entities = self.all_entities.values()
-        true_preds: List[Predicate] = []
-        for pred in self.predicates.values():
-            for entity_input in itertools.combinations(
-                all_entities, pred.n_args
-            ):
-                if not pred.are_args_compatible(entity_input):
-                    continue
+        if self._grounded_predicates is None:
+            all_entities = self.all_entities.values()
+            self._grounded_predicates = []
+            for pred in self.predicates.values():
+                for entity_input in itertools.combinations(
+                    all_entities, pred.n_args
+                ):
+                    if not pred.are_args_compatible(entity_input):
+                        continue
 
-                use_pred = pred.clone()
-                use_pred.set_param_values(entity_input)
+                    use_pred = pred.clone()
+                    use_pred.set_param_values(entity_input)
+                    self._grounded_predicates.append(use_pred)
+        return self._grounded_predicates
 
-                if use_pred.is_true(self.sim_info):
-                    true_preds.append(use_pred)
-        return true_preds
+    def get_true_predicates(self) -> List[Predicate]:
+        """
+        Get all the predicates that are true in the current simulator state.
+        The returned predicates are shared between calls and must not be
+        modified.
+        """
+
+        grounded_predicates = self._get_grounded_predicates()
+        return [
+            pred
+            for pred, is_true in zip(
+                grounded_predicates,
+                self.are_predicates_true(grounded_predicates),
+            )
+            if is_true
+        ]
 
     def get_possible_predicates(self) -> List[Predicate]:
         """
         Get all predicates that COULD be true. This is independent of the
         simulator state and is the set of compatible predicate and entity
-        arguments.
+        arguments. The returned predicates are shared between calls and must
+        not be modified.
+        """
+
+        if self._possible_predicates is None:
+            self._possible_predicates = [
+                pred
+                for pred in self._get_grounded_predicates()
+                if pred.are_types_compatible(self.expr_types)
+            ]
+        return list(self._possible_predicates)
+
+    def _get_grounded_actions(
+        self, action: PddlAction
+    ) -> List[Tuple[Tuple[PddlEntity, ...], PddlAction]]:
+        """
+        All the groundings of `action` with compatible entities, with the
+        combination of entities each grounding is a permutation of.
         """
 
-        all_entities = self.all_entities.values()
-        poss_preds: List[Predicate] = []
-        for pred in self.predicates.values():
+        if action.name not in self._grounded_actions:
+            grounded_actions = []
             for entity_input in itertools.combinations(
-                all_entities, pred.n_args
+                list(self.all_entities.values()), action.n_args
             ):
-                if not pred.are_args_compatible(entity_input):
-                    continue
-
-                use_pred = pred.clone()
-                use_pred.set_param_values(entity_input)
-                if use_pred.are_types_compatible(self.expr_types):
-                    poss_preds.append(use_pred)
-        return poss_preds
+                for entity_input_perm in itertools.permutations(entity_input):
+                    entity_inputs = cast(List[PddlEntity], entity_input_perm)
+                    if not action.are_args_compatible(entity_inputs):
+                        continue
+                    new_action = action.clone()
+                    new_action.set_param_values(entity_inputs)
+                    grounded_actions.append((entity_input, new_action))
+            self._grounded_actions[action.name] = grounded_actions
+        return self._grounded_actions[action.name]
 
     def get_possible_actions(
         self,
@@ -396,7 +497,8 @@ class PddlDomain:
         true_preds: Optional[List[Predicate]] = None,
     ) -> List[PddlAction]:
         """
-        Get all actions that can be applied.
+        Get all actions that can be applied. The returned actions are shared
+        between calls and must not be modified.
         :param filter_entities: ONLY actions with entities that contain all
             entities in `filter_entities` are allowed.
         :param allowed_action_names: ONLY action names allowed.
@@ -407,7 +509,6 @@ class PddlDomain:
         if restricted_action_names is None:
             restricted_action_names = []
 
-        all_entities = list(self.all_entities.values())
         matching_actions = []
         for action in self.actions.values():
             if (
@@ -419,9 +520,7 @@ class PddlDomain:
             if action.name in restricted_action_names:
                 continue
 
-            for entity_input in itertools.combinations(
-                all_entities, action.n_args
-            ):
+            for entity_input, new_action in self._get_grounded_actions(action):
                 # Check that all the filter_entities are in entity_input
                 matches_filter = all(
                     filter_entity in entity_input
@@ -429,21 +528,14 @@ class PddlDomain:
                 )
                 if not matches_filter:
                     continue
-
-                for entity_input_perm in itertools.permutations(entity_input):
-                    entity_inputs = cast(List[PddlEntity], entity_input_perm)
-                    if not action.are_args_compatible(entity_inputs):
-                        continue
-                    new_action = action.clone()
-                    new_action.set_param_values(entity_inputs)
-                    if (
-                        true_preds is not None
-                        and not new_action.is_precond_satisfied_from_predicates(
-                            true_preds
-                        )
-                    ):
-                        continue
-                    matching_actions.append(new_action)
+                if (
+                    true_preds is not None
+                    and not new_action.is_precond_satisfied_from_predicates(
+                        true_preds
+                    )
+                ):
+                    continue
+                matching_actions.append(new_action)
         return matching_actions
 
     @property
@@ -82,6 +82,14 @@ class Predicate:
         self._pddl_sim_state.sub_in(sub_dict)
         return self
 
+    def get_entities(self) -> List[PddlEntity]:
+        """
+        The entities whose simulator state the truth value depends on.
+        """
+        if self._pddl_sim_state is None:
+            return []
+        return self._pddl_sim_state.get_entities()
+
     def is_true(self, sim_info: PddlSimInfo) -> bool:
         return self._pddl_sim_state.is_true(sim_info)
 
@@ -5,7 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, cast
+from typing import Any, Dict, List, Optional, cast
 
 import magnum as mn
 import numpy as np
@@ -194,6 +194,19 @@ class PddlSimState:
         }
         return self
 
+    def get_entities(self) -> List[PddlEntity]:
+        """
+        The entities whose simulator state the truth value depends on.
+        """
+        entities = [*self._obj_states.keys(), *self._obj_states.values()]
+        entities.extend(self._art_states.keys())
+        for robot_entity, robot_state in self._robot_states.items():
+            entities.append(robot_entity)
+            for entity in (robot_state.holding, robot_state.pos):
+                if isinstance(entity, PddlEntity):
+                    entities.append(entity)
+        return entities
+
     def _is_object_inside(
         self, entity: PddlEntity, target: PddlEntity, sim_info: PddlSimInfo
     ) -> bool:
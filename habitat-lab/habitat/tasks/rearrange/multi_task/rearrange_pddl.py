@@ -170,6 +170,30 @@ class PddlSimInfo:
         else:
             raise ValueError()
 
+    def get_entity_state(self, entity: PddlEntity) -> Tuple[Any, ...]:
+        """
+        Snapshot of the simulator state of an entity that the truth values of
+        the predicates on it depend on: the position of the entity, the joint
+        state of articulated objects and the grasped object of robots. If the
+        snapshot did not change, the predicates on the entity did not either.
+        """
+        ename = entity.name
+        if self.check_type_matches(entity, articulated_agent_type):
+            agent_data = self.sim.get_agent_data(self.robot_ids[ename])
+            return (
+                *np.asarray(agent_data.articulated_agent.base_pos).tolist(),
+                agent_data.grasp_mgr.snap_idx,
+            )
+        elif self.check_type_matches(entity, ART_OBJ_TYPE):
+            marker_info = self.marker_handles[ename]
+            return (
+                *np.asarray(marker_info.get_targ_js()).reshape(-1).tolist(),
+                *np.asarray(
+                    marker_info.link_node.transformation.translation
+                ).tolist(),
+            )
+        return tuple(np.asarray(self.get_entity_pos(entity)).tolist())
+
     def search_for_entity_any(self, entity: PddlEntity):
         ename = entity.name
         if self.check_type_matches(entity, articulated_agent_type):
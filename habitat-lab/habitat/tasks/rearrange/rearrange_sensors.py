@@ -429,6 +429,7 @@ class ObjectToGoalDistance(Measure):
     """
 
     cls_uuid: str = "object_to_goal_distance"
+    is_lazy = True
 
     def __init__(self, sim, config, *args, **kwargs):
         self._sim = sim
@@ -38,6 +38,7 @@ from habitat.tasks.rearrange.rearrange_grasp_manager import (
     RearrangeGraspManager,
 )
 from habitat.tasks.rearrange.utils import (
+    ContactIds,
     get_aabb,
     make_render_only,
     rearrange_collision,
@@ -100,6 +101,8 @@ class RearrangeSim(HabitatSim):
         self.viz_ids: Dict[Any, Any] = defaultdict(lambda: None)
         self.ref_handle_to_rigid_obj_id = None
         self._markers: Dict[str, MarkerInfo] = {}
+        # Contact ids of the last collision detection, see `get_contact_ids`.
+        self._contact_ids: Optional[ContactIds] = None
 
         self._viz_templates: Dict[str, Any] = {}
         self._viz_handle_to_template: Dict[str, float] = {}
@@ -214,12 +217,14 @@ class RearrangeSim(HabitatSim):
             m.update()
 
     def reset(self):
+        self._contact_ids = None
         SimulatorBackend.reset(self)
         for i in range(len(self.agents)):
             self.reset_agent(i)
         return None
 
     def reconfigure(self, config: "DictConfig", ep_info: RearrangeEpisode):
+        self._contact_ids = None
         self.instance_handle_to_ref_handle = ep_info.info["object_labels"]
 
         with read_write(config):
@@ -360,6 +365,8 @@ class RearrangeSim(HabitatSim):
 
         navmesh_path = osp.join(base_dir, "navmeshes", scene_name + ".navmesh")
         self.pathfinder.load_nav_mesh(navmesh_path)
+        self.navmesh_version += 1
+        self.clear_geodesic_distance_cache()
 
         self._navmesh_vertices = np.stack(
             self.pathfinder.build_navmesh_vertices(), axis=0
@@ -793,6 +800,26 @@ class RearrangeSim(HabitatSim):
         if self._step_physics:
             self.step_world(dt)
 
+    def step_world(self, dt: float = 1.0 / 60.0) -> None:
+        self._contact_ids = None
+        super().step_world(dt)
+
+    def perform_discrete_collision_detection(self) -> None:
+        self._contact_ids = None
+        super().perform_discrete_collision_detection()
+
+    def get_contact_ids(self) -> ContactIds:
+        """
+        The ids of the contact points of the last physics step or collision
+        detection. They are only converted from the contact points once, the
+        result is shared by everything checking collisions in that step.
+        """
+        if self._contact_ids is None:
+            self._contact_ids = ContactIds.from_contact_points(
+                self.get_physics_contact_points()
+            )
+        return self._contact_ids
+
     def get_targets(self) -> Tuple[np.ndarray, np.ndarray]:
         """Get a mapping of object ids to goal positions for rearrange targets.
 
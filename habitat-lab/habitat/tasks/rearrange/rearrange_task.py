@@ -7,7 +7,7 @@
 import copy
 import os.path as osp
 from collections import OrderedDict
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from gym import spaces
@@ -20,6 +20,7 @@ from habitat.tasks.rearrange.rearrange_sim import RearrangeSim
 from habitat.tasks.rearrange.utils import (
     CacheHelper,
     CollisionDetails,
+    ContactIds,
     UsesArticulatedAgentInterface,
     rearrange_collision,
     rearrange_logger,
@@ -79,6 +80,11 @@ class RearrangeTask(NavigationTask):
         self._episode_id: str = ""
         self._cur_episode_step = 0
         self._should_place_articulated_agent = should_place_articulated_agent
+        # The collision details of each agent, with the contact ids and the
+        # held object they were computed from.
+        self._coll_info_cache: Dict[
+            Optional[int], Tuple[ContactIds, Optional[int], CollisionDetails]
+        ] = {}
 
         data_path = dataset.config.data_path.format(split=dataset.config.split)
         fname = data_path.split("/")[-1].split(".")[0]
@@ -313,9 +319,28 @@ class RearrangeTask(NavigationTask):
         return max_articulated_agent_force, max_obj_force, max_force
 
     def get_cur_collision_info(self, agent_idx) -> CollisionDetails:
+        """
+        The collisions of an agent in the current physics step, only computed
+        once per step.
+        """
+        contact_ids = self._sim.get_contact_ids()
+        snap_idx = self._sim.get_agent_data(agent_idx).grasp_mgr.snap_idx
+        cached = self._coll_info_cache.get(agent_idx)
+        if (
+            cached is not None
+            and cached[0] is contact_ids
+            and cached[1] == snap_idx
+        ):
+            return cached[2]
+
         _, coll_details = rearrange_collision(
             self._sim, self._config.count_obj_collisions, agent_idx=agent_idx
         )
+        self._coll_info_cache[agent_idx] = (
+            contact_ids,
+            snap_idx,
+            coll_details,
+        )
         return coll_details
 
     def get_n_targets(self) -> int:
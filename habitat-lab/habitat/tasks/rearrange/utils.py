@@ -85,6 +85,46 @@ class CollisionDetails:
         )
 
 
+@attr.s(auto_attribs=True, kw_only=True)
+class ContactIds:
+    """
+    The object and link ids of the contact points of a collision detection,
+    as integer arrays with one entry per contact point.
+    """
+
+    object_id_a: np.ndarray
+    object_id_b: np.ndarray
+    link_id_a: np.ndarray
+    link_id_b: np.ndarray
+
+    @classmethod
+    def from_contact_points(cls, contact_points) -> "ContactIds":
+        ids = np.array(
+            [
+                (c.object_id_a, c.object_id_b, c.link_id_a, c.link_id_b)
+                for c in contact_points
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 4)
+        return cls(
+            object_id_a=ids[:, 0],
+            object_id_b=ids[:, 1],
+            link_id_a=ids[:, 2],
+            link_id_b=ids[:, 3],
+        )
+
+    def __len__(self) -> int:
+        return len(self.object_id_a)
+
+    def matches(self, names) -> np.ndarray:
+        """
+        Mask of the contacts involving any of the object ids `names`.
+        """
+        return np.isin(self.object_id_a, names) | np.isin(
+            self.object_id_b, names
+        )
+
+
 def rearrange_collision(
     sim,
     count_obj_colls: bool,
@@ -97,64 +137,54 @@ def rearrange_collision(
     """Defines what counts as a collision for the Rearrange environment execution"""
     agent_model = sim.get_agent_data(agent_idx).articulated_agent
     grasp_mgr = sim.get_agent_data(agent_idx).grasp_mgr
-    colls = sim.get_physics_contact_points()
+    colls = sim.get_contact_ids()
     agent_id = agent_model.get_robot_sim_id()
-    added_objs = sim.scene_obj_ids
     snapped_obj_id = grasp_mgr.snap_idx
 
-    def should_keep(x):
-        if ignore_base:
-            match_link = get_match_link(x, agent_id)
-            if match_link is not None and agent_model.is_base_link(match_link):
-                return False
-
-        if ignore_names is not None:
-            should_ignore = any(
-                coll_name_matches(x, ignore_name)
-                for ignore_name in ignore_names
-            )
-            if should_ignore:
-                return False
-        return True
+    id_a = colls.object_id_a
+    id_b = colls.object_id_b
+    is_agent_a = id_a == agent_id
+    is_agent_coll = is_agent_a | (id_b == agent_id)
 
     # Filter out any collisions with the ignore objects
-    colls = list(filter(should_keep, colls))
-    robot_coll_ids = []
+    keep = np.ones(len(colls), dtype=bool)
+    if ignore_base and is_agent_coll.any():
+        agent_links = np.where(is_agent_a, colls.link_id_a, colls.link_id_b)
+        base_links = [
+            link
+            for link in np.unique(agent_links[is_agent_coll]).tolist()
+            if agent_model.is_base_link(link)
+        ]
+        keep &= ~(is_agent_coll & np.isin(agent_links, base_links))
+    if ignore_names is not None:
+        keep &= ~colls.matches(ignore_names)
 
     # Check for robot collision
-    robot_obj_colls = 0
-    robot_scene_colls = 0
-    robot_scene_matches = [c for c in colls if coll_name_matches(c, agent_id)]
-    for match in robot_scene_matches:
-        reg_obj_coll = any(
-            coll_name_matches(match, obj_id) for obj_id in added_objs
-        )
-        if reg_obj_coll:
-            robot_obj_colls += 1
-        else:
-            robot_scene_colls += 1
-
-        if match.object_id_a == agent_id:
-            robot_coll_ids.append(match.object_id_b)
-        else:
-            robot_coll_ids.append(match.object_id_a)
+    robot_matches = keep & is_agent_coll
+    robot_coll_ids = np.where(is_agent_a, id_b, id_a)[robot_matches]
+    robot_obj_colls = int(
+        np.count_nonzero(colls.matches(sim.scene_obj_ids)[robot_matches])
+    )
+    robot_scene_colls = len(robot_coll_ids) - robot_obj_colls
 
     # Checking for holding object collision
     obj_scene_colls = 0
     if count_obj_colls and snapped_obj_id is not None:
-        matches = [c for c in colls if coll_name_matches(c, snapped_obj_id)]
-        for match in matches:
-            if coll_name_matches(match, agent_id):
-                continue
-            obj_scene_colls += 1
+        obj_scene_colls = int(
+            np.count_nonzero(
+                keep
+                & ((id_a == snapped_obj_id) | (id_b == snapped_obj_id))
+                & ~is_agent_coll
+            )
+        )
 
     if get_extra_coll_data:
         coll_details = CollisionDetails(
             obj_scene_colls=min(obj_scene_colls, 1),
             robot_obj_colls=min(robot_obj_colls, 1),
             robot_scene_colls=min(robot_scene_colls, 1),
-            robot_coll_ids=robot_coll_ids,
-            all_colls=[(x.object_id_a, x.object_id_b) for x in colls],
+            robot_coll_ids=robot_coll_ids.tolist(),
+            all_colls=list(zip(id_a[keep].tolist(), id_b[keep].tolist())),
         )
     else:
         coll_details = CollisionDetails(
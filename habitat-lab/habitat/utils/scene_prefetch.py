@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import glob
+import os
+from collections import OrderedDict
+from queue import Queue
+from threading import Thread
+from typing import List, Optional, Sequence
+
+from habitat.core.logging import logger
+
+_READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def get_scene_files(scene_id: str) -> List[str]:
+    r"""Returns the files on disk that belong to a scene: the scene file
+    itself and the files sharing its name, like the navmesh or the semantic
+    annotations (``<scene>.navmesh``, ``<scene>_semantic.ply``, ...).
+
+    Scenes referenced by a handle of a scene dataset config instead of a
+    path have no files returned.
+    """
+    if not os.path.isfile(scene_id):
+        return []
+
+    stem = os.path.splitext(scene_id)[0]
+    scene_files = [scene_id]
+    for pattern in (glob.escape(stem) + ".*", glob.escape(stem) + "_*"):
+        for path in sorted(glob.glob(pattern)):
+            if path not in scene_files and os.path.isfile(path):
+                scene_files.append(path)
+    return scene_files
+
+
+def warm_file(path: str) -> None:
+    r"""Loads a file in the OS page cache so that reading it later does not
+    hit the disk.
+    """
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        buffer = bytearray(_READ_CHUNK_SIZE)
+        while f.readinto(buffer):
+            pass
+
+
+class ScenePrefetcher:
+    r"""Warms the page cache with the files of upcoming scenes in a
+    background thread, so that the scene switch in
+    :ref:`habitat.Simulator.reconfigure` reads them from memory.
+
+    Typically fed with :ref:`habitat.core.dataset.EpisodeIterator.peek_scene_ids`
+    on every reset. Scenes that were recently prefetched are skipped.
+    """
+
+    def __init__(self, max_remembered_scenes: int = 16) -> None:
+        r"""..
+
+        :param max_remembered_scenes: number of recently prefetched scenes
+            that are not prefetched again.
+        """
+        self._max_remembered_scenes = max_remembered_scenes
+        self._prefetched: "OrderedDict[str, None]" = OrderedDict()
+        self._queue: "Queue[Optional[str]]" = Queue()
+        self._is_closed = False
+        self._thread = Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def prefetch(self, scene_ids: Sequence[str]) -> None:
+        r"""Queues the scenes that were not recently prefetched."""
+        for scene_id in scene_ids:
+            if scene_id in self._prefetched:
+                self._prefetched.move_to_end(scene_id)
+                continue
+
+            self._prefetched[scene_id] = None
+            if len(self._prefetched) > self._max_remembered_scenes:
+                self._prefetched.popitem(last=False)
+            self._queue.put(scene_id)
+
+    def _worker(self) -> None:
+        while True:
+            scene_id = self._queue.get()
+            if scene_id is None:
+                return
+
+            for path in get_scene_files(scene_id):
+                if self._is_closed:
+                    return
+                try:
+                    warm_file(path)
+                except OSError as e:
+                    logger.warning(f"Could not prefetch {path}: {e}")
+
+    def close(self) -> None:
+        self._is_closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms, Inc. and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+r"""Wall time of the parts of an environment step.
+
+Unlike :ref:`habitat.utils.profiling_wrapper`, which emits NVTX ranges for
+Nsight, the timings are always recorded. :ref:`habitat.core.env.Env` times
+each step, each task action, each sensor and each measure into fixed-size
+histograms, which :ref:`habitat.core.env.Env.get_step_timings` returns:
+
+.. code:: py
+
+    timings = envs.call(["get_step_timings"] * envs.num_envs)
+"""
+
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Upper bounds, in seconds, of the histogram bins, log-spaced from 10us to
+# 10s. The last bin holds the longer durations.
+_BIN_EDGES: List[float] = np.geomspace(1e-5, 10.0, 31).tolist()
+
+
+class TimingHistogram:
+    r"""Histogram of durations with fixed log-spaced bins, so that it has a
+    constant size and histograms of different environments can be merged.
+    """
+
+    def __init__(self) -> None:
+        self.counts = np.zeros(len(_BIN_EDGES) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, duration: float) -> None:
+        r"""Records a duration, in seconds."""
+        self.counts[bisect.bisect_left(_BIN_EDGES, duration)] += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def merge(self, other: "TimingHistogram") -> None:
+        r"""Adds the durations recorded by :p:`other`."""
+        self.counts += other.counts
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> float:
+        count = self.count
+        return self.total / count if count > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        r"""Upper bound of the bin of the :p:`q`-th percentile, in seconds.
+
+        :param q: percentile between 0 and 100.
+        """
+        count = self.count
+        if count == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q / 100.0 * count))
+        if index >= len(_BIN_EDGES):
+            return self.max
+        return min(_BIN_EDGES[index], self.max)
+
+    def get_stats(self) -> Dict[str, float]:
+        r"""Returns the number of durations and their mean, median, 90th
+        percentile and maximum, in seconds.
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "max": self.max,
+        }
+
+
+class StepTimer:
+    r"""Named :ref:`TimingHistogram`\ s of the parts of a step."""
+
+    def __init__(self) -> None:
+        self._histograms: Dict[str, TimingHistogram] = {}
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        r"""Records the wall time of the body of the :py:`with` statement in
+        the histogram :p:`name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, duration: float) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = TimingHistogram()
+        histogram.add(duration)
+
+    def get_histograms(self) -> Dict[str, TimingHistogram]:
+        return self._histograms
+
+    def reset(self) -> None:
+        self._histograms = {}
+
+
+def merge_step_timings(
+    timings: List[Dict[str, TimingHistogram]],
+    histograms: Optional[Dict[str, TimingHistogram]] = None,
+) -> Dict[str, TimingHistogram]:
+    r"""Merges the histograms of several environments by name.
+
+    :param timings: the histograms of each environment, as returned by
+        :ref:`habitat.core.env.Env.get_step_timings`.
+    :param histograms: histograms to merge into, new ones by default.
+    """
+    if histograms is None:
+        histograms = {}
+    for env_timings in timings:
+        for name, histogram in env_timings.items():
+            if name not in histograms:
+                histograms[name] = TimingHistogram()
+            histograms[name].merge(histogram)
+    return histograms
@@ -4,6 +4,9 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import functools
+from typing import Optional, Sequence, Tuple
+
 import numba
 import numpy as np
 
@@ -97,25 +100,103 @@ def draw_fog_of_war_line(top_down_map, fog_of_war_mask, pt1, pt2):
         fog_of_war_mask[x, y] = 1
 
 
-@numba.jit(nopython=True)
-def _draw_loop(
+@numba.jit(nopython=True, parallel=True)
+def _draw_batch(
     top_down_map,
     fog_of_war_mask,
-    current_point,
-    current_angle,
+    points,
+    headings,
     max_line_len,
-    angles,
+    ray_cos,
+    ray_sin,
 ):
-    for angle in angles:
+    num_rays = len(ray_cos)
+    for i in numba.prange(len(points) * num_rays):
+        point = i // num_rays
+        ray = i % num_rays
+        heading_cos = np.cos(headings[point])
+        heading_sin = np.sin(headings[point])
+        # Rotation of the ray template by the heading
+        direction = np.array(
+            [
+                heading_cos * ray_cos[ray] - heading_sin * ray_sin[ray],
+                heading_sin * ray_cos[ray] + heading_cos * ray_sin[ray],
+            ]
+        )
         draw_fog_of_war_line(
             top_down_map,
             fog_of_war_mask,
-            current_point,
-            current_point
-            + max_line_len
-            * np.array(
-                [np.cos(current_angle + angle), np.sin(current_angle + angle)]
-            ),
+            points[point],
+            points[point] + max_line_len * direction,
+        )
+
+
+@functools.lru_cache(maxsize=32)
+def get_ray_template(
+    fov: float, max_line_len: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    r"""Returns the cosines and sines of the angles of the lines cast to
+    reveal the fog-of-war, relative to the heading of the agent.
+
+    :param fov: The field of view of the agent, in degrees
+    :param max_line_len: The maximum length of the lines
+    """
+    fov = np.deg2rad(fov)
+
+    # Set the angle step to a value such that delta_angle * max_line_len = 1
+    angles = np.arange(
+        -fov / 2, fov / 2, step=1.0 / max_line_len, dtype=np.float32
+    ).astype(np.float64)
+    ray_cos, ray_sin = np.cos(angles), np.sin(angles)
+    ray_cos.flags.writeable = False
+    ray_sin.flags.writeable = False
+    return ray_cos, ray_sin
+
+
+def reveal_fog_of_war_batch(
+    top_down_maps: Sequence[np.ndarray],
+    fog_of_war_masks: Sequence[np.ndarray],
+    points: np.ndarray,
+    angles: np.ndarray,
+    map_indices: Optional[np.ndarray] = None,
+    fov: float = 90,
+    max_line_len: float = 100,
+) -> None:
+    r"""Reveals the fog-of-war from several locations in one parallel pass
+    per map, for instance from the agents of several maps or from the
+    successive locations of an agent.
+
+    Args:
+        top_down_maps: The top down maps. Used for respecting walls when revealing
+        fog_of_war_masks: The fog-of-war mask of each map, updated in place
+        points: Array of shape (N, 2) of the locations on the fog_of_war_masks
+        angles: Array of shape (N,) of the look directions at the locations
+        map_indices: Index of the map of each location. Defaults to the i-th
+            map for the i-th location
+        fov: The feild of view of the agents
+        max_line_len: The maximum length of the lines used to reveal the fog-of-war
+    """
+    points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    if map_indices is None:
+        map_indices = np.arange(len(points))
+    map_indices = np.asarray(map_indices, dtype=np.int64)
+    assert len(points) == len(angles) == len(map_indices)
+    if len(points) == 0:
+        return
+
+    ray_cos, ray_sin = get_ray_template(float(fov), float(max_line_len))
+    # One pass per map, the maps can have different shapes
+    for map_index in np.unique(map_indices):
+        in_map = map_indices == map_index
+        _draw_batch(
+            top_down_maps[map_index],
+            fog_of_war_masks[map_index],
+            points[in_map],
+            angles[in_map],
+            float(max_line_len),
+            ray_cos,
+            ray_sin,
         )
 
 
@@ -143,21 +224,14 @@ def reveal_fog_of_war(
     Returns:
         The updated fog_of_war_mask
     """
-    fov = np.deg2rad(fov)
-
-    # Set the angle step to a value such that delta_angle * max_line_len = 1
-    angles = np.arange(
-        -fov / 2, fov / 2, step=1.0 / max_line_len, dtype=np.float32
-    )
-
     fog_of_war_mask = current_fog_of_war_mask.copy()
-    _draw_loop(
-        top_down_map,
-        fog_of_war_mask,
-        current_point,
-        current_angle,
-        max_line_len,
-        angles,
+    reveal_fog_of_war_batch(
+        [top_down_map],
+        [fog_of_war_mask],
+        np.asarray(current_point)[None],
+        np.array([current_angle]),
+        fov=fov,
+        max_line_len=max_line_len,
     )
 
     return fog_of_war_mask
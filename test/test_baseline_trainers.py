@@ -12,6 +12,7 @@ import random
 from copy import deepcopy
 from glob import glob
 
+import numpy as np
 import pytest
 
 from habitat.config.default import get_agent_config
@@ -461,3 +462,356 @@ def test_batch_obs(sensor_device, batched_device):
     ]
 
     _ = batch_obs(sensors, device=batched_device)
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize("out_device", ["cpu", "cuda"])
+def test_batch_obs_out(out_device):
+    if out_device == "cuda" and not torch.cuda.is_available():
+        pytest.skip("CUDA not avaliable")
+
+    from habitat_baselines.common.tensor_dict import TensorDict
+    from habitat_baselines.utils.common import _ObservationBatchingCache
+
+    out_device = torch.device(out_device)
+    sensors = [
+        {"rgb": torch.randn(8, 8, 3).numpy(), "gps": torch.randn(2).numpy()}
+        for _ in range(4)
+    ]
+    storage = TensorDict(
+        rgb=torch.zeros(3, 4, 8, 8, 3, device=out_device),
+        gps=torch.zeros(3, 4, 2, device=out_device),
+    )
+
+    batch = batch_obs(sensors, out=storage[1])
+    expected = batch_obs(sensors)
+    for k in ("rgb", "gps"):
+        assert batch[k].data_ptr() == storage[k][1].data_ptr()
+        assert torch.equal(storage[k][1].cpu(), expected[k])
+        assert not storage[k][0].any()
+
+    # A sensor keeps a single buffer across batch sizes, and a new shape
+    # drops its old buffer
+    cache = _ObservationBatchingCache()
+    for num_obs, num_buffered in ((4, 4), (3, 4), (2, 4), (5, 5), (1, 5)):
+        batch = batch_obs(
+            [{"rgb": torch.randn(4, 4, 3).numpy()} for _ in range(num_obs)]
+        )
+        assert batch["rgb"].shape[0] == num_obs
+        rgb_buffers = [v for k, v in cache._pool.items() if k[0] == ("rgb",)]
+        assert len(rgb_buffers) == 1
+        assert rgb_buffers[0].shape[0] == num_buffered
+
+    cache.invalidate()
+    assert len(cache._pool) == 0
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize("device", ["cpu", "cuda"])
+def test_stacked_obs_to_device(device):
+    if device == "cuda" and not torch.cuda.is_available():
+        pytest.skip("CUDA not avaliable")
+
+    from habitat_baselines.utils.common import stacked_obs_to_device
+
+    device = torch.device(device)
+    observations = {
+        "rgb": torch.randn(4, 8, 8, 3).numpy(),
+        "nested": {"gps": torch.randn(4, 2).numpy()},
+    }
+    batch, staged = stacked_obs_to_device(observations, device, name="test")
+    assert torch.equal(
+        batch["rgb"].cpu(), torch.from_numpy(observations["rgb"])
+    )
+    assert torch.equal(
+        batch["nested"]["gps"].cpu(),
+        torch.from_numpy(observations["nested"]["gps"]),
+    )
+    # The next batch can be stacked straight into the pinned buffers
+    staged["rgb"][...] = 1.0
+    batch, next_staged = stacked_obs_to_device(staged, device, name="test")
+    assert np.shares_memory(next_staged["rgb"], staged["rgb"])
+    assert batch["rgb"].eq(1.0).all()
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize("float_image_dtype", ["float16", "int16"])
+def test_compact_rollout_storage(float_image_dtype):
+    import gym
+    import numpy as np
+
+    from habitat_baselines.common.rollout_storage import RolloutStorage
+
+    observation_space = gym.spaces.Dict(
+        {
+            "rgb": gym.spaces.Box(0, 255, (8, 8, 3), dtype=np.uint8),
+            "depth": gym.spaces.Box(0.0, 10.0, (8, 8, 1), dtype=np.float32),
+            "gps": gym.spaces.Box(-np.inf, np.inf, (2,), dtype=np.float32),
+        }
+    )
+    rollouts = RolloutStorage(
+        4,
+        2,
+        observation_space,
+        gym.spaces.Discrete(4),
+        16,
+        compact_observations=True,
+        float_image_dtype=float_image_dtype,
+        hidden_states_dtype="bfloat16",
+    )
+    buffers = rollouts.buffers["observations"]
+    assert buffers["rgb"].dtype == torch.uint8
+    assert buffers["depth"].dtype == getattr(torch, float_image_dtype)
+    assert buffers["gps"].dtype == torch.float32
+    assert rollouts.buffers["recurrent_hidden_states"].dtype == (
+        torch.bfloat16
+    )
+    assert rollouts.get_next_observations() is None
+
+    observations = [
+        {
+            k: torch.from_numpy(np.stack([v.sample() for _ in range(2)]))
+            for k, v in observation_space.spaces.items()
+        }
+        for _ in range(3)
+    ]
+    hidden_states = torch.randn(2, 1, 16)
+    rollouts.insert_first_observations(observations[0])
+    for step_observations in observations[1:]:
+        rollouts.insert(
+            next_observations=step_observations,
+            next_recurrent_hidden_states=hidden_states,
+            actions=torch.zeros(2, 1, dtype=torch.long),
+            action_log_probs=torch.zeros(2, 1),
+            value_preds=torch.zeros(2, 1),
+            rewards=torch.zeros(2, 1),
+            next_masks=torch.ones(2, 1, dtype=torch.bool),
+        )
+        rollouts.advance_rollout()
+
+    step = rollouts.get_current_step()
+    assert step["recurrent_hidden_states"].dtype == torch.float32
+    assert torch.allclose(
+        step["recurrent_hidden_states"], hidden_states, rtol=1e-2
+    )
+    for k, v in observations[-1].items():
+        assert step["observations"][k].dtype == v.dtype
+        assert torch.allclose(step["observations"][k], v, atol=1e-2)
+
+    batch = next(rollouts.recurrent_generator(None, 1))
+    assert batch["observations"]["depth"].dtype == torch.float32
+    assert batch["recurrent_hidden_states"].dtype == torch.float32
+    # The environments of the batch are shuffled
+    depth = torch.stack([o["depth"] for o in observations[:2]]).flatten(0, 1)
+    assert torch.allclose(
+        batch["observations"]["depth"].sort(dim=0).values,
+        depth.sort(dim=0).values,
+        atol=1e-2,
+    )
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+@pytest.mark.parametrize("use_gae", [True, False])
+def test_compute_returns(use_gae):
+    import gym
+    import numpy as np
+
+    from habitat_baselines.common.rollout_storage import RolloutStorage
+
+    num_steps, num_envs, gamma, tau = 16, 4, 0.99, 0.95
+    rollouts = RolloutStorage(
+        num_steps,
+        num_envs,
+        gym.spaces.Dict({"gps": gym.spaces.Box(-1, 1, (2,), np.float32)}),
+        gym.spaces.Discrete(4),
+        8,
+    )
+    rewards = torch.randn(num_steps + 1, num_envs, 1)
+    value_preds = torch.randn(num_steps + 1, num_envs, 1)
+    masks = torch.rand(num_steps + 1, num_envs, 1) > 0.2
+    next_value = torch.randn(num_envs, 1)
+    rollouts.buffers["rewards"].copy_(rewards)
+    rollouts.buffers["value_preds"].copy_(value_preds)
+    rollouts.buffers["masks"].copy_(masks)
+    rollouts.current_rollout_step_idxs = [num_steps]
+    rollouts.compute_returns(next_value, use_gae, gamma, tau)
+
+    # Step by step reference
+    expected = torch.zeros(num_steps + 1, num_envs, 1)
+    value_preds[num_steps] = next_value
+    expected[num_steps] = next_value
+    gae = 0.0
+    for step in reversed(range(num_steps)):
+        if use_gae:
+            delta = (
+                rewards[step]
+                + gamma * value_preds[step + 1] * masks[step + 1]
+                - value_preds[step]
+            )
+            gae = delta + gamma * tau * gae * masks[step + 1]
+            expected[step] = gae + value_preds[step]
+        else:
+            expected[step] = (
+                gamma * expected[step + 1] * masks[step + 1] + rewards[step]
+            )
+
+    assert torch.equal(
+        rollouts.buffers["returns"][:num_steps], expected[:num_steps]
+    )
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_hrl_rollout_storage_loss_mask():
+    import gym
+    import numpy as np
+
+    from habitat_baselines.rl.hrl.hrl_rollout_storage import HrlRolloutStorage
+
+    num_steps, num_envs = 6, 2
+    rollouts = HrlRolloutStorage(
+        num_steps,
+        num_envs,
+        gym.spaces.Dict({"gps": gym.spaces.Box(-1, 1, (2,), np.float32)}),
+        gym.spaces.Discrete(100),
+        8,
+    )
+    should_inserts = torch.tensor(
+        [[True, True], [True, False], [True, True], [True, True]]
+    )
+    was_resetting = torch.tensor(
+        [[False, False], [True, True], [False, True], [False, False]]
+    )
+    for step in range(len(should_inserts)):
+        rollouts.insert(
+            # Encodes the environment and the step of the sample, the
+            # unwritten samples have action 0
+            actions=torch.tensor([[1 + step], [11 + step]]),
+            action_log_probs=torch.zeros(num_envs, 1),
+            value_preds=torch.zeros(num_envs, 1),
+            should_inserts=should_inserts[step],
+        )
+        rollouts.insert(
+            rewards=torch.zeros(num_envs, 1),
+            next_masks=torch.ones(num_envs, 1, dtype=torch.bool),
+            loss_mask=torch.logical_not(was_resetting[step]).view(-1, 1),
+        )
+        rollouts.advance_rollout()
+
+    # The last sample of each environment is thrown out. The sample of the
+    # second environment skipped at step 1 does not write its mask.
+    expected = {1: True, 2: False, 3: True, 11: True, 13: False}
+    advantages = torch.zeros(num_steps + 1, num_envs, 1)
+    num_samples = 0
+    for batch in rollouts.recurrent_generator(advantages, num_envs):
+        assert batch["loss_mask"].dtype == torch.bool
+        for action, is_valid in zip(batch["actions"], batch["loss_mask"]):
+            if int(action) in expected:
+                assert bool(is_valid) == expected[int(action)]
+            num_samples += int(is_valid)
+    assert num_samples == sum(expected.values())
+
+
+@pytest.mark.skipif(
+    not baseline_installed, reason="baseline sub-module not installed"
+)
+def test_hierarchical_policy_skill_groups():
+    import gym.spaces as spaces
+    import torch.nn as nn
+
+    from habitat_baselines.rl.hrl.hierarchical_policy import HierarchicalPolicy
+    from habitat_baselines.rl.ppo.policy import PolicyActionData
+
+    class RecordingSkill:
+        def __init__(self):
+            self.calls = []
+
+        def should_terminate(self, actions, batch_idx, skill_name, **kwargs):
+            self.calls.append(("should_terminate", batch_idx, skill_name))
+            return (
+                torch.zeros(len(batch_idx), dtype=torch.bool),
+                torch.zeros(len(batch_idx), dtype=torch.bool),
+                actions,
+            )
+
+        def on_enter(self, skill_arg, batch_idxs, *args):
+            self.calls.append(("on_enter", batch_idxs, skill_arg))
+
+        def act(self, rnn_hidden_states, cur_batch_idx, **kwargs):
+            self.calls.append(("act", cur_batch_idx))
+            return PolicyActionData(
+                rnn_hidden_states=rnn_hidden_states,
+                actions=torch.ones(len(cur_batch_idx), 3),
+            )
+
+    class FixedHighLevel:
+        def apply_mask(self, mask):
+            pass
+
+        def get_termination(self, *args):
+            return torch.zeros(num_envs, dtype=torch.bool)
+
+        def get_next_skill(self, *args):
+            return (
+                torch.full((num_envs,), 2),
+                ["arg"] * num_envs,
+                torch.zeros(num_envs, dtype=torch.bool),
+                {},
+            )
+
+    num_envs = 4
+    nav, pick = RecordingSkill(), RecordingSkill()
+    policy = HierarchicalPolicy.__new__(HierarchicalPolicy)
+    nn.Module.__init__(policy)
+    policy._num_envs = num_envs
+    policy._action_space = spaces.Box(-1.0, 1.0, (3,))
+    policy._stop_action_idx = 2
+    policy._high_level_policy = FixedHighLevel()
+    # Two PDDL actions executed by the same skill policy
+    policy._skills = {0: nav, 1: nav, 2: pick}
+    policy._idx_to_name = {0: "nav_a", 1: "nav_b", 2: "pick"}
+    policy._skill_to_group = {-1: -1, 0: 0, 1: 0, 2: 2}
+    policy._cur_skills = torch.tensor([0, 1, 2, 1])
+
+    grouped_skills = policy._broadcast_skill_ids(
+        policy._cur_skills,
+        sel_dat={"x": torch.arange(num_envs)},
+        should_adds=torch.tensor([[True], [True], [True], [False]]),
+    )
+    assert grouped_skills.keys() == {0, 2}
+    assert grouped_skills[0][0] == [0, 1]
+    assert torch.equal(grouped_skills[0][1]["x"], torch.tensor([0, 1]))
+    assert grouped_skills[2][0] == [2]
+
+    # The episode of the last environment is over.
+    masks = torch.tensor([[True], [True], [True], [False]])
+    action_data = policy.act(
+        torch.zeros(num_envs, 1),
+        torch.zeros(num_envs, 1, 8),
+        torch.zeros(num_envs, 3),
+        masks,
+    )
+    assert nav.calls == [
+        ("should_terminate", [0, 1], ["nav_a", "nav_b"]),
+        ("act", [0, 1]),
+    ]
+    assert pick.calls == [
+        ("should_terminate", [2], ["pick"]),
+        ("on_enter", [3], ["arg"]),
+        ("act", [2, 3]),
+    ]
+    assert torch.equal(policy._cur_skills, torch.tensor([0, 1, 2, 2]))
+    assert policy._cur_skills.dtype == torch.long
+    assert torch.equal(
+        action_data.should_inserts, torch.tensor([False, False, False, True])
+    )
+    assert torch.equal(action_data.actions[:, 2], torch.zeros(num_envs))
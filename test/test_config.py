@@ -4,7 +4,16 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from habitat.config.default import get_config
+import os
+
+from habitat.config import read_write
+from habitat.config.default import (
+    _HABITAT_CFG_DIR,
+    CONFIG_CACHE_DIR_ENV,
+    _get_config_cache_key,
+    clear_config_cache,
+    get_config,
+)
 
 CFG_TEST = "test/habitat_all_sensors_test.yaml"
 MAX_TEST_STEPS_LIMIT = 3
@@ -19,3 +28,58 @@ def test_overwrite_options():
         assert (
             config.habitat.environment.max_episode_steps == steps_limit
         ), "Overwriting of config options failed."
+
+
+def test_config_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(CONFIG_CACHE_DIR_ENV, str(tmp_path))
+    clear_config_cache()
+    overrides = ["habitat.environment.max_episode_steps=7"]
+    config = get_config(config_path=CFG_TEST, overrides=overrides)
+    assert len(os.listdir(tmp_path)) == 1
+
+    # The cached configs are copies
+    with read_write(config):
+        config.habitat.environment.max_episode_steps = 8
+    cached_config = get_config(config_path=CFG_TEST, overrides=overrides)
+    assert cached_config.habitat.environment.max_episode_steps == 7
+
+    # Loaded from the disk cache
+    clear_config_cache()
+    disk_config = get_config(config_path=CFG_TEST, overrides=overrides)
+    assert disk_config == cached_config
+    assert len(os.listdir(tmp_path)) == 1
+
+    other_config = get_config(config_path=CFG_TEST)
+    assert other_config != cached_config
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_config_cache_key(tmp_path, monkeypatch):
+    clear_config_cache()
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("defaults:\n  - /habitat: habitat_config_base\n")
+    included_path = tmp_path / "included.yaml"
+    included_path.write_text("{}\n")
+    key = _get_config_cache_key(str(config_path), [], _HABITAT_CFG_DIR)
+
+    # The search path is listed once
+    def walk(*args, **kwargs):
+        raise AssertionError("The search path was listed again")
+
+    monkeypatch.setattr(os, "walk", walk)
+    assert key == _get_config_cache_key(str(config_path), [], _HABITAT_CFG_DIR)
+    assert key != _get_config_cache_key(
+        str(config_path), ["habitat.seed=1"], _HABITAT_CFG_DIR
+    )
+
+    # The files next to the config file are tracked
+    mtime_ns = included_path.stat().st_mtime_ns
+    os.utime(included_path, ns=(mtime_ns, mtime_ns + 10**9))
+    new_key = _get_config_cache_key(str(config_path), [], _HABITAT_CFG_DIR)
+    assert key != new_key
+    key = new_key
+
+    # The config file itself is tracked
+    mtime_ns = config_path.stat().st_mtime_ns
+    os.utime(config_path, ns=(mtime_ns, mtime_ns + 10**9))
+    assert key != _get_config_cache_key(str(config_path), [], _HABITAT_CFG_DIR)
@@ -4,11 +4,26 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gzip
 from itertools import groupby, islice
 
+import numpy as np
 import pytest
+from omegaconf import OmegaConf
 
+from habitat.config.default_structured_configs import DatasetConfig
 from habitat.core.dataset import Dataset, Episode
+from habitat.core.simulator import ShortestPathPoint
+from habitat.datasets.pointnav.pointnav_dataset import PointNavDatasetV1
+from habitat.datasets.shared_dataset import (
+    load_shared_dataset,
+    publish_shared_dataset,
+)
+from habitat.datasets.trajectory_store import (
+    TrajectoryStore,
+    get_episode_key,
+    save_trajectories,
+)
 from habitat.tasks.nav.nav import NavigationEpisode, NavigationGoal
 
 
@@ -41,6 +56,59 @@ def test_get_scene_episodes():
         assert ep.scene_id == scene
 
 
+def test_episode_index():
+    dataset = _construct_dataset(100)
+    assert dataset.get_scene_episode_indices("scene_id_3") == list(
+        range(3, 100, 10)
+    )
+    assert dataset.get_episode_index("42") == 42
+    with pytest.raises(KeyError):
+        dataset.get_episode_index("100")
+
+    # Appending extends the index, assigning a new list rebuilds it.
+    dataset.episodes.append(
+        Episode(
+            episode_id="100",
+            scene_id="scene_id_10",
+            start_position=[0, 0, 0],
+            start_rotation=[0, 0, 0, 1],
+        )
+    )
+    assert dataset.get_episode_index("100") == 100
+    assert dataset.scene_ids[-1] == "scene_id_9"
+    assert "scene_id_10" in dataset.scene_ids
+    assert len(dataset.get_scene_episodes("scene_id_10")) == 1
+
+    dataset.episodes = dataset.episodes[50:]
+    assert dataset.get_episode_index("100") == 50
+    assert len(dataset.get_scene_episodes("scene_id_3")) == 5
+
+    filtered_dataset = dataset.filter_episodes(
+        lambda ep: ep.scene_id != "scene_id_10"
+    )
+    assert "scene_id_10" not in filtered_dataset.scene_ids
+    assert "scene_id_10" in dataset.scene_ids
+    assert "_scene_episode_indices" not in filtered_dataset.to_json()
+
+
+def test_episode_index_after_shuffled_iterator():
+    dataset = _construct_dataset(100)
+    assert dataset.get_episode_index("0") == 0
+
+    # The iterator shuffles and groups its own copy of the episodes
+    episode_iter = dataset.get_episode_iterator(shuffle=True, seed=1)
+    episode_ids = [next(episode_iter).episode_id for _ in range(100)]
+    assert episode_ids != [str(i) for i in range(100)]
+
+    for i in (0, 42, 99):
+        index = dataset.get_episode_index(str(i))
+        assert dataset.episodes[index].episode_id == str(i)
+    for scene_id in ("scene_id_0", "scene_id_2"):
+        scene_episodes = dataset.get_scene_episodes(scene_id)
+        assert len(scene_episodes) == 10
+        assert all(ep.scene_id == scene_id for ep in scene_episodes)
+
+
 def test_filter_episodes():
     dataset = _construct_dataset(100)
 
@@ -353,6 +421,157 @@ def test_iterator_scene_switching_steps():
     )
 
 
+def test_iterator_peek_scene_ids():
+    total_ep = 100
+    max_repeat = 5
+    dataset = _construct_dataset(total_ep)
+    episode_iter = dataset.get_episode_iterator(
+        max_scene_repeat_episodes=max_repeat, shuffle=False, cycle=True
+    )
+
+    for _ in range(3 * total_ep):
+        peeked = episode_iter.peek_scene_ids(3)
+        episode = next(episode_iter)
+        assert len(peeked) == 3
+        # Peeking does not change the order of the episodes
+        if episode_iter._rep_count == 0:
+            assert episode.scene_id == peeked[0]
+        else:
+            assert episode.scene_id not in peeked
+
+    episode_iter = dataset.get_episode_iterator(shuffle=False, cycle=False)
+    assert episode_iter.peek_scene_ids(2) == ["scene_id_0", "scene_id_1"]
+    episodes = list(episode_iter)
+    assert len(episodes) == total_ep
+    assert episode_iter.peek_scene_ids(2) == []
+
+    # The cached look-ahead matches a fresh one
+    for kwargs in (
+        dict(shuffle=False, max_scene_repeat_episodes=max_repeat),
+        dict(shuffle=True, max_scene_repeat_steps=7),
+        dict(shuffle=False, group_by_scene=False),
+    ):
+        episode_iter = dataset.get_episode_iterator(cycle=True, **kwargs)
+        for _ in range(3 * total_ep):
+            peeked = episode_iter.peek_scene_ids(3)
+            assert episode_iter.peek_scene_ids(3) == peeked
+            episode_iter._peeked_scene_ids = None
+            assert episode_iter.peek_scene_ids(3) == peeked
+            next(episode_iter)
+            for _ in range(3):
+                episode_iter.step_taken()
+
+
+def test_shared_dataset(tmp_path):
+    dataset = _construct_dataset(100)
+    path = publish_shared_dataset(dataset, str(tmp_path))
+
+    shared_dataset = load_shared_dataset(path)
+    assert type(shared_dataset) is Dataset
+    episodes_by_scene = sorted(dataset.episodes, key=lambda ep: ep.scene_id)
+    assert shared_dataset.episodes == episodes_by_scene
+
+    scenes = ["scene_id_3", "scene_id_1", "unknown_scene"]
+    shared_dataset = load_shared_dataset(path, scenes)
+    assert len(shared_dataset.episodes) == 20
+    assert shared_dataset.scene_ids == ["scene_id_1", "scene_id_3"]
+    assert [ep.episode_id for ep in shared_dataset.episodes] == [
+        ep.episode_id
+        for scene in scenes
+        for ep in dataset.get_scene_episodes(scene)
+    ]
+
+
+def test_trajectory_store(tmp_path):
+    dataset = _construct_dataset(20)
+    trajectories = {}
+    for i, episode in enumerate(dataset.episodes):
+        trajectories[get_episode_key(episode)] = [
+            ShortestPathPoint(
+                [float(step), 0.5, float(i)],
+                [0.0, float(step), 0.0, 1.0],
+                None if step == i % 4 else step % 3,
+            )
+            for step in range(i % 4 + 1)
+        ]
+    path = str(tmp_path / "trajectories.bin")
+    assert save_trajectories(path, trajectories.items()) == 20
+
+    store = TrajectoryStore(path)
+    assert len(store) == 20
+    assert "unknown_scene/0" not in store
+    for key, shortest_path in trajectories.items():
+        assert store.get_shortest_path(key) == shortest_path
+        assert store.get_actions(key).tolist() == [
+            -1 if point.action is None else point.action
+            for point in shortest_path
+        ]
+
+    episodes = [
+        NavigationEpisode(
+            episode_id=episode.episode_id,
+            scene_id=episode.scene_id,
+            start_position=episode.start_position,
+            start_rotation=episode.start_rotation,
+            goals=[NavigationGoal(position=[0, 0, 0])],
+        )
+        for episode in dataset.episodes[:5]
+    ]
+    assert store.set_shortest_paths(episodes) == 5
+    for episode in episodes:
+        assert episode.shortest_paths == [
+            trajectories[get_episode_key(episode)]
+        ]
+    assert np.array_equal(store.get_actions("scene_id_3/3"), [0, 1, 2, -1])
+
+    with pytest.raises(ValueError, match="Duplicate trajectory key"):
+        save_trajectories(
+            str(tmp_path / "duplicates.bin"),
+            [("scene_id_0/0", []), ("scene_id_0/0", [])],
+        )
+
+
+def test_trajectory_store_path(tmp_path):
+    episodes = [
+        NavigationEpisode(
+            episode_id=str(i),
+            scene_id=f"scene_{i % 2}.glb",
+            start_position=[0.0, 0.0, 0.0],
+            start_rotation=[0.0, 0.0, 0.0, 1.0],
+            goals=[NavigationGoal(position=[1.0, 0.0, float(i)])],
+        )
+        for i in range(4)
+    ]
+    dataset = PointNavDatasetV1()
+    dataset.episodes = episodes
+    data_path = str(tmp_path / "{split}.json.gz")
+    with gzip.open(data_path.format(split="train"), "wt") as f:
+        f.write(dataset.to_json())
+    trajectories = {
+        get_episode_key(episode): [
+            ShortestPathPoint([0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], 1),
+            ShortestPathPoint([1.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], None),
+        ]
+        for episode in episodes[:3]
+    }
+    store_path = str(tmp_path / "trajectories.bin")
+    save_trajectories(store_path, trajectories.items())
+
+    config = OmegaConf.structured(
+        DatasetConfig(data_path=data_path, scenes_dir=str(tmp_path))
+    )
+    dataset = PointNavDatasetV1(config)
+    assert all(ep.shortest_paths is None for ep in dataset.episodes)
+
+    config.trajectory_store_path = store_path
+    dataset = PointNavDatasetV1(config)
+    for episode in dataset.episodes[:3]:
+        assert episode.shortest_paths == [
+            trajectories[get_episode_key(episode)]
+        ]
+    assert dataset.episodes[3].shortest_paths is None
+
+
 def test_preserve_order():
     dataset = _construct_dataset(100)
     episodes = sorted(dataset.episodes, reverse=True, key=lambda x: x.scene_id)
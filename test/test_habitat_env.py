@@ -16,10 +16,12 @@ from gym import Wrapper
 import habitat
 from habitat.config.default import get_agent_config, get_config
 from habitat.core.simulator import AgentState
+from habitat.core.vector_env import RESETTING_INFO_KEY
 from habitat.datasets.pointnav.pointnav_dataset import PointNavDatasetV1
 from habitat.gym.gym_definitions import make_gym_from_config
 from habitat.gym.gym_wrapper import HabGymWrapper
 from habitat.tasks.nav.nav import NavigationEpisode, NavigationGoal
+from habitat.utils.step_timing import merge_step_timings
 from habitat.utils.test_utils import (
     sample_non_stop_action,
     sample_non_stop_action_gym,
@@ -144,6 +146,123 @@ def test_vectorized_envs(multiprocessing_start_method, gpu2gpu):
         )
 
 
+@pytest.mark.parametrize(
+    "vector_env_cls", [habitat.VectorEnv, habitat.ThreadedVectorEnv]
+)
+def test_vectorized_envs_shared_memory_obs(vector_env_cls):
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with vector_env_cls(
+        make_env_fn=_make_dummy_env_func,
+        env_fn_args=env_fn_args,
+        use_shared_memory_obs=True,
+    ) as envs:
+        shared_observations = envs.shared_observations
+        assert shared_observations is not None
+
+        observations = envs.reset()
+        for _ in range(configs[0].habitat.environment.max_episode_steps):
+            for i, obs in enumerate(observations):
+                for k, v in obs.items():
+                    assert np.array_equal(v, shared_observations[k][i])
+
+            outputs = envs.step(
+                sample_non_stop_action_gym(envs.action_spaces[0], num_envs)
+            )
+            observations = [o[0] for o in outputs]
+            assert len(observations) == num_envs
+
+        envs.pause_at(0)
+        assert envs.shared_observations[k].shape[0] == num_envs - 1
+
+
+def test_vectorized_envs_step_batched():
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with habitat.VectorEnv(
+        make_env_fn=_make_dummy_env_func, env_fn_args=env_fn_args
+    ) as envs:
+        observations = envs.reset()
+        for _ in range(2 * configs[0].habitat.environment.max_episode_steps):
+            actions = np.asarray(
+                sample_non_stop_action_gym(envs.action_spaces[0], num_envs)
+            )
+            step_result = envs.step_batched(actions)
+            for k, v in observations[0].items():
+                assert step_result.observations[k].shape == (
+                    num_envs,
+                    *v.shape,
+                )
+            assert step_result.rewards.shape == (num_envs,)
+            assert step_result.dones.dtype == bool
+            assert len(step_result.infos) == num_envs
+            for v in step_result.scalar_infos().values():
+                assert v.shape == (num_envs,)
+
+
+@pytest.mark.parametrize("envs_per_worker", [2, 3])
+def test_vectorized_envs_per_worker(envs_per_worker):
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with habitat.VectorEnv(
+        make_env_fn=_make_dummy_env_func,
+        env_fn_args=env_fn_args,
+        envs_per_worker=envs_per_worker,
+    ) as envs:
+        assert envs.num_envs == num_envs
+        assert len(envs._workers) == -(-num_envs // envs_per_worker)
+        envs.reset()
+        for _ in range(2 * configs[0].habitat.environment.max_episode_steps):
+            actions = np.asarray(
+                sample_non_stop_action_gym(envs.action_spaces[0], num_envs)
+            )
+            step_result = envs.step_batched(actions)
+            assert step_result.rewards.shape == (num_envs,)
+
+        episodes = envs.current_episodes()
+        envs.pause_at(1)
+        assert envs.num_envs == num_envs - 1
+        # Steps only a part of the environments of the first worker
+        envs.step(
+            sample_non_stop_action_gym(envs.action_spaces[0], num_envs - 1)
+        )
+        envs.resume_all()
+        assert envs.current_episodes()[1] == episodes[1]
+
+
+def test_vectorized_envs_async_auto_reset():
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    with habitat.VectorEnv(
+        make_env_fn=_make_dummy_env_func,
+        env_fn_args=env_fn_args,
+        async_auto_reset=True,
+    ) as envs:
+        envs.reset()
+        was_resetting = np.zeros(num_envs, dtype=bool)
+        num_resets = 0
+        for _ in range(3 * configs[0].habitat.environment.max_episode_steps):
+            actions = np.asarray(
+                sample_non_stop_action_gym(envs.action_spaces[0], num_envs)
+            )
+            step_result = envs.step_batched(actions)
+            # Only the terminal steps are flagged, and the step that follows
+            # is the first one of the new episode
+            assert (step_result.resetting == step_result.dones).all()
+            assert not step_result.dones[was_resetting].any()
+            assert (step_result.rewards[was_resetting] == 0).all()
+            for info in step_result.infos:
+                assert RESETTING_INFO_KEY not in info
+            num_resets += int(step_result.resetting.sum())
+            was_resetting = step_result.resetting
+
+        assert num_resets > 0
+
+
 def test_with_scope():
     configs, _ = _load_test_data()
     env_fn_args = tuple((c,) for c in configs)
@@ -399,6 +518,37 @@ def test_vec_env_call_func():
         assert env_ids == list(range(num_envs))
 
 
+def test_vec_env_step_timings():
+    configs, datasets = _load_test_data()
+    num_envs = len(configs)
+    env_fn_args = tuple(zip(configs, datasets, range(num_envs)))
+    num_steps = 5
+    with habitat.VectorEnv(
+        make_env_fn=_make_dummy_env_func,
+        env_fn_args=env_fn_args,
+        multiprocessing_start_method="forkserver",
+    ) as envs:
+        envs.reset()
+        for _ in range(num_steps):
+            envs.step(
+                sample_non_stop_action_gym(envs.action_spaces[0], num_envs)
+            )
+
+        step_timings = merge_step_timings(
+            envs.call(
+                ["get_step_timings"] * num_envs, [{"reset": True}] * num_envs
+            )
+        )
+        assert step_timings["env/step"].count == num_envs * num_steps
+        for prefix in ["action/", "sensor/", "measure/"]:
+            assert any(name.startswith(prefix) for name in step_timings)
+        stats = step_timings["env/step"].get_stats()
+        assert 0 < stats["mean"] <= stats["max"]
+        assert stats["p50"] <= stats["p90"]
+
+        assert envs.call(["get_step_timings"] * num_envs) == [{}] * num_envs
+
+
 def test_close_with_paused():
     configs, _ = _load_test_data()
     env_fn_args = tuple((c,) for c in configs)
@@ -14,6 +14,9 @@ from habitat.config import read_write
 from habitat.config.default import get_agent_config, get_config
 from habitat.sims import make_sim
 from habitat.sims.habitat_simulator.actions import HabitatSimActions
+from habitat.sims.habitat_simulator.geodesic_distance_cache import (
+    GeodesicDistanceCache,
+)
 
 
 def init_sim():
@@ -126,3 +129,57 @@ def test_sim_geodesic_distance():
                     ]
                 ),
             ), "Geodesic distance for multi target setup isn't equal to separate single target calls."
+
+
+def test_geodesic_distance_cache():
+    cache = GeodesicDistanceCache(max_size=2, grid_size=0.5)
+    ends = np.array([[1.0, 0.0, 1.0]], dtype=np.float32)
+    num_computed = 0
+
+    def compute_distance():
+        nonlocal num_computed
+        num_computed += 1
+        return float(num_computed)
+
+    assert cache.get_distance([0.1, 0.0, 0.1], ends, compute_distance) == 1
+    # Same cell
+    assert cache.get_distance([0.4, 0.0, 0.2], ends, compute_distance) == 1
+    # Other cell, then other goals
+    assert cache.get_distance([0.6, 0.0, 0.1], ends, compute_distance) == 2
+    assert cache.get_distance([0.1, 0.0, 0.1], ends + 1, compute_distance) == 3
+    # The least recently used distance was evicted
+    assert cache.get_distance([0.6, 0.0, 0.1], ends, compute_distance) == 2
+    assert cache.get_distance([0.1, 0.0, 0.1], ends, compute_distance) == 4
+    assert cache.get_stats() == {
+        "hits": 2,
+        "misses": 4,
+        "hit_rate": 2 / 6,
+        "size": 2,
+    }
+
+    cache.clear()
+    assert cache.get_distance([0.1, 0.0, 0.1], ends + 1, compute_distance) == 5
+
+
+def test_geodesic_distance_cache_cleared_on_navmesh_recompute():
+    config = get_config(
+        "benchmark/nav/pointnav/pointnav_habitat_test.yaml",
+        overrides=["habitat.simulator.geodesic_distance_cache_size=16"],
+    )
+    if not os.path.exists(config.habitat.simulator.scene):
+        pytest.skip("Please download Habitat test data to data folder.")
+    import habitat_sim
+
+    with make_sim(
+        config.habitat.simulator.type, config=config.habitat.simulator
+    ) as sim:
+        sim.reset()
+        start = sim.sample_navigable_point()
+        end = sim.sample_navigable_point()
+        sim.geodesic_distance(start, end)
+        assert sim.geodesic_distance_cache.get_stats()["size"] == 1
+
+        navmesh_settings = habitat_sim.NavMeshSettings()
+        navmesh_settings.set_defaults()
+        sim.recompute_navmesh(sim.pathfinder, navmesh_settings)
+        assert sim.geodesic_distance_cache.get_stats()["size"] == 0
@@ -100,3 +100,56 @@ def test_task_actions_sampling(config_file):
             env.step(action)
             agent_state = env.sim.get_agent_state()
             habitat.logger.info(agent_state)
+
+
+class _StepMeasure(habitat.Measure):
+    def __init__(self, uuid, is_lazy=False, dependencies=()):
+        self._uuid = uuid
+        self.is_lazy = is_lazy
+        self._dependencies = list(dependencies)
+        self.num_updates = 0
+        super().__init__()
+
+    def _get_uuid(self, *args, **kwargs):
+        return self._uuid
+
+    def reset_metric(self, *args, task, **kwargs):
+        task.measurements.check_measure_dependencies(
+            self.uuid, self._dependencies
+        )
+        self.num_updates = 0
+        self._metric = kwargs["step"]
+
+    def update_metric(self, *args, task, **kwargs):
+        self.num_updates += 1
+        self._metric = kwargs["step"]
+
+
+def test_lazy_measures():
+    lazy = _StepMeasure("lazy", is_lazy=True)
+    needed = _StepMeasure("needed", is_lazy=True)
+    eager = _StepMeasure("eager", dependencies=["needed"])
+    measurements = habitat.Measurements([lazy, needed, eager])
+
+    class _Task:
+        pass
+
+    task = _Task()
+    task.measurements = measurements
+    measurements.reset_measures(task=task, step=0)
+    for step in range(1, 4):
+        measurements.update_measures(task=task, step=step)
+    # Only the lazy measures needed by the other measures are updated
+    assert (lazy.num_updates, needed.num_updates, eager.num_updates) == (
+        0,
+        3,
+        3,
+    )
+    assert measurements.get_metric("needed") == 3
+    assert lazy.num_updates == 0
+
+    assert measurements.get_metrics(update_lazy=False)["lazy"] == 0
+    assert measurements.get_metrics() == {"lazy": 3, "needed": 3, "eager": 3}
+    assert lazy.num_updates == 1
+    measurements.get_metrics()
+    assert lazy.num_updates == 1
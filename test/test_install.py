@@ -4,10 +4,63 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
 import habitat
 from habitat.core.logging import logger
 
+# Maximum time to import the packages, in microseconds. The budget is loose
+# to not depend on the machine, importing them eagerly took seconds.
+IMPORT_TIME_BUDGET = 500_000
+# Modules that importing the packages must not import.
+HEAVY_MODULES = [
+    "torch",
+    "habitat_sim",
+    "habitat.core.env",
+    "habitat.core.vector_env",
+    "habitat.datasets",
+    "habitat_baselines.rl.ppo.ppo_trainer",
+]
+
+
+def get_import_times(module: str) -> Dict[str, int]:
+    r"""Imports a module in a new interpreter with ``python -X importtime``
+    and returns the cumulative import time of each imported module, in
+    microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, imported_module = line.split("|")
+        if cumulative.strip().isdigit():
+            import_times[imported_module.strip()] = int(cumulative)
+    return import_times
+
 
 def test_habitat_install():
     r"""dummy test for testing installation"""
     logger.info(str(habitat))
+
+
+@pytest.mark.parametrize("module", ["habitat", "habitat_baselines"])
+def test_import_time(module):
+    import_times = get_import_times(module)
+    slowest = sorted(import_times.items(), key=lambda x: -x[1])[:10]
+    logger.info(f"Slowest imports of {module}: {slowest}")
+
+    for heavy_module in HEAVY_MODULES:
+        assert (
+            heavy_module not in import_times
+        ), f"import {module} imports {heavy_module}"
+    assert import_times[module] < IMPORT_TIME_BUDGET
@@ -7,6 +7,7 @@
 import json
 import time
 
+import numpy as np
 import pytest
 
 import habitat
@@ -16,6 +17,11 @@ from habitat.core.logging import logger
 from habitat.datasets import make_dataset
 from habitat.datasets.object_nav.object_nav_dataset import ObjectNavDatasetV1
 from habitat.tasks.nav.nav import MoveForwardAction
+from habitat.tasks.nav.view_point_distance_grid import (
+    ViewPointDistanceGrid,
+    compute_view_point_distance_grid,
+    get_floor_heights,
+)
 
 CFG_TEST = "test/habitat_mp3d_object_nav_test.yaml"
 EPISODES_LIMIT = 6
@@ -137,3 +143,92 @@ def test_object_nav_task():
 
         with pytest.raises(AssertionError):
             env.step({"action": MoveForwardAction.name})
+
+
+class _GridWorldSim:
+    r"""Sim over a 4m x 3m empty floor at height 0 with euclidean geodesic
+    distances, navigable for :py:`x < 3` and, with :p:`wall`, not navigable
+    for :py:`1 < x < 1.4` and :py:`z < 2`.
+    """
+
+    class _PathFinder:
+        def get_bounds(self):
+            return np.array([0.0, 0.0, 0.0]), np.array([4.0, 1.0, 3.0])
+
+    pathfinder = _PathFinder()
+
+    def __init__(self, wall=False):
+        self.wall = wall
+
+    def is_navigable(self, point):
+        if self.wall and 1.0 < point[0] < 1.4 and point[2] < 2.0:
+            return False
+        return abs(point[1]) < 0.5 and point[0] < 3.0
+
+    def geodesic_distance(self, position_a, position_b):
+        assert not self.wall
+        return float(
+            np.min(np.linalg.norm(np.array(position_b) - position_a, axis=1))
+        )
+
+
+@pytest.mark.parametrize("cell_size", [0.1, 0.5])
+def test_view_point_distance_grid(tmp_path, cell_size):
+    assert get_floor_heights([0.1, 0.0, 3.0, 0.2, 3.1]) == [0.0, 3.0]
+
+    sim = _GridWorldSim()
+    view_points = {
+        "chair": [[0.5, 0.0, 0.5], [2.2, 0.0, 0.3]],
+        "bed": [[2.5, 0.0, 2.5]],
+    }
+    grid = compute_view_point_distance_grid(
+        sim, view_points, [0.0], cell_size=cell_size
+    )
+    assert grid.distances.shape == (
+        2,
+        1,
+        int(round(3 / cell_size)),
+        int(round(4 / cell_size)),
+    )
+    assert grid.distances.dtype == np.uint16
+
+    path = str(tmp_path / "scene.npz")
+    grid.save(path)
+    grid = ViewPointDistanceGrid.load(path)
+    assert grid.categories == ["bed", "chair"]
+
+    # At most 2.8% plus half a cell longer than the geodesic distance, and
+    # exact close to the view points
+    rng = np.random.default_rng(0)
+    for _ in range(1000):
+        position = [rng.uniform(0.0, 3.0), 0.0, rng.uniform(0.0, 3.0)]
+        for category, category_view_points in view_points.items():
+            distance = grid.get_distance(position, category)
+            geodesic_distance = sim.geodesic_distance(
+                position, category_view_points
+            )
+            assert distance >= geodesic_distance - 0.005
+            assert (
+                distance <= 1.028 * geodesic_distance + 0.5 * cell_size + 0.005
+            )
+            if geodesic_distance < 2 * cell_size:
+                assert np.isclose(distance, geodesic_distance, atol=0.01)
+
+    # Not navigable, off the grid, on another floor and unknown category
+    assert grid.get_distance([3.5, 0.0, 1.0], "chair") is None
+    assert grid.get_distance([-1.0, 0.0, 1.0], "chair") is None
+    assert grid.get_distance([1.0, 2.0, 1.0], "chair") is None
+    assert grid.get_distance([1.0, 0.0, 1.0], "table") is None
+
+
+def test_view_point_distance_grid_wall():
+    grid = compute_view_point_distance_grid(
+        _GridWorldSim(wall=True), {"chair": [[0.5, 0.0, 0.5]]}, [0.0]
+    )
+    # Around the end of the wall, through the centers of the navigable cells
+    # at its corners
+    distance = grid.get_distance([2.0, 0.0, 0.5], "chair")
+    around_wall = np.hypot(0.45, 1.55) + 0.5 + np.hypot(0.55, 1.55)
+    assert np.hypot(0.5, 1.5) + 0.4 + np.hypot(0.6, 1.5) < distance
+    assert distance <= 1.028 * around_wall + 0.055
+    assert grid.get_distance([1.2, 0.0, 0.5], "chair") is None
@@ -4,23 +4,32 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gzip
 import os
 import random
 import time
 
 import numpy as np
 import pytest
+from omegaconf import OmegaConf
 
 import habitat
 from habitat.config.default import get_config
 from habitat.core.embodied_task import Episode
 from habitat.core.logging import logger
+from habitat.core.simulator import ShortestPathPoint
 from habitat.datasets import make_dataset
 from habitat.datasets.pointnav import pointnav_generator as pointnav_generator
+from habitat.datasets.pointnav.columnar_pointnav_dataset import (
+    ColumnarPointNavDatasetV1,
+    convert_to_columnar,
+    save_columnar_episodes,
+)
 from habitat.datasets.pointnav.pointnav_dataset import (
     DEFAULT_SCENE_PATH_PREFIX,
     PointNavDatasetV1,
 )
+from habitat.tasks.nav.nav import NavigationEpisode, NavigationGoal
 from habitat.utils.geometry_utils import (
     angle_between_quaternions,
     quaternion_from_coeff,
@@ -189,6 +198,129 @@ def check_shortest_path(env, episode):
         env.step(point.action)
 
 
+def test_columnar_pointnav_dataset(tmp_path):
+    episodes = [
+        NavigationEpisode(
+            episode_id=str(i),
+            scene_id=f"data/scene_datasets/scene_{i % 3}.glb",
+            start_position=[0.5 * i, 0.0, -1.25],
+            start_rotation=[0.0, 1.0, 0.0, 0.0],
+            goals=[
+                NavigationGoal(position=[float(j), 0.0, 1.0], radius=0.25)
+                for j in range(i % 3)
+            ],
+            info={"geodesic_distance": 1.5},
+            start_room="kitchen" if i % 2 else None,
+            shortest_paths=[
+                [ShortestPathPoint([0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], 1)]
+            ]
+            if i == 0
+            else None,
+        )
+        for i in range(10)
+    ]
+    save_columnar_episodes(episodes, str(tmp_path))
+
+    config = OmegaConf.create(
+        {
+            "data_path": str(tmp_path),
+            "split": "train",
+            "scenes_dir": "scenes",
+            "content_scenes": ["scene_0", "scene_2"],
+        }
+    )
+    dataset = ColumnarPointNavDatasetV1(config)
+    expected = [
+        episode for episode in episodes if not episode.scene_id[-5] == "1"
+    ]
+    assert len(dataset.episodes) == len(expected)
+    assert dataset.scene_ids == ["scenes/scene_0.glb", "scenes/scene_2.glb"]
+    for episode, expected_episode in zip(dataset.episodes, expected):
+        assert episode.scene_id == os.path.join(
+            "scenes", os.path.basename(expected_episode.scene_id)
+        )
+        episode.scene_id = expected_episode.scene_id
+        assert episode == expected_episode
+
+    scene_episodes = dataset.get_scene_episodes("scenes/scene_2.glb")
+    assert [e.episode_id for e in scene_episodes] == ["2", "5", "8"]
+
+    episode_iter = dataset.get_episode_iterator(cycle=False, shuffle=False)
+    assert sorted(e.episode_id for e in episode_iter) == sorted(
+        e.episode_id for e in expected
+    )
+
+
+def test_pointnav_dataset_parallel_loading(tmp_path):
+    content_dir = tmp_path / "content"
+    content_dir.mkdir()
+    with gzip.open(tmp_path / "train.json.gz", "wt") as f:
+        f.write(PointNavDatasetV1().to_json())
+    for scene_index in range(5):
+        scene_dataset = PointNavDatasetV1()
+        scene_dataset.episodes = [
+            NavigationEpisode(
+                episode_id=str(i),
+                scene_id=f"data/scene_datasets/scene_{scene_index}.glb",
+                start_position=[float(i), 0.0, 0.0],
+                start_rotation=[0.0, 0.0, 0.0, 1.0],
+                goals=[NavigationGoal(position=[1.0, 0.0, float(i)])],
+            )
+            for i in range(scene_index + 1)
+        ]
+        with gzip.open(
+            content_dir / f"scene_{scene_index}.json.gz", "wt"
+        ) as f:
+            f.write(scene_dataset.to_json())
+
+    config = OmegaConf.create(
+        {
+            "data_path": str(tmp_path / "{split}.json.gz"),
+            "split": "train",
+            "scenes_dir": "scenes",
+            "content_scenes": ["*"],
+            "num_load_workers": 0,
+        }
+    )
+    dataset = PointNavDatasetV1(config)
+    assert len(dataset.episodes) == 15
+    with habitat.config.read_write(config):
+        config.num_load_workers = 3
+    parallel_dataset = PointNavDatasetV1(config)
+    assert parallel_dataset.episodes == dataset.episodes
+
+
+def test_columnar_pointnav_dataset_conversion(tmp_path):
+    dataset_config = get_config(
+        "benchmark/nav/pointnav/pointnav_habitat_test.yaml"
+    ).habitat.dataset
+    if not PointNavDatasetV1.check_config_paths_exist(dataset_config):
+        pytest.skip("Test skipped as dataset files are missing.")
+    dataset = PointNavDatasetV1(config=dataset_config)
+    num_episodes = convert_to_columnar(
+        dataset_config.data_path.format(split=dataset_config.split),
+        str(tmp_path),
+    )
+    assert num_episodes == len(dataset.episodes)
+
+    with habitat.config.read_write(dataset_config):
+        dataset_config.type = "PointNav-v1-columnar"
+        dataset_config.data_path = str(tmp_path)
+    columnar_dataset = make_dataset(
+        id_dataset=dataset_config.type, config=dataset_config
+    )
+    assert columnar_dataset.scene_ids == dataset.scene_ids
+    for episode, columnar_episode in zip(
+        dataset.episodes, columnar_dataset.episodes
+    ):
+        assert episode.episode_id == columnar_episode.episode_id
+        assert episode.scene_id == columnar_episode.scene_id
+        assert np.allclose(
+            episode.start_position, columnar_episode.start_position
+        )
+        assert len(episode.goals) == len(columnar_episode.goals)
+
+
 def test_pointnav_episode_generator():
     config = get_config(CFG_TEST)
     with habitat.config.read_write(config):
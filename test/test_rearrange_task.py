@@ -4,11 +4,15 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import gzip
+import itertools
 import json
 import os.path as osp
 import time
 from glob import glob
+from types import SimpleNamespace
 
+import numpy as np
 import pytest
 import yaml
 from omegaconf import DictConfig, OmegaConf
@@ -24,6 +28,13 @@ from habitat.core.environments import get_env_class
 from habitat.core.logging import logger
 from habitat.datasets.rearrange.rearrange_dataset import RearrangeDatasetV0
 from habitat.tasks.rearrange.multi_task.composite_task import CompositeTask
+from habitat.tasks.rearrange.utils import (
+    CollisionDetails,
+    ContactIds,
+    coll_name_matches,
+    get_match_link,
+    rearrange_collision,
+)
 from habitat_baselines.config.default import get_config as baselines_get_config
 
 CFG_TEST = "benchmark/rearrange/pick.yaml"
@@ -152,6 +163,289 @@ def test_composite_tasks(test_cfg_path):
             env.reset()
 
 
+def _get_true_predicates_uncached(pddl):
+    """
+    The true predicates found by grounding every predicate over all the
+    entities, as `PddlDomain` did before caching the groundings.
+    """
+    all_entities = pddl.all_entities.values()
+    true_preds = []
+    for pred in pddl.predicates.values():
+        for entity_input in itertools.combinations(all_entities, pred.n_args):
+            if not pred.are_args_compatible(entity_input):
+                continue
+            use_pred = pred.clone()
+            use_pred.set_param_values(entity_input)
+            if use_pred.is_true(pddl.sim_info):
+                true_preds.append(use_pred)
+    return true_preds
+
+
+def _get_possible_actions_uncached(
+    pddl, filter_entities=(), allowed_action_names=None, true_preds=None
+):
+    all_entities = list(pddl.all_entities.values())
+    matching_actions = []
+    for action in pddl.actions.values():
+        if (
+            allowed_action_names is not None
+            and action.name not in allowed_action_names
+        ):
+            continue
+        for entity_input in itertools.combinations(
+            all_entities, action.n_args
+        ):
+            if not all(entity in entity_input for entity in filter_entities):
+                continue
+            for entity_input_perm in itertools.permutations(entity_input):
+                if not action.are_args_compatible(list(entity_input_perm)):
+                    continue
+                new_action = action.clone()
+                new_action.set_param_values(list(entity_input_perm))
+                if (
+                    true_preds is not None
+                    and not new_action.is_precond_satisfied_from_predicates(
+                        true_preds
+                    )
+                ):
+                    continue
+                matching_actions.append(new_action)
+    return matching_actions
+
+
+def test_pddl_domain_cache():
+    """
+    The groundings and truth values cached by `PddlDomain` match the ones
+    computed from scratch, and follow the moves of the entities.
+    """
+    config = get_config(
+        "benchmark/rearrange/rearrange_easy.yaml",
+        ["habitat.simulator.concur_render=False"],
+    )
+    if not RearrangeDatasetV0.check_config_paths_exist(config.habitat.dataset):
+        pytest.skip(
+            "Please download ReplicaCAD RearrangeDataset Dataset to data folder."
+        )
+
+    def compact_strs(exprs):
+        return [expr.compact_str for expr in exprs]
+
+    with habitat.Env(config=config) as env:
+        env.reset()
+        pddl = env.task.pddl_problem
+
+        # Twice to use the cached groundings and truth values
+        for _ in range(2):
+            true_preds = pddl.get_true_predicates()
+            assert compact_strs(true_preds) == compact_strs(
+                _get_true_predicates_uncached(pddl)
+            )
+            for kwargs in (
+                {},
+                {"filter_entities": [pddl.get_entity("robot_0")]},
+                {"allowed_action_names": ["nav", "pick"]},
+                {"true_preds": true_preds},
+            ):
+                assert compact_strs(
+                    pddl.get_possible_actions(**kwargs)
+                ) == compact_strs(
+                    _get_possible_actions_uncached(pddl, **kwargs)
+                )
+
+        # Move the object to its target, the predicate between them is
+        # evaluated again
+        at_target = pddl.parse_predicate(
+            "at(goal0|0,TARGET_goal0|0)", pddl.all_entities
+        )
+        assert at_target not in pddl.get_true_predicates()
+        sim_info = pddl.sim_info
+        rom = env.sim.get_rigid_object_manager()
+        obj = rom.get_object_by_id(
+            env.sim.scene_obj_ids[sim_info.obj_ids["goal0|0"]]
+        )
+        obj.translation = sim_info.get_entity_pos(
+            pddl.get_entity("TARGET_goal0|0")
+        )
+        true_preds = pddl.get_true_predicates()
+        assert at_target in true_preds
+        assert compact_strs(true_preds) == compact_strs(
+            _get_true_predicates_uncached(pddl)
+        )
+
+
+class _ContactSim:
+    """
+    Sim with the contact points of a collision detection and an agent whose
+    links -1 and 0 are its base.
+    """
+
+    agent_id = 10
+    scene_obj_ids = [20, 21, 22]
+
+    def __init__(self, contact_points, snap_idx):
+        self.contact_points = contact_points
+        self._agent_data = SimpleNamespace(
+            articulated_agent=SimpleNamespace(
+                get_robot_sim_id=lambda: self.agent_id,
+                is_base_link=lambda link: link in (-1, 0),
+            ),
+            grasp_mgr=SimpleNamespace(snap_idx=snap_idx),
+        )
+
+    def get_agent_data(self, agent_idx):
+        return self._agent_data
+
+    def get_physics_contact_points(self):
+        return self.contact_points
+
+    def get_contact_ids(self):
+        return ContactIds.from_contact_points(self.contact_points)
+
+
+def _rearrange_collision_per_contact(
+    sim, count_obj_colls, ignore_names, ignore_base
+):
+    """
+    `rearrange_collision` as it was written before the contacts were
+    vectorized, one contact point at a time.
+    """
+    agent_model = sim.get_agent_data(None).articulated_agent
+    colls = sim.get_physics_contact_points()
+    agent_id = agent_model.get_robot_sim_id()
+    added_objs = sim.scene_obj_ids
+    snapped_obj_id = sim.get_agent_data(None).grasp_mgr.snap_idx
+
+    def should_keep(x):
+        if ignore_base:
+            match_link = get_match_link(x, agent_id)
+            if match_link is not None and agent_model.is_base_link(match_link):
+                return False
+
+        if ignore_names is not None:
+            should_ignore = any(
+                coll_name_matches(x, ignore_name)
+                for ignore_name in ignore_names
+            )
+            if should_ignore:
+                return False
+        return True
+
+    colls = list(filter(should_keep, colls))
+    robot_coll_ids = []
+    robot_obj_colls = 0
+    robot_scene_colls = 0
+    for match in [c for c in colls if coll_name_matches(c, agent_id)]:
+        if any(coll_name_matches(match, obj_id) for obj_id in added_objs):
+            robot_obj_colls += 1
+        else:
+            robot_scene_colls += 1
+        if match.object_id_a == agent_id:
+            robot_coll_ids.append(match.object_id_b)
+        else:
+            robot_coll_ids.append(match.object_id_a)
+
+    obj_scene_colls = 0
+    if count_obj_colls and snapped_obj_id is not None:
+        for match in [
+            c for c in colls if coll_name_matches(c, snapped_obj_id)
+        ]:
+            if coll_name_matches(match, agent_id):
+                continue
+            obj_scene_colls += 1
+
+    return CollisionDetails(
+        obj_scene_colls=min(obj_scene_colls, 1),
+        robot_obj_colls=min(robot_obj_colls, 1),
+        robot_scene_colls=min(robot_scene_colls, 1),
+        robot_coll_ids=robot_coll_ids,
+        all_colls=[(x.object_id_a, x.object_id_b) for x in colls],
+    )
+
+
+def _contact_point(object_id_a, object_id_b, link_id_a=-1, link_id_b=-1):
+    return SimpleNamespace(
+        object_id_a=object_id_a,
+        object_id_b=object_id_b,
+        link_id_a=link_id_a,
+        link_id_b=link_id_b,
+    )
+
+
+def test_contact_ids():
+    contact_ids = ContactIds.from_contact_points(
+        [_contact_point(10, 20, 1, -1), _contact_point(0, 21, -1, 2)]
+    )
+    assert len(contact_ids) == 2
+    assert contact_ids.object_id_a.tolist() == [10, 0]
+    assert contact_ids.link_id_b.tolist() == [-1, 2]
+    assert contact_ids.matches([21]).tolist() == [False, True]
+    assert contact_ids.matches([10, 0]).tolist() == [True, True]
+
+    empty_contact_ids = ContactIds.from_contact_points([])
+    assert len(empty_contact_ids) == 0
+    assert empty_contact_ids.matches([10]).shape == (0,)
+
+
+@pytest.mark.parametrize("ignore_base", [True, False])
+@pytest.mark.parametrize("ignore_names", [None, [22], [21, 0]])
+@pytest.mark.parametrize("snap_idx", [None, 21])
+@pytest.mark.parametrize("count_obj_colls", [True, False])
+def test_rearrange_collision(
+    ignore_base, ignore_names, snap_idx, count_obj_colls
+):
+    # Agent 10, scene objects 20 to 22, stage 0 and another object 30
+    object_ids = [10, 20, 21, 22, 0, 30]
+    rng = np.random.default_rng(0)
+    contact_point_sets = [
+        [],
+        # Base and arm links of the agent against the stage
+        [_contact_point(10, 0, 0, -1), _contact_point(0, 10, -1, 3)],
+        # Agent against a scene object and against itself
+        [_contact_point(22, 10, -1, 2), _contact_point(10, 10, 4, 0)],
+        # Held object against the agent, a scene object and the stage
+        [
+            _contact_point(21, 10, -1, 5),
+            _contact_point(21, 20),
+            _contact_point(0, 21),
+        ],
+    ]
+    for _ in range(50):
+        contact_point_sets.append(
+            [
+                _contact_point(
+                    *rng.choice(object_ids, 2).tolist(),
+                    *rng.integers(-1, 4, 2).tolist(),
+                )
+                for _ in range(rng.integers(1, 8))
+            ]
+        )
+
+    for contact_points in contact_point_sets:
+        sim = _ContactSim(contact_points, snap_idx)
+        expected = _rearrange_collision_per_contact(
+            sim, count_obj_colls, ignore_names, ignore_base
+        )
+        did_collide, coll_details = rearrange_collision(
+            sim,
+            count_obj_colls,
+            ignore_names=ignore_names,
+            ignore_base=ignore_base,
+            get_extra_coll_data=True,
+        )
+        assert coll_details == expected
+        assert did_collide == (expected.total_collisions > 0)
+
+        _, coll_counts = rearrange_collision(
+            sim,
+            count_obj_colls,
+            ignore_names=ignore_names,
+            ignore_base=ignore_base,
+        )
+        assert coll_counts.obj_scene_colls == expected.obj_scene_colls
+        assert coll_counts.robot_obj_colls == expected.robot_obj_colls
+        assert coll_counts.robot_scene_colls == expected.robot_scene_colls
+
+
 # NOTE: set 'debug_visualization' = True to produce videos showing receptacles and final simulation state
 @pytest.mark.parametrize("debug_visualization", [False])
 @pytest.mark.parametrize("num_episodes", [2])
@@ -176,3 +470,28 @@ def test_rearrange_episode_generator(
     logger.info(
         f"successful_ep = {len(dataset.episodes)} generated in {time.time()-start_time} seconds."
     )
+
+
+@pytest.mark.parametrize("num_workers", [2])
+def test_rearrange_episode_generator_parallel(num_workers, tmp_path):
+    cfg = rr_gen.get_config_defaults()
+    cfg = OmegaConf.merge(cfg, OmegaConf.load(GEN_TEST_CFG))
+    output_path = str(tmp_path / "rearrange_ep_dataset.json.gz")
+    num_episodes = rr_gen.generate_episodes_parallel(
+        cfg,
+        num_episodes=4,
+        output_path=output_path,
+        num_workers=num_workers,
+        seed=0,
+        episodes_per_shard=1,
+    )
+    assert num_episodes == 4
+
+    # The streamed file is a regular dataset
+    dataset = RearrangeDatasetV0()
+    with gzip.open(output_path, "rt") as f:
+        dataset.from_json(f.read())
+    assert [episode.episode_id for episode in dataset.episodes] == [
+        str(i) for i in range(num_episodes)
+    ]
+    check_json_serialization(dataset)
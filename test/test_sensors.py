@@ -4,6 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import itertools
 import os
 import random
 
@@ -31,6 +32,7 @@ from habitat.config.default_structured_configs import (
     PointGoalWithGPSCompassSensorConfig,
     ProximitySensorConfig,
     SimulatorFisheyeDepthSensorConfig,
+    TopDownMapMeasurementConfig,
 )
 from habitat.tasks.nav.nav import (
     MoveForwardAction,
@@ -187,6 +189,70 @@ def test_collisions():
                 prev_collisions = collisions
 
 
+def test_top_down_map_cache():
+    config = get_test_config()
+    if not os.path.exists(config.habitat.simulator.scene):
+        pytest.skip("Please download Habitat test data to data folder.")
+    import habitat_sim
+
+    # Start position checked for validity for the test scene
+    start_position = np.array([-1.3731, 0.08431, 8.60692])
+    episodes = [
+        NavigationEpisode(
+            episode_id=str(i),
+            scene_id=config.habitat.simulator.scene,
+            start_position=(start_position + [0.0, start_dy, 0.0]).tolist(),
+            start_rotation=[0.0, 0.0, 0.0, 1.0],
+            goals=[
+                NavigationGoal(
+                    position=(start_position + goal_offset).tolist()
+                )
+            ],
+        )
+        for i, (start_dy, goal_offset) in enumerate(
+            itertools.product([0.0, 0.05], [[0.5, 0.0, 0.5], [-1.0, 1.0, 0.0]])
+        )
+    ]
+
+    def get_maps(map_cache_size):
+        with habitat.config.read_write(config):
+            config.habitat.task.measurements = {
+                "top_down_map": TopDownMapMeasurementConfig(
+                    map_cache_size=map_cache_size
+                )
+            }
+        top_down_maps = []
+        with habitat.Env(config=config, dataset=None) as env:
+            env.episode_iterator = iter(episodes + episodes)
+            for i in range(2 * len(episodes)):
+                if i == len(episodes):
+                    navmesh_settings = habitat_sim.NavMeshSettings()
+                    navmesh_settings.set_defaults()
+                    navmesh_settings.agent_radius *= 2
+                    env.sim.recompute_navmesh(
+                        env.sim.pathfinder, navmesh_settings
+                    )
+                env.reset()
+                top_down_maps.append(
+                    env.get_metrics()["top_down_map"]["map"].copy()
+                )
+            num_cached_maps = len(
+                env.task.measurements.measures["top_down_map"]._map_cache
+            )
+        return top_down_maps, num_cached_maps
+
+    top_down_maps, num_cached_maps = get_maps(0)
+    assert num_cached_maps == 0
+    cached_top_down_maps, num_cached_maps = get_maps(8)
+    # At most one map per start height and navmesh
+    assert 0 < num_cached_maps <= 4
+    assert not np.array_equal(top_down_maps[0], top_down_maps[-4])
+    for top_down_map, cached_top_down_map in zip(
+        top_down_maps, cached_top_down_maps
+    ):
+        assert np.array_equal(top_down_map, cached_top_down_map)
+
+
 def test_pointgoal_sensor():
     config = get_test_config()
     if not os.path.exists(config.habitat.simulator.scene):
@@ -6,6 +6,7 @@
 
 import numpy as np
 
+from habitat.utils.visualizations import fog_of_war, maps
 from habitat.utils.visualizations.utils import observations_to_image
 
 
@@ -57,3 +58,89 @@ def test_different_dim_observations_to_image():
         1570,
         3,
     ), "Resulted image resolution doesn't match."
+
+
+def test_reveal_fog_of_war_batch():
+    rng = np.random.default_rng(0)
+    top_down_maps = []
+    for _ in range(3):
+        top_down_map = np.ones((100, 120), dtype=np.uint8)
+        top_down_map[
+            rng.integers(0, 100, 200), rng.integers(0, 120, 200)
+        ] = maps.MAP_INVALID_POINT
+        top_down_maps.append(top_down_map)
+    points = rng.integers(20, 80, (5, 2))
+    angles = rng.uniform(-np.pi, np.pi, 5)
+    map_indices = np.array([0, 1, 2, 0, 2])
+
+    fog_of_war_masks = [np.zeros_like(m) for m in top_down_maps]
+    fog_of_war.reveal_fog_of_war_batch(
+        top_down_maps,
+        fog_of_war_masks,
+        points,
+        angles,
+        map_indices=map_indices,
+        fov=70,
+        max_line_len=30,
+    )
+
+    expected_masks = [np.zeros_like(m) for m in top_down_maps]
+    for point, angle, map_index in zip(points, angles, map_indices):
+        expected_masks[map_index] = fog_of_war.reveal_fog_of_war(
+            top_down_maps[map_index],
+            expected_masks[map_index],
+            point,
+            angle,
+            fov=70,
+            max_line_len=30,
+        )
+    for mask, expected_mask in zip(fog_of_war_masks, expected_masks):
+        assert mask.any()
+        assert np.array_equal(mask, expected_mask)
+
+
+def test_reveal_fog_of_war_matches_line_drawing():
+    # A room with a pillar and a doorway
+    top_down_map = np.full((60, 80), maps.MAP_VALID_POINT, dtype=np.uint8)
+    top_down_map[[0, -1], :] = maps.MAP_INVALID_POINT
+    top_down_map[:, [0, -1]] = maps.MAP_INVALID_POINT
+    top_down_map[25:35, 30:35] = maps.MAP_INVALID_POINT
+    top_down_map[:, 55] = maps.MAP_INVALID_POINT
+    top_down_map[28:33, 55] = maps.MAP_VALID_POINT
+
+    poses = [
+        ((30, 10), np.pi / 2, 90, 100),
+        ((30, 10), np.pi / 3, 60, 40),
+        ((10, 40), -2.0, 120, 30),
+        ((50, 70), np.pi, 90, 100),
+        ((5, 5), 0.7, 45, 25),
+    ]
+    for point, angle, fov, max_line_len in poses:
+        point = np.array(point)
+        mask = fog_of_war.reveal_fog_of_war(
+            top_down_map,
+            np.zeros_like(top_down_map),
+            point,
+            angle,
+            fov=fov,
+            max_line_len=max_line_len,
+        )
+
+        # One line per angle step, as the fog-of-war was first revealed
+        expected_mask = np.zeros_like(top_down_map)
+        fov = np.deg2rad(fov)
+        for ray_angle in np.arange(
+            -fov / 2, fov / 2, step=1.0 / max_line_len, dtype=np.float32
+        ):
+            fog_of_war.draw_fog_of_war_line(
+                top_down_map,
+                expected_mask,
+                point,
+                point
+                + max_line_len
+                * np.array(
+                    [np.cos(angle + ray_angle), np.sin(angle + ray_angle)]
+                ),
+            )
+        assert mask.any()
+        assert np.array_equal(mask, expected_mask)